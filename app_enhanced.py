@@ -11,7 +11,8 @@ import json
 import hashlib
 import base64
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file
+from functools import lru_cache
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, send_file, Response, stream_with_context, g, has_request_context, session
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -20,26 +21,60 @@ import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
+from email.header import Header
+from email.utils import formatdate, make_msgid
 from email import encoders
+from email import policy as email_policy
 import ssl
 import threading
 import time
 import uuid
 import subprocess
+import shutil
+import glob
+import re
+import zipfile
+import random
+import tracemalloc
+from contextlib import contextmanager
+try:
+    import fcntl  # 워커 간 파일 잠금 (Windows 개발 환경에는 없음)
+except ImportError:
+    fcntl = None
 import requests
+import jinja2
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from reportlab.lib.units import mm, inch
+from reportlab import rl_config
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Flowable
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from reportlab.pdfgen import canvas
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from reportlab.graphics.shapes import Drawing, Circle, String
 from reportlab.graphics import renderPDF
+try:
+    from PIL import Image as PILImage  # 직인 이미지 축소 (reportlab 의존성으로 보통 설치됨)
+except ImportError:
+    PILImage = None
+try:
+    import pymupdf  # 견적서 미리보기 이미지 (선택 설치, 없으면 pdftoppm 사용)
+except ImportError:
+    try:
+        import fitz as pymupdf  # 예전 PyMuPDF 패키지 이름
+    except ImportError:
+        pymupdf = None
 import io
+import tempfile
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from itertools import product
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
 
 # 기존 프로그램들 import
 try:
@@ -65,11 +100,43 @@ except ImportError:
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'onnuri-print-enhanced-2024'
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///onnuri_print_enhanced.db'
+# DATABASE_URL 환경 변수로 바꿀 수 있음 (테스트는 메모리 DB 사용)
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///onnuri_print_enhanced.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB
 app.config['ALLOWED_EXTENSIONS'] = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'doc', 'docx', 'xls', 'xlsx'}
+app.config['BATCH_QUOTE_MAX_ITEMS'] = 5000  # 대량 견적 1회 최대 품목 수
+app.config['FONT_FOLDER'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'fonts')  # 번들 한글 TTF
+
+# 단가표 설정 (파일 변경 시 워커별로 자동 재적용)
+app.config['TARIFF_FILE'] = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tariff.json')
+app.config['TARIFF_CHECK_INTERVAL'] = 2.0  # 초
+app.config['QUOTE_CACHE_SIZE'] = 1024  # 견적 계산 결과 캐시 항목 수
+app.config['PRICE_CURVE_MAX_AGE'] = 60  # 가격 구간표 브라우저 캐시 (초, 이후 ETag로 재검증)
+app.config['QUOTE_SOLVER_MAX_RUNS'] = 4  # 최저가 탐색 시 최대 분할 제작 횟수
+app.config['QUOTE_DOCUMENT_CACHE_SIZE'] = 500  # 작성 중인 다품목 견적서 보관 수
+app.config['QUOTE_CUSTOM_UNIT_PRICE_MAX'] = 10000000  # 단가 직접 지정 품목(관리자 전용)의 최대 단가
+app.config['QUOTE_SESSION_RECENT'] = 20  # 세션별로 기억하는 최근 견적 수 (같은 요청이면 같은 견적 재사용)
+app.config['QUOTE_PDF_KEEP_DAYS'] = 30  # Quote에 저장한 PDF 보관 기간 (이후엔 비우고 필요하면 다시 생성)
+app.config['QUOTE_PDF_STORE_LIMIT'] = 1000  # PDF를 저장해 두는 최대 견적 수 (오래 안 쓴 것부터 비움)
+app.config['PDF_CACHE_FOLDER'] = 'pdf_cache'  # 생성한 견적서 PDF 디스크 캐시 (워커 간 공유)
+app.config['PDF_CACHE_MAX_BYTES'] = 200 * 1024 * 1024  # 200MB, 초과 시 오래 안 쓴 PDF부터 삭제
+app.config['PREVIEW_CACHE_FOLDER'] = 'preview_cache'  # 견적서 미리보기 PNG 디스크 캐시
+app.config['PREVIEW_CACHE_MAX_BYTES'] = 100 * 1024 * 1024  # 100MB
+app.config['PREVIEW_DPI'] = 96  # 미리보기 해상도 (화면 해상도, A4 약 794x1123px)
+app.config['PDF_RENDER_WORKERS'] = 2  # PDF 렌더링 전용 프로세스 수 (0이면 요청 처리 스레드에서 직접 생성)
+app.config['PDF_RENDER_MAX_PENDING'] = 8  # 웹 워커당 동시에 맡길 수 있는 PDF 작업 수 (초과 시 503)
+app.config['PDF_RENDER_TIMEOUT'] = 30  # PDF 작업 대기 시간 (초, 초과 시 504)
+app.config['QUOTE_EXPORT_MAX_DOCUMENTS'] = 500  # 견적서 일괄 내보내기 1회 최대 건수
+app.config['PDF_METRICS_TRACE_MEMORY'] = False  # PDF 생성 중 최대 메모리 할당량 측정 (tracemalloc, 느려지므로 분석 시에만)
+app.config['PDF_DEBUG_HEADER'] = False  # PDF를 생성한 응답에 단계별 소요 시간 헤더(Server-Timing) 추가
+app.config['PDF_OUTPUT_PROFILE'] = 'mobile'  # 견적서 PDF 출력 설정 (PDF_OUTPUT_PROFILES: standard, mobile)
+app.config['QUOTE_PDF_TEMPLATE'] = 'compact'  # 기본 견적서 양식 (QUOTE_TEMPLATES: compact, sealed)
+app.config['QUOTE_SEAL_IMAGES'] = [  # 견적서 직인 이미지 후보 (앞에서부터 처음 읽히는 파일 사용)
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images', '도장.png'),
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'images', 'stamp.png'),
+]
 
 # 이메일 설정 (네이버 메일)
 app.config['MAIL_SERVER'] = 'smtp.naver.com'
@@ -77,6 +144,27 @@ app.config['MAIL_PORT'] = 587
 app.config['MAIL_USE_TLS'] = True
 app.config['MAIL_USERNAME'] = 'print7123@naver.com'
 app.config['MAIL_PASSWORD'] = 'your-app-password'  # 실제 앱 비밀번호로 변경 필요
+app.config['MAIL_TIMEOUT'] = 30  # SMTP 연결/응답 대기 시간 (초)
+app.config['MAIL_SMTP_POOL_SIZE'] = 2  # 워커당 동시에 여는 SMTP 연결 수 (로그인된 연결을 재사용)
+app.config['MAIL_SMTP_IDLE_SECONDS'] = 60  # 이 시간 동안 안 쓴 연결은 닫음 (서버가 먼저 끊기 전에)
+app.config['MAIL_SMTP_CHECK_SECONDS'] = 10  # 이 시간 이상 쉰 연결은 재사용 전에 NOOP으로 확인
+app.config['MAIL_SMTP_MAX_MESSAGES'] = 50  # 연결 하나로 보낼 최대 메일 수 (서버 세션당 발송 제한 대비)
+# 로컬 테스트: MAIL_SERVER='localhost', MAIL_PORT=1025, MAIL_USE_TLS=False 후
+#   pip install aiosmtpd && python -m aiosmtpd -n -l localhost:1025  (받은 메일을 화면에 출력, smtpd 모듈은 Python 3.12에서 제거됨)
+#   발송 대기열 테스트: python -m pytest tests  (aiosmtpd 서버를 테스트 안에서 띄움)
+
+# 이메일 발송 대기열 (DB에 저장 후 백그라운드에서 발송, 요청 처리 중에는 SMTP 연결 안 함)
+app.config['MAIL_SPOOL_WORKER'] = True  # 이 프로세스에서 대기열 발송 스레드 실행
+app.config['MAIL_SPOOL_POLL_INTERVAL'] = 5  # 새 메일 확인 주기 (초, 같은 프로세스에서 넣은 메일은 바로 발송)
+app.config['MAIL_SPOOL_BATCH'] = 20  # 한 번에 꺼내 보내는 메일 수
+app.config['MAIL_MAX_ATTEMPTS'] = 6  # 최대 발송 시도 횟수 (초과 시 dead 상태로 보관)
+app.config['MAIL_RETRY_BASE_SECONDS'] = 30  # 재시도 대기 시간 (30초, 60초, 120초... 지수 증가)
+app.config['MAIL_RETRY_MAX_SECONDS'] = 3600  # 재시도 대기 시간 상한 (1시간)
+app.config['MAIL_SEND_LEASE_SECONDS'] = 300  # 발송 중 상태가 이 시간을 넘으면 프로세스 중단으로 보고 다시 발송
+app.config['MAIL_SPOOL_KEEP_DAYS'] = 30  # 발송 완료 메일 보관 기간
+app.config['MAIL_DEDUP_SECONDS'] = 600  # 같은 사람에게 같은 견적 메일은 이 시간 안에 한 번만 발송 (0이면 끔)
+app.config['MAIL_ATTACH_QUOTE_PDF'] = True  # 견적서 메일에 견적서 PDF 첨부 (다운로드와 같은 저장된 PDF 사용)
+app.config['MAIL_DIGEST_MINUTES'] = 0  # 0보다 크면 한 사람에게 이 시간 동안 생긴 견적 메일을 한 통으로 묶어 발송
 
 db = SQLAlchemy(app)
 login_manager = LoginManager()
@@ -200,6 +288,54 @@ class BlogPost(db.Model):
     posted_at = db.Column(db.DateTime)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+class Quote(db.Model):
+    """저장된 견적 - 한 번 계산한 결과를 PDF, 이메일, 주문이 공개 ID로 함께 사용"""
+    id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String(16), unique=True, nullable=False, index=True)
+    customer_name = db.Column(db.String(100))
+    email = db.Column(db.String(120))
+    phone = db.Column(db.String(20))
+    
+    # 품목 사양과 계산 결과 (JSON, 단가표가 바뀌어도 그대로 재현)
+    items_json = db.Column(db.Text, nullable=False)
+    prices_json = db.Column(db.Text, nullable=False)
+    total_price = db.Column(db.Integer, nullable=False)
+    total_price_with_tax = db.Column(db.Integer, nullable=False)
+    tariff_version = db.Column(db.String(40), nullable=False)
+    tariff_digest = db.Column(db.String(12), nullable=False)
+    revision = db.Column(db.Integer, default=0)
+    
+    # 생성된 PDF (재다운로드 시 그대로 전송, 내용이 바뀌면 비움)
+    pdf_data = db.Column(db.LargeBinary)
+    download_count = db.Column(db.Integer, default=0)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class OutboundEmail(db.Model):
+    """이메일 발송 대기열 - pending(대기) → sending(발송 중) → sent(완료) / dead(재시도 초과)"""
+    id = db.Column(db.Integer, primary_key=True)
+    to_email = db.Column(db.String(120), nullable=False)
+    subject = db.Column(db.String(200), nullable=False)
+    raw_message = db.Column(db.LargeBinary)  # 발송한 메일 원문 그대로 (보관용 겸 발송용)
+    html_content = db.Column(db.Text)  # raw_message 이전에 저장된 메일
+    text_content = db.Column(db.Text)
+    quote_id = db.Column(db.String(16), index=True)  # 견적서 메일이면 견적 공개 ID
+    dedup_key = db.Column(db.String(64), index=True)  # 받는 사람 + 견적 내용 (중복 발송 방지)
+    digest = db.Column(db.Boolean, default=False)  # 같은 사람의 견적 메일과 묶어 발송
+    
+    # merged: 묶음 발송에서 다른 메일(raw_message가 묶음 메일 원문)에 포함되어 발송됨
+    status = db.Column(db.String(10), default='pending', nullable=False)
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    claimed_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+    
+    __table_args__ = (db.Index('ix_outbound_email_due', 'status', 'next_attempt_at'),)
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -211,88 +347,257 @@ def allowed_file(filename):
 def generate_order_number():
     return f"ONN{datetime.now().strftime('%Y%m%d%H%M%S')}"
 
-def calculate_price(print_type, binding_type, quantity, pages, size, print_method='single'):
-    """정확한 단가표 기반 견적 계산 로직 - 고정된 가격표 (2025.01.02 기준)"""
-    
-    # 페이지 수에 따른 출력 가격 계산
-    def get_print_price(print_type, pages, print_method):
-        # 페이지 수 구간별 가격표 - 2025.01.02 공식 가격표 고정
-        if pages <= 500:
-            price_ranges = {
-                'black_white': {'single': 40, 'double': 40},  # 고정: 레이져흑백 500P이하
-                'laser_color': {'single': 150, 'double': 150},  # 고정: 레이져칼라 500P이하
-                'ink_color': {'single': 70, 'double': 70}  # 고정: 잉크칼라 500P이하
-            }
-        elif pages <= 5000:
-            price_ranges = {
-                'black_white': {'single': 38, 'double': 33},  # 고정: 레이져흑백 501-5,000P
-                'laser_color': {'single': 115, 'double': 110},  # 고정: 레이져칼라 501-5,000P
-                'ink_color': {'single': 66, 'double': 60}  # 고정: 잉크칼라 501-5,000P
-            }
-        elif pages <= 10000:
-            price_ranges = {
-                'black_white': {'single': 30, 'double': 25},  # 고정: 레이져흑백 5,001-10,000P
-                'laser_color': {'single': 93, 'double': 88},  # 고정: 레이져칼라 5,001-10,000P
-                'ink_color': {'single': 55, 'double': 50}  # 고정: 잉크칼라 5,001-10,000P
-            }
-        elif pages <= 15000:
-            price_ranges = {
-                'black_white': {'single': 27, 'double': 22},  # 고정: 레이져흑백 10,001-15,000P
-                'laser_color': {'single': 82, 'double': 77},  # 고정: 레이져칼라 10,001-15,000P
-                'ink_color': {'single': 50, 'double': 45}  # 고정: 잉크칼라 10,001-15,000P
-            }
-        else:  # 15001페이지 이상
-            price_ranges = {
-                'black_white': {'single': 25, 'double': 20},  # 고정: 레이져흑백 15,001P이상
-                'laser_color': {'single': 72, 'double': 66},  # 고정: 레이져칼라 15,001P이상
-                'ink_color': {'single': 45, 'double': 40}  # 고정: 잉크칼라 15,001P이상
-            }
-        
-        return price_ranges.get(print_type, {'single': 40, 'double': 40})[print_method]
-    
-    # 수량에 따른 제본 가격 계산 - 2025.01.02 공식 가격표 고정
-    def get_binding_price(binding_type, quantity):
-        if binding_type == 'ring':
-            if quantity <= 30:
-                return 2200  # 고정: 링제본 1-30부
-            elif quantity <= 49:
-                return 1650  # 고정: 링제본 31-49부
-            elif quantity <= 99:
-                return 1430  # 고정: 링제본 50-99부
-            else:  # 100부 이상
-                return 1100  # 고정: 링제본 100부이상
-        elif binding_type == 'perfect':
-            if quantity <= 30:
-                return 2200  # 고정: 무선제본 1-30부
-            elif quantity <= 49:
-                return 1100  # 고정: 무선제본 31-49부
-            elif quantity <= 99:
-                return 770   # 고정: 무선제본 50-99부
-            else:  # 100부 이상
-                return 770   # 고정: 무선제본 100부이상
-        elif binding_type == 'saddle':
-            return 330  # 고정: 중철제본 부당 330원
-        elif binding_type == 'folding':
-            return 500  # 고정: 접지제본 기본 가격
-        else:
+# 견적 단가표
+# 단가는 tariff.json(app.config['TARIFF_FILE'])에 있으며 워커마다 한 번 컴파일해 메모리에 둔다.
+# 출력 단가는 총 페이지 수(페이지 × 수량) 구간, 제본 단가는 수량 구간으로 결정된다.
+# 구간 상한(tier_limits)은 오름차순이며, 상한을 넘는 값은 마지막 단가를 적용한다.
+class CompiledTariff:
+    """단가표를 구간 배열로 한 번만 컴파일해 두고 bisect로 단가를 조회"""
+
+    def __init__(self, table):
+        self.version = table['version']
+        self.tax_rate = table.get('tax_rate', 0.1)
+        # 같은 버전명이라도 내용이 바뀌면 구분할 수 있도록 내용 해시를 함께 보관
+        canonical = json.dumps(table, sort_keys=True, ensure_ascii=False)
+        self.digest = hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+        self.loaded_at = datetime.now()
+
+        print_table = table['print']
+        self.print_limits = tuple(print_table['tier_limits'])
+        self.print_prices = {
+            (print_type, print_method): tuple(prices)
+            for print_type, methods in print_table['prices'].items()
+            for print_method, prices in methods.items()
+        }
+        self.default_print_prices = {
+            print_method: tuple(prices)
+            for print_method, prices in print_table['default'].items()
+        }
+
+        self.binding_tiers = {
+            binding_type: (tuple(tier['tier_limits']), tuple(tier['prices']))
+            for binding_type, tier in table['binding'].items()
+        }
+
+        for limits in [self.print_limits] + [limits for limits, _ in self.binding_tiers.values()]:
+            if list(limits) != sorted(limits):
+                raise ValueError(f'구간 상한은 오름차순이어야 합니다: {self.version}')
+        for prices in list(self.print_prices.values()) + list(self.default_print_prices.values()):
+            if len(prices) != len(self.print_limits) + 1:
+                raise ValueError(f'출력 단가 구간 수가 맞지 않습니다: {self.version}')
+        for limits, prices in self.binding_tiers.values():
+            if len(prices) != len(limits) + 1:
+                raise ValueError(f'제본 단가 구간 수가 맞지 않습니다: {self.version}')
+
+        self._compile_arrays()
+
+    def _compile_arrays(self):
+        """대량 견적용 NumPy 단가 행렬 (출력: 행=출력타입×방식, 제본: 행=제본타입)"""
+        self.print_methods = tuple(self.default_print_prices)
+        self.print_rows = {}
+        print_rows = []
+        for key, prices in self.print_prices.items():
+            self.print_rows[key] = len(print_rows)
+            print_rows.append(prices)
+        # 알 수 없는 출력 타입용 기본 단가 행
+        self.default_print_rows = {}
+        for print_method, prices in self.default_print_prices.items():
+            self.default_print_rows[print_method] = len(print_rows)
+            print_rows.append(prices)
+        self.print_limit_array = np.array(self.print_limits, dtype=np.int64)
+        self.print_price_matrix = np.array(print_rows, dtype=np.int64)
+
+        # 제본 구간 수가 타입마다 다르므로 상한은 최대값, 단가는 마지막 단가로 채운다
+        width = max((len(limits) for limits, _ in self.binding_tiers.values()), default=0)
+        padding = np.iinfo(np.int64).max
+        self.binding_rows = {}
+        limit_rows = []
+        price_rows = []
+        for binding_type, (limits, prices) in self.binding_tiers.items():
+            self.binding_rows[binding_type] = len(limit_rows)
+            limit_rows.append(list(limits) + [padding] * (width - len(limits)))
+            price_rows.append(list(prices) + [prices[-1]] * (width - len(limits)))
+        # 알 수 없는 제본 타입은 0원
+        self.no_binding_row = len(limit_rows)
+        limit_rows.append([padding] * width)
+        price_rows.append([0] * (width + 1))
+        self.binding_limit_matrix = np.array(limit_rows, dtype=np.int64).reshape(len(limit_rows), width)
+        self.binding_price_matrix = np.array(price_rows, dtype=np.int64)
+
+    def print_price(self, print_type, total_pages, print_method):
+        """총 페이지 수 구간에 해당하는 페이지당 출력 단가"""
+        prices = self.print_prices.get((print_type, print_method))
+        if prices is None:
+            # 알 수 없는 출력 방식(단면/양면 외)은 기존과 동일하게 KeyError
+            prices = self.default_print_prices[print_method]
+        return prices[bisect_left(self.print_limits, total_pages)]
+
+    def binding_price(self, binding_type, quantity):
+        """수량 구간에 해당하는 부당 제본 단가 (알 수 없는 제본은 0원)"""
+        tier = self.binding_tiers.get(binding_type)
+        if tier is None:
             return 0
+        limits, prices = tier
+        return prices[bisect_left(limits, quantity)]
+
+    def price_curve(self, print_type, print_method, binding_type):
+        """옵션 조합의 구간 함수 (출력 상한/단가, 제본 상한/단가)"""
+        print_prices = self.print_prices.get((print_type, print_method))
+        if print_prices is None:
+            print_prices = self.default_print_prices[print_method]
+        binding_limits, binding_prices = self.binding_tiers.get(binding_type, ((), (0,)))
+        return self.print_limits, print_prices, binding_limits, binding_prices
+
+    def price_rows_for(self, print_type, print_method, binding_type):
+        """대량 견적용 행 번호 (출력 단가 행, 제본 단가 행)"""
+        print_row = self.print_rows.get((print_type, print_method))
+        if print_row is None:
+            print_row = self.default_print_rows[print_method]
+        return print_row, self.binding_rows.get(binding_type, self.no_binding_row)
+
+    def calculate_batch(self, print_rows, binding_rows, quantities, pages):
+        """여러 견적을 한 번에 계산 (calculate_price와 같은 항목을 배열로 반환)"""
+        print_rows = np.asarray(print_rows, dtype=np.intp)
+        binding_rows = np.asarray(binding_rows, dtype=np.intp)
+        quantities = np.asarray(quantities, dtype=np.int64)
+        pages = np.asarray(pages, dtype=np.int64)
+
+        total_pages = pages * quantities
+
+        print_tiers = np.searchsorted(self.print_limit_array, total_pages, side='left')
+        unit_print_price = self.print_price_matrix[print_rows, print_tiers]
+        total_print_price = unit_print_price * total_pages
+
+        # bisect_left와 같도록 수량보다 작은 상한의 개수를 구간 번호로 사용
+        binding_tiers = (self.binding_limit_matrix[binding_rows] < quantities[:, None]).sum(axis=1)
+        unit_binding_price = self.binding_price_matrix[binding_rows, binding_tiers]
+        total_binding_price = unit_binding_price * quantities
+
+        total_price_with_tax = total_print_price + total_binding_price
+        tax_amount = np.round(total_price_with_tax * self.tax_rate).astype(np.int64)
+
+        return {
+            'unit_price': unit_print_price * pages + unit_binding_price,
+            'total_price': total_price_with_tax - tax_amount,
+            'total_price_with_tax': total_price_with_tax,
+            'tax_amount': tax_amount,
+            'print_price': total_print_price,
+            'binding_price': total_binding_price,
+            'unit_print_price': unit_print_price,
+            'unit_binding_price': unit_binding_price,
+            'pages': pages,
+            'total_pages': total_pages
+        }
+
+
+
+class TariffStore:
+    """단가표 파일 감시 및 교체
+    
+    요청 처리 스레드는 잠금 없이 current만 읽는다. 파일 변경은 check_interval마다
+    mtime/크기로 확인하며, 확인은 잠금을 얻은 한 스레드만 하고 나머지는 기다리지 않고
+    기존 단가표를 사용한다. 새 단가표는 완전히 컴파일된 뒤 참조 교체 한 번으로 반영된다.
+    gunicorn 워커는 각자 파일을 감시하므로, 단가표는 임시 파일에 쓴 뒤 os.replace로 바꿔야 한다.
+    """
+
+    def __init__(self, path, check_interval=2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self.current = None
+        self.history = {}  # digest -> CompiledTariff (재발행 견적 재현용)
+        self._stamp = None
+        self._next_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._listeners = []
+        
+        if not self._reload_if_changed():
+            raise RuntimeError(f'단가표를 불러올 수 없습니다: {path}')
+
+    def get(self):
+        """현재 단가표 (필요하면 변경 여부 확인)"""
+        now = time.monotonic()
+        if now >= self._next_check and self._reload_lock.acquire(blocking=False):
+            try:
+                self._next_check = now + self.check_interval
+                self._reload_if_changed()
+            finally:
+                self._reload_lock.release()
+        return self.current
+
+    def find(self, digest):
+        """해시로 이전에 불러온 단가표 찾기"""
+        return self.history.get(digest)
+
+    def add_listener(self, callback):
+        """단가표 교체 시 호출할 함수 등록 (callback(new_tariff))"""
+        self._listeners.append(callback)
+
+    def _reload_if_changed(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError as e:
+            print(f"⚠️ 단가표 파일 확인 실패: {e}")
+            return False
+        
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return True
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                tariff = CompiledTariff(json.load(f))
+        except Exception as e:
+            # 잘못된 파일은 다시 바뀔 때까지 무시하고 기존 단가표 유지
+            print(f"⚠️ 단가표 로드 실패, 기존 단가표 유지: {e}")
+            self._stamp = stamp
+            return False
+        
+        self._stamp = stamp
+        if self.current is not None and tariff.digest == self.current.digest:
+            return True
+        
+        self.history[tariff.digest] = tariff
+        self.current = tariff
+        print(f"✅ 단가표 적용: {tariff.version} ({tariff.digest})")
+        
+        for callback in self._listeners:
+            try:
+                callback(tariff)
+            except Exception as e:
+                print(f"⚠️ 단가표 교체 알림 오류: {e}")
+        return True
+
+
+tariff_store = TariffStore(app.config['TARIFF_FILE'], app.config['TARIFF_CHECK_INTERVAL'])
+
+def get_active_tariff():
+    """현재 적용 중인 단가표"""
+    return tariff_store.get()
+
+# 대량 견적 품목당 수량/페이지 상한 (int64 계산 범위 보호)
+BATCH_QUOTE_MAX_VALUE = 1000000
+
+def calculate_price(print_type, binding_type, quantity, pages, size, print_method='single', tariff=None):
+    """정확한 단가표 기반 견적 계산 로직 (tariff 미지정 시 현재 단가표 사용)"""
+    if tariff is None:
+        tariff = get_active_tariff()
     
     # 총 페이지 수 계산 (페이지 × 수량)
     total_pages = pages * quantity
     
     # 출력 가격 계산 (총 페이지 수 기준)
-    unit_print_price = get_print_price(print_type, total_pages, print_method)
+    unit_print_price = tariff.print_price(print_type, total_pages, print_method)
     total_print_price = unit_print_price * total_pages
     
     # 제본 가격 계산 (부당 가격)
-    unit_binding_price = get_binding_price(binding_type, quantity)
+    unit_binding_price = tariff.binding_price(binding_type, quantity)
     total_binding_price = unit_binding_price * quantity
     
     # 총 가격 (출력비 + 제본비) - 부가세 포함
     total_price_with_tax = total_print_price + total_binding_price
     
     # 세액 계산 (부가세 10%)
-    tax_amount = round(total_price_with_tax * 0.1)
+    tax_amount = round(total_price_with_tax * tariff.tax_rate)
     
     # 총 가격 (부가세 제외) - 합계금액에서 세액 제외
     total_price_without_tax = total_price_with_tax - tax_amount
@@ -311,8 +616,709 @@ def calculate_price(print_type, binding_type, quantity, pages, size, print_metho
         'unit_print_price': unit_print_price,
         'unit_binding_price': unit_binding_price,
         'pages': pages,
-        'total_pages': total_pages
+        'total_pages': total_pages,
+        'tariff_version': tariff.version,
+        'tariff_digest': tariff.digest
+    }
+
+def next_tier_hints(print_type, binding_type, quantity, pages, print_method='single', tariff=None):
+    """다음 단가 구간까지 몇 부를 더하면 되는지 안내 (단가가 실제로 내려가는 경우만)"""
+    if tariff is None:
+        tariff = get_active_tariff()
+    if quantity < 1 or pages < 1:
+        return []
+    
+    print_limits, print_prices, binding_limits, binding_prices = tariff.price_curve(
+        print_type, print_method, binding_type)
+    hints = []
+    
+    # 제본: 수량 구간
+    tier = bisect_left(binding_limits, quantity)
+    if tier < len(binding_limits) and binding_prices[tier + 1] < binding_prices[tier]:
+        extra = binding_limits[tier] + 1 - quantity
+        hints.append({
+            'type': 'binding',
+            'extra_copies': extra,
+            'unit_binding_price': binding_prices[tier],
+            'next_unit_binding_price': binding_prices[tier + 1],
+            'message': f'{extra}부 추가 시 제본 단가 {binding_prices[tier]:,}원 → {binding_prices[tier + 1]:,}원'
+        })
+    
+    # 출력: 총 페이지 수 구간
+    total_pages = pages * quantity
+    tier = bisect_left(print_limits, total_pages)
+    if tier < len(print_limits) and print_prices[tier + 1] < print_prices[tier]:
+        extra = -(-(print_limits[tier] + 1) // pages) - quantity
+        hints.append({
+            'type': 'print',
+            'extra_copies': extra,
+            'unit_print_price': print_prices[tier],
+            'next_unit_print_price': print_prices[tier + 1],
+            'message': f'{extra}부 추가 시 페이지당 단가 {print_prices[tier]:,}원 → {print_prices[tier + 1]:,}원'
+        })
+    
+    for hint in hints:
+        after = calculate_price(print_type, binding_type, quantity + hint['extra_copies'], pages,
+                                'A4', print_method, tariff=tariff)
+        hint['total_price_with_tax'] = after['total_price_with_tax']
+    
+    return sorted(hints, key=lambda hint: hint['extra_copies'])
+
+def _cheapest_split(curve, pages, quantity, max_runs):
+    """quantity부를 최대 max_runs번으로 나눠 만들 때 가장 싼 분할 (부수 목록, 부가세 포함 금액)
+    
+    한 구간 안에서 비용은 부수에 비례하므로, 최적 분할에서 구간 경계가 아닌 부수는 많아야 하나다
+    (경계가 아닌 두 묶음은 부당 비용이 낮은 쪽으로 부수를 옮겨도 비싸지지 않음).
+    따라서 경계 부수들의 조합 + 나머지 한 묶음만 탐색하고, 최저 부당 비용으로 하한을 잡아 가지친다.
+    """
+    print_limits, print_prices, binding_limits, binding_prices = curve
+    
+    def run_cost(copies):
+        total_pages = copies * pages
+        return (print_prices[bisect_left(print_limits, total_pages)] * total_pages
+                + binding_prices[bisect_left(binding_limits, copies)] * copies)
+    
+    best = {'runs': [quantity], 'cost': run_cost(quantity)}
+    if max_runs < 2 or quantity < 2:
+        return best['runs'], best['cost']
+    
+    # 단가가 구간을 따라 내려가기만 하면 부당 비용도 줄어들므로 분할은 절대 유리하지 않다
+    if list(print_prices) == sorted(print_prices, reverse=True) and \
+       list(binding_prices) == sorted(binding_prices, reverse=True):
+        return best['runs'], best['cost']
+    
+    # 구간 경계 부수 (각 구간의 양 끝)
+    boundaries = set()
+    for limit in binding_limits:
+        boundaries.update((limit, limit + 1))
+    for limit in print_limits:
+        boundaries.update((limit // pages, limit // pages + 1))
+    candidates = sorted((copies for copies in boundaries if 1 <= copies < quantity), reverse=True)
+    min_unit_cost = pages * min(print_prices) + min(binding_prices)
+    
+    def search(start, remaining, runs, cost):
+        # 남은 부수를 마지막 한 묶음으로
+        total = cost + run_cost(remaining)
+        if total < best['cost']:
+            best['runs'] = runs + [remaining]
+            best['cost'] = total
+        if len(runs) + 2 > max_runs:
+            return
+        
+        for index in range(start, len(candidates)):
+            copies = candidates[index]
+            if copies >= remaining:
+                continue
+            new_cost = cost + run_cost(copies)
+            if new_cost + (remaining - copies) * min_unit_cost >= best['cost']:
+                continue
+            search(index, remaining - copies, runs + [copies], new_cost)
+    
+    search(0, quantity, [], 0)
+    return sorted(best['runs'], reverse=True), best['cost']
+
+def _solver_choices(values, known, field):
+    """탐색할 선택지 (없으면 단가표의 전체 값, 단가표에 없는 값이 있으면 QuoteInputError)"""
+    if not values:
+        return known
+    if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+        raise QuoteInputError(f'{field}는 문자열 목록이어야 합니다.')
+    unknown = [value for value in values if value not in known]
+    if unknown:
+        raise QuoteInputError(f"{field}에 지원하지 않는 값이 있습니다: {', '.join(unknown)}")
+    return list(dict.fromkeys(values))
+
+def find_cheapest_configurations(pages, quantity, print_types=None, print_methods=None,
+                                 binding_types=None, budget=None, max_runs=None, limit=10, tariff=None):
+    """페이지 수와 수량에 맞는 가장 저렴한 출력/인쇄방식/제본 조합을 가격순으로 반환
+    
+    조합마다 분할 제작(예: 120부를 두 번에 나눠 제작)까지 고려한 최저가를 구한다.
+    budget이 있으면 부가세 포함 금액이 그 이하인 조합만 남긴다.
+    max_runs가 없으면 QUOTE_SOLVER_MAX_RUNS 설정값을 사용한다.
+    """
+    if tariff is None:
+        tariff = get_active_tariff()
+    if max_runs is None:
+        max_runs = app.config['QUOTE_SOLVER_MAX_RUNS']
+    if pages < 1 or quantity < 1:
+        raise QuoteInputError('수량과 페이지 수를 확인해주세요.')
+    
+    print_types = _solver_choices(print_types, sorted({print_type for print_type, _ in tariff.print_prices}),
+                                  'printTypes')
+    print_methods = _solver_choices(print_methods, list(tariff.default_print_prices), 'printMethods')
+    binding_types = _solver_choices(binding_types, list(tariff.binding_tiers), 'bindingTypes')
+    
+    results = []
+    for print_type, print_method, binding_type in product(print_types, print_methods, binding_types):
+        try:
+            curve = tariff.price_curve(print_type, print_method, binding_type)
+        except KeyError:
+            continue
+        
+        runs, cost = _cheapest_split(curve, pages, quantity, max_runs)
+        if budget is not None and cost > budget:
+            continue
+        
+        run_quotes = [calculate_price(print_type, binding_type, copies, pages, 'A4', print_method, tariff=tariff)
+                      for copies in runs]
+        single_run = run_quotes[0] if len(runs) == 1 else calculate_price(
+            print_type, binding_type, quantity, pages, 'A4', print_method, tariff=tariff)
+        
+        results.append({
+            'printType': print_type,
+            'printMethod': print_method,
+            'bindingType': binding_type,
+            'runs': runs,
+            'run_quotes': run_quotes,
+            'total_price_with_tax': cost,
+            'tax_amount': sum(run_quote['tax_amount'] for run_quote in run_quotes),
+            'total_price': sum(run_quote['total_price'] for run_quote in run_quotes),
+            'single_run_price_with_tax': single_run['total_price_with_tax'],
+            'savings': single_run['total_price_with_tax'] - cost
+        })
+    
+    results.sort(key=lambda result: (result['total_price_with_tax'], len(result['runs'])))
+    return results[:limit]
+
+class QuoteCache:
+    """견적 계산 결과 LRU 캐시 (스레드 안전, 적중/실패/축출 횟수 집계)"""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class SingleFlight:
+    """같은 키의 작업이 동시에 여러 번 요청되면 한 번만 실행하고 결과를 함께 사용 (스레드 간)"""
+    
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+    
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+    
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        
+        if not leader:
+            # 먼저 시작한 요청의 결과를 기다림 (실패도 같이 전달)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executions': self.executions,
+                'coalesced': self.coalesced
+            }
+
+
+class MetricsRegistry:
+    """이름별 측정값 통계 (횟수/합계/최소/최대, 최근 window개 값으로 p50/p95 계산, 웹 워커 프로세스별)"""
+    
+    def __init__(self, window=1000):
+        self.window = window
+        self._series = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, name, value):
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = {'count': 0, 'total': 0.0, 'min': value, 'max': value,
+                                               'recent': deque(maxlen=self.window)}
+            series['count'] += 1
+            series['total'] += value
+            series['min'] = min(series['min'], value)
+            series['max'] = max(series['max'], value)
+            series['recent'].append(value)
+    
+    def snapshot(self):
+        with self._lock:
+            series = {name: (dict(data), sorted(data['recent'])) for name, data in self._series.items()}
+        
+        result = {}
+        for name, (data, recent) in sorted(series.items()):
+            result[name] = {
+                'count': data['count'],
+                'avg': round(data['total'] / data['count'], 3),
+                'min': data['min'],
+                'max': data['max'],
+                'p50': recent[len(recent) // 2],
+                'p95': recent[min(len(recent) - 1, int(len(recent) * 0.95))]
+            }
+        return result
+    
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+metrics = MetricsRegistry()
+
+quote_cache = QuoteCache(app.config['QUOTE_CACHE_SIZE'])
+# 단가표가 바뀌면 이전 결과는 필요 없으므로 비운다 (키에도 단가표 해시가 포함됨)
+tariff_store.add_listener(lambda tariff: quote_cache.clear())
+
+QUOTE_REQUIRED_FIELDS = ('printType', 'bindingType', 'quantity', 'pages')
+# 단가표 조회 키로 쓰는 필드 (문자열만 허용)
+QUOTE_STRING_FIELDS = ('printType', 'bindingType', 'printMethod', 'size')
+
+class QuoteInputError(ValueError):
+    """견적 요청 데이터 검증 오류"""
+
+def invalid_quote_string_field(data):
+    """문자열이 아닌 단가표 조회 필드 이름 (없으면 None) - 목록/객체로 조회하면 TypeError가 나므로 미리 확인"""
+    return next((field for field in QUOTE_STRING_FIELDS if field in data and not isinstance(data[field], str)), None)
+
+def price_quote_request(data):
+    """견적 요청 데이터(JSON)로 가격 계산
+    
+    요청 값 그대로를 키로 캐시하므로 적중 시 검증, 정수 변환, 결과 dict 생성이 모두 생략된다.
+    반환된 dict는 캐시와 공유되므로 수정하면 안 된다.
+    """
+    if not data or not isinstance(data, dict):
+        raise QuoteInputError('견적 데이터가 없습니다.')
+    
+    tariff = get_active_tariff()
+    try:
+        key = (tariff.digest, data.get('printType'), data.get('bindingType'),
+               data.get('quantity'), data.get('pages'),
+               data.get('size', 'A4'), data.get('printMethod', 'single'))
+        price_info = quote_cache.get(key)
+    except TypeError:
+        # 목록 등 해시할 수 없는 값은 캐시하지 않음
+        key = None
+        price_info = None
+    
+    if price_info is not None:
+        return price_info
+    
+    for field in QUOTE_REQUIRED_FIELDS:
+        if field not in data or not data[field]:
+            raise QuoteInputError(f'{field} 필드가 필요합니다.')
+    invalid = invalid_quote_string_field(data)
+    if invalid:
+        raise QuoteInputError(f'{invalid} 필드는 문자열이어야 합니다.')
+    
+    try:
+        price_info = calculate_price(
+            data['printType'],
+            data['bindingType'],
+            safe_int_conversion(data['quantity']),
+            safe_int_conversion(data['pages']),
+            data.get('size', 'A4'),
+            data.get('printMethod', 'single'),
+            tariff=tariff
+        )
+    except KeyError:
+        # 단가표에 없는 인쇄 방식 (대량 견적/다품목 견적서와 같은 응답)
+        raise QuoteInputError('지원하지 않는 출력 방식입니다.')
+    
+    if key is not None:
+        quote_cache.put(key, price_info)
+    return price_info
+
+def custom_line_price(unit_price, quantity, tariff=None):
+    """단가표에 없는 품목(색인 간지 등)의 가격 - calculate_price와 같은 형태"""
+    if tariff is None:
+        tariff = get_active_tariff()
+    
+    total_price_with_tax = unit_price * quantity
+    tax_amount = round(total_price_with_tax * tariff.tax_rate)
+    return {
+        'unit_price': unit_price,
+        'total_price': total_price_with_tax - tax_amount,
+        'total_price_with_tax': total_price_with_tax,
+        'tax_amount': tax_amount,
+        'discount_rate': 0,
+        'print_price': 0,
+        'binding_price': 0,
+        'unit_print_price': 0,
+        'unit_binding_price': 0,
+        'pages': 0,
+        'total_pages': 0,
+        'tariff_version': tariff.version,
+        'tariff_digest': tariff.digest
+    }
+
+def quote_product_name(spec):
+    """견적서 품목명 (예: A4 흑백 양면 링제본)"""
+    if spec.get('name'):
+        return spec['name']
+    
+    print_type_map = {
+        'black_white': '흑백',
+        'laser_color': '레이저칼라',
+        'ink_color': '잉크칼라'
+    }
+    binding_type_map = {
+        'ring': '링제본',
+        'perfect': '무선제본',
+        'saddle': '중철제본',
+        'folding': '접지제본'
+    }
+    print_method_map = {
+        'single': '단면',
+        'double': '양면'
     }
+    
+    parts = [
+        spec.get('size', 'A4'),
+        print_type_map.get(spec.get('printType'), spec.get('printType', '')),
+        print_method_map.get(spec.get('printMethod', 'single'), ''),
+        binding_type_map.get(spec.get('bindingType'), spec.get('bindingType', ''))
+    ]
+    return ' '.join(part for part in parts if part)
+
+class QuoteDocument:
+    """여러 품목으로 된 견적서 (예: 표지 레이저칼라 + 본문 흑백 + 색인 간지)
+    
+    품목을 추가/수정/삭제하면 해당 품목만 다시 계산하고 합계에는 차액만 반영한다.
+    이메일 본문 같은 결과물은 render()로 만들어 두고 내용이 바뀔 때만 다시 만든다.
+    """
+    
+    TOTAL_KEYS = ('total_price', 'total_price_with_tax', 'tax_amount',
+                  'print_price', 'binding_price', 'total_pages')
+    CUSTOMER_FIELDS = ('customerName', 'email', 'phone')
+    
+    def __init__(self, customer=None, tariff=None, document_id=None):
+        self.id = document_id or generate_quote_public_id()
+        self.persisted = document_id is not None  # Quote로 저장된 견적서인지 (공개 ID가 의미 있는지)
+        customer = customer or {}
+        self.customer = {field: customer.get(field, '') for field in self.CUSTOMER_FIELDS}
+        self.tariff = tariff or get_active_tariff()
+        self.lines = []
+        self.totals = dict.fromkeys(self.TOTAL_KEYS, 0)
+        self.revision = 0
+        self.created_at = datetime.now()
+        self.lock = threading.RLock()
+        self._renders = {}
+    
+    @classmethod
+    def from_items(cls, customer, items, tariff=None):
+        """품목 사양 목록으로 견적서 생성"""
+        document = cls(customer, tariff)
+        for spec in items:
+            document.add_line(spec)
+        return document
+    
+    @classmethod
+    def from_priced(cls, data, price_info):
+        """이미 계산된 단일 견적 (기존 /quote 흐름)을 견적서로 감싸기"""
+        tariff = tariff_store.find(price_info.get('tariff_digest')) or get_active_tariff()
+        document = cls(data, tariff)
+        document._insert(len(document.lines), document._normalize(data), price_info)
+        return document
+    
+    @classmethod
+    def from_lines(cls, customer, lines, tariff=None, document_id=None):
+        """저장해 둔 (품목 사양, 계산 결과) 목록으로 견적서 복원 (재계산 없음)"""
+        document = cls(customer, tariff, document_id=document_id)
+        for spec, price_info in lines:
+            document._insert(len(document.lines), spec, price_info)
+        return document
+    
+    def snapshot(self):
+        """다른 프로세스로 보낼 수 있는 견적서 데이터 (고객, 품목, 단가표 해시, 저장된 견적이면 공개 ID)"""
+        with self.lock:
+            return (dict(self.customer),
+                    [(line['spec'], line['price_info']) for line in self.lines],
+                    self.tariff.digest,
+                    self.id if self.persisted else None)
+    
+    def _normalize(self, spec):
+        """품목 사양 검증 및 정규화"""
+        if not isinstance(spec, dict):
+            raise QuoteInputError('품목 형식이 올바르지 않습니다.')
+        
+        normalized = {
+            'name': spec.get('name', ''),
+            'quantity': safe_int_conversion(spec.get('quantity')),
+            'note': spec.get('note', '')
+        }
+        if 'unitPrice' in spec and not spec.get('printType'):
+            # 단가표에 없는 품목은 단가를 직접 지정
+            normalized['unitPrice'] = safe_int_conversion(spec['unitPrice'])
+            if not normalized['name']:
+                raise QuoteInputError('name 필드가 필요합니다.')
+            if not 0 <= normalized['unitPrice'] <= app.config['QUOTE_CUSTOM_UNIT_PRICE_MAX']:
+                raise QuoteInputError(
+                    f"unitPrice는 0 ~ {app.config['QUOTE_CUSTOM_UNIT_PRICE_MAX']:,} 사이여야 합니다.")
+        else:
+            for field in QUOTE_REQUIRED_FIELDS:
+                if field not in spec or not spec[field]:
+                    raise QuoteInputError(f'{field} 필드가 필요합니다.')
+            invalid = invalid_quote_string_field(spec)
+            if invalid:
+                raise QuoteInputError(f'{invalid} 필드는 문자열이어야 합니다.')
+            normalized.update({
+                'printType': spec['printType'],
+                'bindingType': spec['bindingType'],
+                'pages': safe_int_conversion(spec['pages']),
+                'size': spec.get('size', 'A4'),
+                'printMethod': spec.get('printMethod', 'single')
+            })
+            if normalized['pages'] < 1:
+                raise QuoteInputError('pages 필드가 필요합니다.')
+        
+        if normalized['quantity'] < 1:
+            raise QuoteInputError('quantity 필드가 필요합니다.')
+        return normalized
+    
+    def _price(self, spec):
+        if 'unitPrice' in spec:
+            return custom_line_price(spec['unitPrice'], spec['quantity'], tariff=self.tariff)
+        try:
+            return calculate_price(spec['printType'], spec['bindingType'], spec['quantity'], spec['pages'],
+                                   spec['size'], spec['printMethod'], tariff=self.tariff)
+        except KeyError:
+            raise QuoteInputError('지원하지 않는 출력 방식입니다.')
+    
+    def _apply(self, old_price, new_price):
+        """합계에 품목 하나의 차액만 반영"""
+        for key in self.TOTAL_KEYS:
+            self.totals[key] += (new_price[key] if new_price else 0) - (old_price[key] if old_price else 0)
+        self.revision += 1
+        self._renders.clear()
+    
+    def _insert(self, index, spec, price_info):
+        self.lines.insert(index, {'spec': spec, 'price_info': price_info})
+        self._apply(None, price_info)
+    
+    def add_line(self, spec):
+        with self.lock:
+            spec = self._normalize(spec)
+            self._insert(len(self.lines), spec, self._price(spec))
+            return len(self.lines) - 1
+    
+    def update_line(self, index, changes):
+        """품목 하나 수정 (해당 품목만 재계산)"""
+        if not isinstance(changes, dict):
+            raise QuoteInputError('품목 형식이 올바르지 않습니다.')
+        with self.lock:
+            line = self.lines[index]
+            spec = self._normalize({**line['spec'], **changes})
+            price_info = self._price(spec)
+            self._apply(line['price_info'], price_info)
+            self.lines[index] = {'spec': spec, 'price_info': price_info}
+    
+    def remove_line(self, index):
+        with self.lock:
+            line = self.lines.pop(index)
+            self._apply(line['price_info'], None)
+    
+    def render(self, kind, builder):
+        """작은 결과물(이메일 본문 등)을 내용이 바뀌기 전까지 한 번만 생성
+        
+        PDF/PNG 바이트는 여기 두지 않는다 (캐시된 견적서마다 쌓이므로 디스크 캐시에서 읽음).
+        """
+        with self.lock:
+            if kind not in self._renders:
+                self._renders[kind] = builder(self)
+            return self._renders[kind]
+    
+    @property
+    def tariff_version(self):
+        """품목 계산에 실제로 쓰인 단가표 버전"""
+        versions = {line['price_info'].get('tariff_version') for line in self.lines} - {None}
+        return ', '.join(sorted(versions)) or self.tariff.version
+    
+    def summary(self):
+        """JSON API 응답용 요약"""
+        return self.render('json', lambda document: {
+            'id': document.id,
+            'revision': document.revision,
+            'customer': document.customer,
+            'items': [
+                {'index': index, 'product_name': quote_product_name(line['spec']), **line['spec'],
+                 'price_info': line['price_info']}
+                for index, line in enumerate(document.lines)
+            ],
+            'totals': dict(document.totals),
+            'tariff_version': document.tariff_version,
+            'tariff_digest': document.tariff.digest
+        })
+
+
+# 최근 사용한 견적서 (워커 메모리 캐시, 원본은 Quote 테이블)
+quote_documents = QuoteCache(app.config['QUOTE_DOCUMENT_CACHE_SIZE'])
+
+def generate_quote_public_id():
+    """견적 공개 ID (예: Q3F9A1C07B)"""
+    return f"Q{uuid.uuid4().hex[:9].upper()}"
+
+def save_quote_document(document, quote=None):
+    """견적서를 Quote로 저장 (내용이 바뀐 경우 저장된 PDF는 비움)"""
+    if quote is None:
+        quote = Quote.query.filter_by(public_id=document.id).first()
+    if quote is None:
+        quote = Quote(public_id=document.id)
+        db.session.add(quote)
+    
+    if quote.items_json is None or quote.revision != document.revision:
+        quote.customer_name = document.customer.get('customerName')
+        quote.email = document.customer.get('email')
+        quote.phone = document.customer.get('phone')
+        quote.items_json = json.dumps([line['spec'] for line in document.lines], ensure_ascii=False)
+        quote.prices_json = json.dumps([line['price_info'] for line in document.lines], ensure_ascii=False)
+        quote.total_price = document.totals['total_price']
+        quote.total_price_with_tax = document.totals['total_price_with_tax']
+        quote.tariff_version = document.tariff_version
+        quote.tariff_digest = document.tariff.digest
+        quote.revision = document.revision
+        quote.pdf_data = None
+        db.session.commit()
+    
+    document.persisted = True
+    quote_documents.put(document.id, document)
+    return quote
+
+def load_quote_document(public_id):
+    """공개 ID로 견적서와 Quote 조회 (다른 워커가 수정했으면 다시 읽음)"""
+    quote = Quote.query.filter_by(public_id=public_id).first()
+    if quote is None:
+        return None, None
+    
+    document = quote_documents.get(public_id)
+    if document is None or document.revision != quote.revision:
+        # 저장된 계산 결과를 그대로 사용 (재계산 없음)
+        tariff = tariff_store.find(quote.tariff_digest) or get_active_tariff()
+        document = QuoteDocument.from_lines(
+            {'customerName': quote.customer_name, 'email': quote.email, 'phone': quote.phone},
+            zip(json.loads(quote.items_json), json.loads(quote.prices_json)),
+            tariff, document_id=quote.public_id)
+        document.revision = quote.revision
+        quote_documents.put(public_id, document)
+    
+    return document, quote
+
+def quote_request_fingerprint(data):
+    """같은 견적 요청인지 판단하는 키 (요청 내용 + 적용 단가표)"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{get_active_tariff().digest}:{payload}".encode('utf-8')).hexdigest()[:16]
+
+def create_quote(data, price_info):
+    """계산한 단건 견적을 저장하고 (견적서, Quote) 반환 (같은 세션의 같은 요청이면 저장된 견적 재사용)"""
+    fingerprint = quote_request_fingerprint(data)
+    # [요청 키, 공개 ID, 저장 당시 revision] 목록 (세션 쿠키는 dict 순서를 보존하지 않으므로 list)
+    recent = session.get('recent_quotes', [])
+    for key, public_id, revision in recent:
+        if key == fingerprint:
+            document, quote = load_quote_document(public_id)
+            if quote is not None and quote.revision == revision:
+                return document, quote
+    
+    document = QuoteDocument.from_priced(data, price_info)
+    quote = save_quote_document(document)
+    remember_session_quote(quote, fingerprint)
+    return document, quote
+
+def remember_session_quote(quote, fingerprint=None):
+    """이 세션이 만든 견적으로 기록 (같은 요청이면 재사용, 견적 메일 발송 권한 확인에 사용)"""
+    recent = [entry for entry in session.get('recent_quotes', [])
+              if entry[1] != quote.public_id and (fingerprint is None or entry[0] != fingerprint)]
+    recent.append([fingerprint, quote.public_id, quote.revision])
+    session['recent_quotes'] = recent[-app.config['QUOTE_SESSION_RECENT']:]
+
+def is_session_quote(public_id):
+    """이 세션(브라우저)이 만든 견적인지"""
+    return any(entry[1] == public_id for entry in session.get('recent_quotes', []))
+
+def purge_stored_quote_pdfs(keep_id=None):
+    """보관 기간이 지났거나 보관 수를 넘은 저장 PDF 비우기 (견적은 그대로, PDF는 필요하면 다시 생성)"""
+    stored = Quote.query.filter(Quote.pdf_data.isnot(None), Quote.id != keep_id).with_entities(Quote.id)
+    cutoff = datetime.utcnow() - timedelta(days=app.config['QUOTE_PDF_KEEP_DAYS'])
+    expired = [quote_id for (quote_id,) in stored.filter(Quote.updated_at < cutoff)]
+    expired += [quote_id for (quote_id,) in stored.filter(Quote.updated_at >= cutoff)
+                .order_by(Quote.updated_at.desc()).offset(max(app.config['QUOTE_PDF_STORE_LIMIT'] - 1, 0))]
+    if expired:
+        Quote.query.filter(Quote.id.in_(expired)).update({'pdf_data': None}, synchronize_session=False)
+
+def stored_quote_pdf(document, quote):
+    """Quote에 저장된 기본 양식 견적 PDF (없으면 한 번 생성해 저장, 커밋은 호출한 쪽에서)"""
+    if quote.pdf_data is None:
+        quote.pdf_data = render_quote_document_pdf(document)
+        purge_stored_quote_pdfs(keep_id=quote.id)
+    return quote.pdf_data
+
+def quote_pdf_bytes(document, quote, template=None):
+    """저장된 견적 PDF (없으면 한 번 생성해 저장, 기본 양식이 아니면 저장하지 않고 생성)"""
+    if quote_template_name(template) != app.config['QUOTE_PDF_TEMPLATE']:
+        pdf_bytes = render_quote_document_pdf(document, template)
+    else:
+        pdf_bytes = stored_quote_pdf(document, quote)
+    quote.download_count = (quote.download_count or 0) + 1
+    db.session.commit()
+    return pdf_bytes
 
 # 라우트들
 @app.route('/')
@@ -335,24 +1341,21 @@ def quote():
         try:
             data = request.get_json()
         
-            # 필수 데이터 검증
-            if not data:
-                return jsonify({'error': '견적 데이터가 없습니다.'}), 400
-            
-            required_fields = ['printType', 'bindingType', 'quantity', 'pages']
-            for field in required_fields:
-                if field not in data or not data[field]:
-                    return jsonify({'error': f'{field} 필드가 필요합니다.'}), 400
+            # 견적 계산 (필수 데이터 검증 포함)
+            try:
+                price_info = price_quote_request(data)
+            except QuoteInputError as e:
+                return jsonify({'error': str(e)}), 400
             
-            # 견적 계산
-            price_info = calculate_price(
-                data['printType'],
-                data['bindingType'],
-                safe_int_conversion(data['quantity']),
-                safe_int_conversion(data['pages']),
-                data.get('size', 'A4'),
-                data.get('printMethod', 'single')
-            )
+            # 견적 저장 (PDF, 이메일, 주문이 같은 견적을 공개 ID로 사용)
+            response = dict(price_info)
+            document = None
+            try:
+                document, quote_record = create_quote(data, price_info)
+                response['quote_id'] = quote_record.public_id
+            except Exception as e:
+                db.session.rollback()
+                print(f"견적 저장 오류: {e}")
             
             # 마케팅 리드 생성
             try:
@@ -360,14 +1363,17 @@ def quote():
             except Exception as e:
                 print(f"마케팅 리드 생성 오류: {e}")
         
-            # 이메일 견적서 전송 (이메일이 제공된 경우)
+            # 이메일 견적서 발송 대기열에 추가 (이메일이 제공된 경우, 발송은 백그라운드)
             if data.get('email'):
                 try:
-                    send_quote_email(data, price_info)
+                    if document is not None:
+                        send_quote_document_email(document)
+                    else:
+                        send_quote_email(data, price_info)
                 except Exception as e:
                     print(f"이메일 전송 오류: {e}")
             
-            return jsonify(price_info)
+            return jsonify(response)
             
         except Exception as e:
             print(f"견적 계산 오류: {e}")
@@ -529,318 +1535,701 @@ def create_marketing_lead(data):
 
 def send_quote_email(data, price_info):
     """견적서를 이메일로 전송 (직인 포함)"""
-    try:
-        customer_name = data.get('customerName', '고객님')
-        email = data.get('email')
-        pages = data.get('pages')
-        print_type = data.get('printType')
-        binding_type = data.get('bindingType')
-        quantity = data.get('quantity')
-        
-        # 출력 타입 한글 변환
-        print_type_map = {
-            'black_white': '레이저흑백',
-            'laser_color': '레이저칼라',
-            'ink_color': '잉크칼라'
-        }
-        
-        # 제본 타입 한글 변환
-        binding_type_map = {
-            'ring': '링제본',
-            'perfect': '무선제본',
-            'saddle': '중철제본',
-            'folding': '접지'
-        }
-        
-        # 이메일 제목
-        subject = f"[온누리인쇄나라] 견적서 - {customer_name}님"
-        
-        # HTML 이메일 내용 (직인 포함)
-        html_content = f"""
-<!DOCTYPE html>
-<html lang="ko">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>견적서</title>
-    <style>
-        body {{
-            font-family: 'Malgun Gothic', sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            text-align: center;
-            border-bottom: 3px solid #007ACC;
-            padding-bottom: 20px;
-            margin-bottom: 30px;
-        }}
-        .company-name {{
-            font-size: 28px;
-            font-weight: bold;
-            color: #007ACC;
-            margin-bottom: 10px;
-        }}
-        .quote-title {{
-            font-size: 24px;
-            font-weight: bold;
-            color: #333;
-        }}
-        .quote-info {{
-            background-color: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin: 20px 0;
-        }}
-        .price-table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }}
-        .price-table th, .price-table td {{
-            border: 1px solid #ddd;
-            padding: 12px;
-            text-align: left;
-        }}
-        .price-table th {{
-            background-color: #007ACC;
-            color: white;
-            font-weight: bold;
-        }}
-        .total-price {{
-            font-size: 20px;
-            font-weight: bold;
-            color: #007ACC;
-            text-align: right;
-        }}
-        .contact-info {{
-            background-color: #e9ecef;
-            padding: 15px;
-            border-radius: 8px;
-            margin: 20px 0;
-        }}
-        .stamp-section {{
-            text-align: right;
-            margin-top: 40px;
-            position: relative;
-        }}
-        .stamp {{
-            display: inline-block;
-            width: 120px;
-            height: 120px;
-            border: 3px solid #dc3545;
-            border-radius: 50%;
-            position: relative;
-            background: linear-gradient(45deg, #fff, #f8f9fa);
-        }}
-        .stamp-text {{
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            font-size: 14px;
-            font-weight: bold;
-            color: #dc3545;
-            text-align: center;
-            line-height: 1.2;
-        }}
-        .footer {{
-            margin-top: 30px;
-            padding-top: 20px;
-            border-top: 1px solid #ddd;
-            font-size: 12px;
-            color: #666;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <div class="company-name">온누리인쇄나라</div>
-        <div class="quote-title">견적서</div>
-    </div>
-    
-    <div class="quote-info">
-        <p><strong>고객명:</strong> {customer_name}</p>
-        <p><strong>견적일:</strong> 2025년 08월 11일</p>
-    </div>
-    
-    <h3>📋 인쇄 사양</h3>
-    <table class="price-table">
-        <tr>
-            <th>항목</th>
-            <th>내용</th>
-        </tr>
-        <tr>
-            <td>페이지 수</td>
-            <td>{pages}페이지</td>
-        </tr>
-        <tr>
-            <td>출력 타입</td>
-            <td>{print_type_map.get(print_type, print_type)}</td>
-        </tr>
-        <tr>
-            <td>제본 방식</td>
-            <td>{binding_type_map.get(binding_type, binding_type)}</td>
-        </tr>
-        <tr>
-            <td>수량</td>
-            <td>{quantity}권</td>
-        </tr>
-    </table>
-    
-    <h3>💰 가격 내역</h3>
-    <table class="price-table">
-        <tr>
-            <th>항목</th>
-            <th>금액</th>
-        </tr>
-        <tr>
-            <td>페이지당 단가</td>
-            <td>{price_info['unit_print_price']:,}원</td>
-        </tr>
-        <tr>
-            <td>총 출력 가격</td>
-            <td>{price_info['print_price']:,}원</td>
-        </tr>
-        <tr>
-            <td>제본 가격</td>
-            <td>{price_info['binding_price']:,}원</td>
-        </tr>
-        <tr>
-            <td>단가 (출력+제본)</td>
-            <td>{price_info['unit_price']:,}원</td>
-        </tr>
-        <tr style="background-color: #e3f2fd;">
-            <td><strong>총 가격</strong></td>
-            <td class="total-price"><strong>{price_info['total_price']:,}원</strong></td>
-        </tr>
-    </table>
-    
-    <div class="contact-info">
-        <h4>📞 문의 및 주문</h4>
-        <p><strong>전화:</strong> 02-6338-7123</p>
-        <p><strong>휴대폰:</strong> 010-2624-7123</p>
-        <p><strong>이메일:</strong> print7123@naver.com</p>
-        <p><strong>웹사이트:</strong> https://print7123.com/</p>
-        <p><strong>영업시간:</strong> 09:30-16:00 (월-금)</p>
-    </div>
-    
-    <div class="stamp-section">
-        <div class="stamp">
-            <div class="stamp-text">
-                온누리인쇄나라<br>
-                대표: 김인쇄<br>
-                {datetime.now().strftime('%Y.%m.%d')}
-            </div>
-        </div>
-    </div>
-    
-    <div class="footer">
-        <p><strong>※ 안내사항</strong></p>
-        <ul>
-            <li>기본 80g 복사용지, 부가세 포함</li>
-            <li>페이지 수와 수량에 따른 차등 가격 적용</li>
-            <li>본 견적서는 7일간 유효합니다</li>
-            <li>실제 가격은 최종 확인 후 결정됩니다</li>
-        </ul>
-        <p style="text-align: center; margin-top: 20px;">
-            <strong>감사합니다. 온누리인쇄나라 드림</strong>
-        </p>
-    </div>
-</body>
-</html>
-        """
-        
-        # 텍스트 버전 (HTML을 지원하지 않는 이메일 클라이언트용)
-        text_content = f"""
-안녕하세요, {customer_name}님!
-
-온누리인쇄나라에서 요청하신 견적서를 보내드립니다.
+    return send_quote_document_email(QuoteDocument.from_priced(data, price_info))
 
-========================================
-           견적서
-========================================
-
-고객명: {customer_name}
-견적일: 2025년 08월 11일
+def send_quote_document_email(document):
+    """견적서(QuoteDocument) 이메일을 발송 대기열에 추가 - 본문은 견적서 내용이 바뀔 때만 새로 생성
+    
+    실제 발송은 백그라운드 발송 스레드(mail_spool)가 하므로 SMTP 서버가 느려도 요청은 기다리지 않는다.
+    """
+    try:
+        email = (document.customer.get('email') or '').strip()
+        key = quote_render_key(document, QUOTE_EMAIL_TEMPLATE_VERSION)
+        rendered = render_flight.do(('email', key), lambda: document.render(('email', key), build_quote_email))
+        
+        # 같은 사람에게 같은 견적(품목/단가표/날짜)을 다시 보내려 하면 MAIL_DEDUP_SECONDS 동안은 건너뜀
+        dedup_key = hashlib.sha256(f"{email.strip().lower()}\n{key}".encode('utf-8')).hexdigest()
+        mail_spool.enqueue(email, rendered.subject, rendered.message_for(email), quote_id=document.id,
+                           dedup_key=dedup_key, digest=app.config['MAIL_DIGEST_MINUTES'] > 0)
+        return True
+            
+    except Exception as e:
+        db.session.rollback()
+        print(f"견적서 이메일 대기열 추가 오류: {e}")
+        return False
 
-[인쇄 사양]
-페이지 수: {pages}페이지
-출력 타입: {print_type_map.get(print_type, print_type)}
-제본 방식: {binding_type_map.get(binding_type, binding_type)}
-수량: {quantity}권
+# 견적서 이메일 양식 버전
+QUOTE_EMAIL_TEMPLATE_VERSION = 'email-3'
 
-[가격 내역]
-페이지당 단가: {price_info['unit_print_price']:,}원
-총 출력 가격: {price_info['print_price']:,}원
-제본 가격: {price_info['binding_price']:,}원
-단가 (출력+제본): {price_info['unit_price']:,}원
-총 가격: {price_info['total_price']:,}원
+def build_quote_email(document):
+    """견적서 이메일 제목, HTML 본문, 텍스트 본문 생성 (직인 포함, 양식: templates/email/quote.*)"""
+    return render_quote_email([document])
 
-※ 기본 80g 복사용지, 부가세 포함
-※ 페이지 수와 수량에 따른 차등 가격 적용
+def render_quote_email(documents):
+    """견적서 여러 건을 메일 한 통으로 (묶음 발송, 한 건이면 일반 견적서 메일)"""
+    customer_name = documents[-1].customer.get('customerName') or '고객님'
+    
+    # 이메일 제목
+    if len(documents) > 1:
+        subject = f"[온누리인쇄나라] 견적서 {len(documents)}건 - {customer_name}님"
+    else:
+        subject = f"[온누리인쇄나라] 견적서 - {customer_name}님"
+    
+    today = datetime.now()
+    context = {
+        'customer_name': customer_name,
+        'quote_date': today.strftime('%Y년 %m월 %d일'),
+        'stamp_date': today.strftime('%Y.%m.%d'),
+        'quotes': [quote_email_context(document) for document in documents],
+        'tariff_version': ', '.join(sorted({document.tariff_version for document in documents}))
+    }
+    
+    html_content = email_template('email/quote.html').render(context)
+    # 텍스트 버전 (HTML을 지원하지 않는 이메일 클라이언트용)
+    text_content = email_template('email/quote.txt').render(context)
+    
+    return RenderedEmail(subject, html_content, text_content)
 
-========================================
+def quote_email_context(document):
+    """이메일 양식에 넣을 견적서 한 건의 품목별 사양/가격 표"""
+    # 출력 타입 한글 변환
+    print_type_map = {
+        'black_white': '레이저흑백',
+        'laser_color': '레이저칼라',
+        'ink_color': '잉크칼라'
+    }
+    
+    # 제본 타입 한글 변환
+    binding_type_map = {
+        'ring': '링제본',
+        'perfect': '무선제본',
+        'saddle': '중철제본',
+        'folding': '접지'
+    }
+    
+    # 품목별 사양/가격 표
+    multiple = len(document.lines) > 1
+    items = []
+    for index, line in enumerate(document.lines, 1):
+        spec, line_price = line['spec'], line['price_info']
+        if 'unitPrice' in spec:
+            spec_rows = [('품목', spec['name']), ('수량', f"{spec['quantity']}개")]
+            price_rows = [('단가', f"{line_price['unit_price']:,}원")]
+        else:
+            spec_rows = [
+                ('페이지 수', f"{spec['pages']}페이지"),
+                ('출력 타입', print_type_map.get(spec['printType'], spec['printType'])),
+                ('제본 방식', binding_type_map.get(spec['bindingType'], spec['bindingType'])),
+                ('수량', f"{spec['quantity']}권")
+            ]
+            price_rows = [
+                ('페이지당 단가', f"{line_price['unit_print_price']:,}원"),
+                ('총 출력 가격', f"{line_price['print_price']:,}원"),
+                ('제본 가격', f"{line_price['binding_price']:,}원"),
+                ('단가 (출력+제본)', f"{line_price['unit_price']:,}원")
+            ]
+        items.append({
+            'title': f" - {index}. {quote_product_name(spec)}" if multiple else '',
+            'spec_rows': spec_rows,
+            'price_rows': price_rows,
+            'total': f"{line_price['total_price']:,}원"
+        })
+    
+    total_amount = document.totals['total_price']
+    return {
+        'quote_id': document.id,
+        'lines': items,
+        'total_amount': f"{total_amount:,}원",
+        'total_amount_text': f"{format_korean_amount(total_amount)} (₩{total_amount:,})"
+    }
 
-문의사항이나 주문을 원하시면 언제든 연락주세요!
+# 이메일 본문 양식 (templates/email) - 블록 태그 줄을 지워 텍스트 본문의 줄바꿈을 양식 그대로 유지
+email_templates = jinja2.Environment(loader=app.jinja_loader, trim_blocks=True, lstrip_blocks=True,
+                                     autoescape=jinja2.select_autoescape(['html'], default_for_string=True))
 
-📞 전화: 02-6338-7123
-📱 휴대폰: 010-2624-7123
-📧 이메일: print7123@naver.com
-🌐 웹사이트: https://print7123.com/
+_VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
 
-⏰ 영업시간: 09:30-16:00 (월-금)
+def inline_css(html):
+    """<style> 규칙을 각 태그의 style 속성으로 옮기고 <style> 블록 제거 (style 태그를 지우는 메일 서비스 대비)
+    
+    이메일 양식에 쓰는 범위의 선택자만 지원: tag, .class, tag.class, 공백으로 이은 하위 선택자.
+    규칙은 명시도와 선언 순서대로 적용되고, 태그에 원래 있던 style 속성이 가장 우선한다.
+    """
+    rules = []
+    
+    def collect(match):
+        for selectors, body in re.findall(r'([^{}]+)\{([^}]*)\}', match.group(1)):
+            declarations = [d.strip() for d in body.split(';') if d.strip()]
+            for selector in selectors.split(','):
+                parts = selector.split()
+                specificity = (sum(part.count('.') for part in parts),
+                               sum(1 for part in parts if not part.startswith('.')))
+                rules.append((specificity, len(rules), parts, declarations))
+        return ''
+    
+    html = re.sub(r'[ \t]*<style[^>]*>(.*?)</style>[ \t]*\n?', collect, html, flags=re.S)
+    rules.sort(key=lambda rule: rule[:2])
+    
+    def matches(part, tag, classes):
+        name, *class_names = part.split('.')
+        return (not name or name == tag) and all(class_name in classes for class_name in class_names)
+    
+    def ancestors_match(parts, stack):
+        # 하위 선택자: 안쪽 조상부터 차례로 찾음
+        depth = len(stack)
+        for part in reversed(parts):
+            while depth and not matches(part, *stack[depth - 1]):
+                depth -= 1
+            if not depth:
+                return False
+            depth -= 1
+        return True
+    
+    stack = []
+    
+    def apply(match):
+        closing, tag, attrs = match.group(1), match.group(2).lower(), match.group(3)
+        if closing:
+            for index in range(len(stack) - 1, -1, -1):
+                if stack[index][0] == tag:
+                    del stack[index:]
+                    break
+            return match.group(0)
+        
+        class_attr = re.search(r'class="([^"]*)"', attrs)
+        classes = set(class_attr.group(1).split()) if class_attr else set()
+        declarations = [declaration for _, _, parts, rule_declarations in rules
+                        if matches(parts[-1], tag, classes) and ancestors_match(parts[:-1], stack)
+                        for declaration in rule_declarations]
+        if tag not in _VOID_TAGS:
+            stack.append((tag, classes))
+        if not declarations:
+            return match.group(0)
+        
+        style_attr = re.search(r'style="([^"]*)"', attrs)
+        if style_attr:
+            declarations.append(style_attr.group(1).strip().rstrip(';'))
+            attrs = attrs[:style_attr.start()] + attrs[style_attr.end():]
+            attrs = attrs.rstrip()
+        return f'<{match.group(2)}{attrs} style="{"; ".join(declarations)}">'
+    
+    return re.sub(r'<(/?)([a-zA-Z][\w-]*)([^>]*)>', apply, html)
 
-※ 본 견적서는 7일간 유효합니다.
-※ 실제 가격은 최종 확인 후 결정됩니다.
+@lru_cache(maxsize=None)
+def email_template(name):
+    """이메일 양식 (처음 한 번만 컴파일, HTML 양식은 CSS를 인라인으로 옮긴 뒤 컴파일)"""
+    if not name.endswith('.html'):
+        return email_templates.get_template(name)
+    source, _, _ = email_templates.loader.get_source(email_templates, name)
+    return email_templates.from_string(inline_css(source))
 
-감사합니다.
-온누리인쇄나라 드림
-        """
-        
-        # HTML 이메일 발송
-        if send_html_email(email, subject, html_content, text_content):
-            print(f"✅ 견적서 이메일 전송 성공: {email}")
-            return True
-        else:
-            print(f"❌ 견적서 이메일 전송 실패: {email}")
-            return False
+# SMTP 전송용 줄바꿈(CRLF) - sendmail은 bytes 원문을 그대로 보내므로 직렬화할 때 맞춰야 함 (RFC 5321)
+SMTP_EMAIL_POLICY = email_policy.compat32.clone(linesep='\r\n')
+
+def smtp_line_endings(raw_message):
+    """메일 원문의 줄바꿈을 CRLF로 (이전에 LF로 저장된 대기열 메일용)"""
+    return re.sub(rb'\r?\n', b'\r\n', raw_message)
+
+class RenderedEmail:
+    """렌더링한 이메일 제목/본문 - MIME 본문(텍스트/HTML 파트 인코딩)은 한 번만 만들고
+    받는 사람마다 To/Date/Message-ID 헤더만 붙여 발송용이자 보관용 원문(bytes)을 만든다.
+    
+    attachments: 이미 인코딩된 첨부 파트 (quote_pdf_attachment) - 본문과 함께 multipart/mixed로 발송
+    """
+    
+    def __init__(self, subject, html_content, text_content, attachments=()):
+        self.subject = subject
+        self.html_content = html_content
+        self.text_content = text_content
+        self.attachments = list(attachments)
+        self._body = None
+        self._lock = threading.Lock()
+    
+    def _mime_body(self):
+        with self._lock:
+            if self._body is None:
+                msg = MIMEMultipart('alternative')
+                
+                # 텍스트 버전
+                msg.attach(MIMEText(self.text_content or '', 'plain', 'utf-8'))
+                
+                # HTML 버전
+                if self.html_content:
+                    msg.attach(MIMEText(self.html_content, 'html', 'utf-8'))
+                
+                # 첨부 파일 (base64 인코딩된 파트를 그대로 이어 붙임)
+                if self.attachments:
+                    body, msg = msg, MIMEMultipart('mixed')
+                    msg.attach(body)
+                    for part in self.attachments:
+                        msg.attach(part)
+                
+                msg['From'] = app.config['MAIL_USERNAME']
+                msg['Subject'] = self.subject
+                self._body = msg.as_bytes(policy=SMTP_EMAIL_POLICY)
+            return self._body
+    
+    def with_attachments(self, attachments):
+        """같은 제목/본문에 첨부 파일을 붙인 메일"""
+        return RenderedEmail(self.subject, self.html_content, self.text_content, attachments)
+    
+    def message_for(self, to_email):
+        """받는 사람용 메일 원문 (RFC 5322 bytes)"""
+        if '\r' in to_email or '\n' in to_email:
+            raise ValueError('잘못된 이메일 주소입니다.')
+        to_header = to_email if to_email.isascii() else Header(to_email, 'utf-8').encode()
+        headers = (f"To: {to_header}\r\n"
+                   f"Date: {formatdate(localtime=True)}\r\n"
+                   f"Message-ID: {make_msgid(domain=app.config['MAIL_USERNAME'].rpartition('@')[2] or None)}\r\n")
+        return headers.encode('ascii') + self._mime_body()
+
+def quote_pdf_attachment(document, quote):
+    """견적서 PDF 첨부 파트 - PDF 다운로드와 같은 바이트(저장된 PDF/디스크 캐시)를 사용
+    (메일 발송으로 PDF를 다시 그리지 않음, 첨부 파트는 견적서에 보관하지 않음)"""
+    part = MIMEBase('application', 'pdf')
+    part.set_payload(stored_quote_pdf(document, quote))
+    db.session.commit()
+    encoders.encode_base64(part)
+    customer_name = document.customer.get('customerName') or '고객'
+    part.add_header('Content-Disposition', 'attachment',
+                    filename=('utf-8', '', f'견적서_{customer_name}_{document.id}.pdf'))
+    return part
+
+def compose_quote_email(loaded):
+    """저장된 견적서 [(QuoteDocument, Quote)]로 발송할 메일 (MAIL_ATTACH_QUOTE_PDF면 견적서 PDF 첨부)
+    
+    한 건이면 견적서에 캐시된 메일 본문을 그대로 쓰고, 여러 건이면 묶음 메일로 렌더링한다.
+    """
+    documents = [document for document, _ in loaded]
+    if len(documents) == 1:
+        document = documents[0]
+        key = quote_render_key(document, QUOTE_EMAIL_TEMPLATE_VERSION)
+        rendered = document.render(('email', key), build_quote_email)
+        if not app.config['MAIL_ATTACH_QUOTE_PDF']:
+            return rendered
+        return rendered.with_attachments([quote_pdf_attachment(document, loaded[0][1])])
+    
+    rendered = render_quote_email(documents)
+    if app.config['MAIL_ATTACH_QUOTE_PDF']:
+        rendered = rendered.with_attachments([quote_pdf_attachment(document, quote) for document, quote in loaded])
+    return rendered
+
+class SmtpConnectionPool:
+    """로그인된 SMTP 연결을 재사용하는 연결 풀 (메일마다 연결/STARTTLS/로그인을 반복하지 않음)
+    
+    연결은 프로세스(PID)별로 보관한다. check_after 이상 쉰 연결은 꺼낼 때 NOOP으로 확인하고,
+    idle_timeout을 넘었거나 max_messages만큼 보낸 연결은 닫는다. 보내는 중 연결이 끊기면
+    새로 연결해 그 메일을 한 번 더 보낸다.
+    """
+    
+    class _Connection:
+        def __init__(self, server):
+            self.server = server
+            self.last_used = time.monotonic()
+            self.messages = 0
+    
+    def __init__(self, size, idle_timeout, check_after, max_messages):
+        self.idle_timeout = idle_timeout
+        self.check_after = check_after
+        self.max_messages = max_messages
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self.connects = 0
+        self.reuses = 0
+        self.health_checks = 0
+        self.reconnects = 0
+        self.sent = 0
+    
+    def _open(self):
+        """새 SMTP 연결 (로그인은 서버가 AUTH를 지원할 때만 - 로컬 테스트 서버용)"""
+        start = time.perf_counter()
+        server = smtplib.SMTP(app.config['MAIL_SERVER'], app.config['MAIL_PORT'],
+                              timeout=app.config['MAIL_TIMEOUT'])
+        try:
+            if app.config['MAIL_USE_TLS']:
+                server.starttls(context=ssl.create_default_context())
+            server.ehlo_or_helo_if_needed()
+            if server.has_extn('auth'):
+                server.login(app.config['MAIL_USERNAME'], app.config['MAIL_PASSWORD'])
+        except Exception:
+            server.close()
+            raise
+        self.connects += 1
+        metrics.observe('mail.connect_ms', round((time.perf_counter() - start) * 1000, 3))
+        return self._Connection(server)
+    
+    @staticmethod
+    def _close(conn, polite=True):
+        try:
+            if polite:
+                conn.server.quit()
+                return
+        except Exception:
+            pass
+        conn.server.close()
+    
+    @staticmethod
+    def _connection_lost(error):
+        # 421: 서버가 세션을 닫겠다는 응답 (유휴 시간 초과, 세션당 발송 제한 등)
+        if isinstance(error, smtplib.SMTPResponseException):
+            return error.smtp_code == 421
+        return isinstance(error, (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError))
+    
+    def _take(self):
+        """쉬고 있는 연결 꺼내기 (만료/확인 실패한 연결은 닫음), 없으면 새로 연결"""
+        while True:
+            with self._lock:
+                if self._pid != os.getpid():
+                    # fork 전 부모의 연결은 소켓을 공유하므로 닫지 않고 버림
+                    self._idle.clear()
+                    self._pid = os.getpid()
+                conn = self._idle.pop() if self._idle else None
+            if conn is None:
+                return self._open()
             
-    except Exception as e:
-        print(f"견적서 이메일 전송 오류: {e}")
-        return False
+            idle = time.monotonic() - conn.last_used
+            if idle > self.idle_timeout:
+                self._close(conn)
+                continue
+            if idle > self.check_after:
+                self.health_checks += 1
+                try:
+                    alive = conn.server.noop()[0] == 250
+                except Exception:
+                    alive = False
+                if not alive:
+                    self._close(conn, polite=False)
+                    continue
+            self.reuses += 1
+            return conn
+    
+    def _give_back(self, conn):
+        conn.last_used = time.monotonic()
+        with self._lock:
+            if self._pid == os.getpid() and conn.messages < self.max_messages:
+                self._idle.append(conn)
+                return
+        self._close(conn)
+    
+    def prune(self):
+        """idle_timeout 동안 안 쓴 연결 닫기 (발송 스레드가 주기적으로 호출)"""
+        now = time.monotonic()
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            expired = [conn for conn in self._idle if now - conn.last_used > self.idle_timeout]
+            for conn in expired:
+                self._idle.remove(conn)
+        for conn in expired:
+            self._close(conn)
+    
+    def send_many(self, messages):
+        """메일 여러 개((받는 사람, 원문 bytes))를 한 연결로 차례로 발송 - 메일별 결과(성공 None, 실패 예외) 목록 반환
+        
+        연결 자체를 열 수 없으면 남은 메일은 모두 같은 예외로 실패 처리한다.
+        """
+        results = []
+        with self._slots:
+            conn = None
+            try:
+                for index, (to_email, raw_message) in enumerate(messages):
+                    error = None
+                    for attempt in range(2):
+                        try:
+                            if conn is None:
+                                conn = self._take()
+                        except Exception as e:
+                            results.extend([e] * (len(messages) - index))
+                            return results
+                        
+                        start = time.perf_counter()
+                        try:
+                            conn.server.sendmail(app.config['MAIL_USERNAME'], [to_email], raw_message)
+                        except Exception as e:
+                            error = e
+                            if not self._connection_lost(e):
+                                break  # 수신 거부 등 메일 자체의 오류 - 연결은 계속 사용
+                            self._close(conn, polite=False)
+                            conn = None
+                            if attempt == 0:
+                                self.reconnects += 1
+                            continue
+                        
+                        error = None
+                        conn.messages += 1
+                        self.sent += 1
+                        metrics.observe('mail.send_ms', round((time.perf_counter() - start) * 1000, 3))
+                        if conn.messages >= self.max_messages:
+                            self._close(conn)
+                            conn = None
+                        break
+                    results.append(error)
+            finally:
+                if conn is not None:
+                    self._give_back(conn)
+        return results
+    
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle) if self._pid == os.getpid() else 0
+        return {
+            'idle_connections': idle,
+            'connects': self.connects,
+            'reuses': self.reuses,
+            'health_checks': self.health_checks,
+            'reconnects': self.reconnects,
+            'sent': self.sent
+        }
+
+smtp_pool = SmtpConnectionPool(app.config['MAIL_SMTP_POOL_SIZE'], app.config['MAIL_SMTP_IDLE_SECONDS'],
+                               app.config['MAIL_SMTP_CHECK_SECONDS'], app.config['MAIL_SMTP_MAX_MESSAGES'])
+
+def deliver_email(to_email, subject, html_content, text_content):
+    """HTML 이메일 SMTP 발송 (연결 풀 사용, 실패 시 예외 발생)"""
+    raw_message = RenderedEmail(subject, html_content, text_content).message_for(to_email)
+    error = smtp_pool.send_many([(to_email, raw_message)])[0]
+    if error is not None:
+        raise error
 
 def send_html_email(to_email, subject, html_content, text_content):
-    """HTML 이메일 발송"""
+    """HTML 이메일 즉시 발송 (요청 처리 중에는 mail_spool.enqueue 사용)"""
     try:
-        msg = MIMEMultipart('alternative')
-        msg['From'] = app.config['MAIL_USERNAME']
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # 텍스트 버전
-        text_part = MIMEText(text_content, 'plain', 'utf-8')
-        msg.attach(text_part)
-        
-        # HTML 버전
-        html_part = MIMEText(html_content, 'html', 'utf-8')
-        msg.attach(html_part)
-        
-        # 이메일 발송
-        context = ssl.create_default_context()
-        with smtplib.SMTP(app.config['MAIL_SERVER'], app.config['MAIL_PORT']) as server:
-            server.starttls(context=context)
-            server.login(app.config['MAIL_USERNAME'], app.config['MAIL_PASSWORD'])
-            server.send_message(msg)
-        
+        deliver_email(to_email, subject, html_content, text_content)
         return True
     except Exception as e:
         print(f"HTML 이메일 발송 오류: {e}")
         return False
 
+class MailSpool:
+    """DB 이메일 발송 대기열과 백그라운드 발송 스레드
+    
+    발송 스레드는 웹 워커(PID)마다 하나씩 처음 요청을 받을 때 시작한다. 여러 워커가 같은 메일을
+    보내지 않도록 pending → sending 상태 변경(UPDATE ... WHERE status)에 성공한 워커만 발송한다.
+    실패하면 지수 백오프로 다시 시도하고 MAIL_MAX_ATTEMPTS를 넘으면 dead 상태로 남긴다.
+    """
+    
+    PURGE_INTERVAL = 3600  # 오래된 발송 완료 메일 정리 주기 (초)
+    
+    def __init__(self):
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._last_purge = 0
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self.deduplicated = 0
+        self.merged = 0
+    
+    def enqueue(self, to_email, subject, raw_message, quote_id=None, dedup_key=None, digest=False):
+        """발송할 메일 원문(RenderedEmail.message_for)을 저장 (커밋 후 반환, 같은 프로세스의 발송 스레드를 바로 깨움)
+        
+        dedup_key가 같은 메일이 MAIL_DEDUP_SECONDS 안에 있으면 저장하지 않고 그 메일을 반환한다.
+        digest=True면 MAIL_DIGEST_MINUTES 뒤에 보내며, 그 사이 같은 사람에게 생긴 묶음 메일은
+        먼저 들어온 메일의 발송 시각에 맞춰 함께 꺼내 한 통으로 보낸다(drain).
+        """
+        now = datetime.utcnow()
+        if dedup_key and app.config['MAIL_DEDUP_SECONDS'] > 0:
+            duplicate = OutboundEmail.query.filter(
+                OutboundEmail.dedup_key == dedup_key, OutboundEmail.status != 'dead',
+                OutboundEmail.created_at >= now - timedelta(seconds=app.config['MAIL_DEDUP_SECONDS'])).first()
+            if duplicate is not None:
+                self.deduplicated += 1
+                return duplicate
+        
+        next_attempt_at = now
+        if digest:
+            waiting = OutboundEmail.query.filter(
+                db.func.lower(OutboundEmail.to_email) == to_email.lower(), OutboundEmail.digest.is_(True),
+                OutboundEmail.status == 'pending').order_by(OutboundEmail.next_attempt_at).first()
+            next_attempt_at = waiting.next_attempt_at if waiting is not None and waiting.next_attempt_at > now \
+                else now + timedelta(minutes=app.config['MAIL_DIGEST_MINUTES'])
+        
+        message = OutboundEmail(to_email=to_email, subject=subject, raw_message=raw_message, quote_id=quote_id,
+                                dedup_key=dedup_key, digest=digest, next_attempt_at=next_attempt_at)
+        db.session.add(message)
+        db.session.commit()
+        self.ensure_started()
+        if not digest:
+            self._wake.set()
+        return message
+    
+    def ensure_started(self):
+        """이 프로세스의 발송 스레드 시작 (fork된 워커에서는 새로 시작)"""
+        if not app.config['MAIL_SPOOL_WORKER'] or (self._pid == os.getpid() and self._thread.is_alive()):
+            return
+        with self._lock:
+            if self._pid != os.getpid() or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='mail-spool', daemon=True)
+                self._pid = os.getpid()
+                self._thread.start()
+    
+    def _run(self):
+        while True:
+            try:
+                with app.app_context():
+                    processed = self.drain()
+                    self._purge()
+                smtp_pool.prune()
+            except Exception as e:
+                print(f"⚠️ 이메일 대기열 처리 오류: {e}")
+                processed = 0
+            
+            # 꺼낸 만큼 모두 처리했으면 남은 메일이 있을 수 있으므로 바로 다음 묶음 처리
+            if processed < app.config['MAIL_SPOOL_BATCH']:
+                self._wake.wait(app.config['MAIL_SPOOL_POLL_INTERVAL'])
+                self._wake.clear()
+    
+    def _due_filter(self, now):
+        stale = now - timedelta(seconds=app.config['MAIL_SEND_LEASE_SECONDS'])
+        return db.or_(
+            db.and_(OutboundEmail.status == 'pending', OutboundEmail.next_attempt_at <= now),
+            db.and_(OutboundEmail.status == 'sending', OutboundEmail.claimed_at < stale))
+    
+    def _claim(self, message_id, now):
+        """발송 권한 획득 (다른 워커가 먼저 가져갔으면 False)"""
+        claimed = OutboundEmail.query.filter(OutboundEmail.id == message_id, self._due_filter(now)).update(
+            {'status': 'sending', 'claimed_at': now, 'attempts': OutboundEmail.attempts + 1},
+            synchronize_session=False)
+        db.session.commit()
+        return claimed == 1
+    
+    def drain(self):
+        """발송 시각이 된 메일을 한 묶음 발송, 처리한 메일 수 반환"""
+        now = datetime.utcnow()
+        due = [row.id for row in db.session.query(OutboundEmail.id).filter(self._due_filter(now))
+               .order_by(OutboundEmail.next_attempt_at).limit(app.config['MAIL_SPOOL_BATCH'])]
+        
+        claimed = [db.session.get(OutboundEmail, message_id) for message_id in due
+                   if self._claim(message_id, datetime.utcnow())]
+        
+        # 원문을 만들 수 없는 메일은 바로 실패 처리, 나머지는 SMTP 연결 하나로 묶어 발송
+        batch = []
+        for messages in self._group_digests(claimed):
+            try:
+                batch.append((messages, self._raw_message(messages)))
+            except Exception as e:
+                for message in messages:
+                    self._failed(message, e)
+        
+        results = smtp_pool.send_many([(messages[0].to_email, raw) for messages, raw in batch]) if batch else []
+        for (messages, raw_message), error in zip(batch, results):
+            for message in messages:
+                if error is not None:
+                    self._failed(message, error)
+                    continue
+                message.sent_at = datetime.utcnow()
+                message.last_error = None
+                if message is messages[0]:
+                    message.status = 'sent'
+                    message.raw_message = raw_message
+                    self.sent += 1
+                else:
+                    message.status = 'merged'
+                    self.merged += 1
+        db.session.commit()
+        return len(claimed)
+    
+    @staticmethod
+    def _group_digests(messages):
+        """같은 사람에게 가는 묶음 발송 메일끼리 모음 (나머지는 한 통씩)"""
+        groups = {}
+        for message in messages:
+            key = message.to_email.lower() if message.digest and message.quote_id else ('single', message.id)
+            groups.setdefault(key, []).append(message)
+        return list(groups.values())
+    
+    @staticmethod
+    def _raw_message(messages):
+        """발송할 원문 - 견적서 메일은 저장된 견적서로 다시 구성 (묶음 메일, PDF 첨부)
+        
+        견적서를 찾을 수 없는 단건 메일은 넣을 때 저장한 원문(첨부 없음)을 그대로 보낸다.
+        """
+        message = messages[0]
+        if message.quote_id and (len(messages) > 1 or app.config['MAIL_ATTACH_QUOTE_PDF']):
+            loaded = [load_quote_document(message.quote_id) for message in messages]
+            if all(document is not None for document, _ in loaded):
+                return compose_quote_email(loaded).message_for(message.to_email)
+            if len(messages) > 1:
+                raise ValueError('묶음 발송할 견적서를 찾을 수 없습니다.')
+        if message.raw_message:
+            return smtp_line_endings(message.raw_message)
+        return RenderedEmail(
+            message.subject, message.html_content, message.text_content).message_for(message.to_email)
+    
+    def _failed(self, message, error):
+        """발송 실패 - 지수 백오프로 재시도 예약, 최대 시도 횟수를 넘으면 dead"""
+        message.last_error = f'{type(error).__name__}: {error}'[:1000]
+        if message.attempts >= app.config['MAIL_MAX_ATTEMPTS']:
+            message.status = 'dead'
+            self.dead += 1
+            print(f"❌ 이메일 발송 포기 ({message.attempts}회 실패): {message.to_email} - {error}")
+            return
+        
+        delay = min(app.config['MAIL_RETRY_BASE_SECONDS'] * 2 ** (message.attempts - 1),
+                    app.config['MAIL_RETRY_MAX_SECONDS'])
+        delay *= random.uniform(1.0, 1.2)  # 여러 메일이 같은 시각에 몰리지 않도록
+        message.status = 'pending'
+        message.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+        self.retried += 1
+        print(f"⚠️ 이메일 발송 실패, {delay:.0f}초 후 재시도 ({message.attempts}회): {message.to_email} - {error}")
+    
+    def _purge(self):
+        """보관 기간이 지난 발송 완료 메일 삭제"""
+        if time.monotonic() - self._last_purge < self.PURGE_INTERVAL:
+            return
+        self._last_purge = time.monotonic()
+        cutoff = datetime.utcnow() - timedelta(days=app.config['MAIL_SPOOL_KEEP_DAYS'])
+        OutboundEmail.query.filter(OutboundEmail.status == 'sent', OutboundEmail.sent_at < cutoff).delete(
+            synchronize_session=False)
+        db.session.commit()
+    
+    def retry(self, message_id):
+        """dead 메일을 다시 발송 대기 상태로 (찾지 못하면 False)"""
+        updated = OutboundEmail.query.filter_by(id=message_id, status='dead').update(
+            {'status': 'pending', 'attempts': 0, 'next_attempt_at': datetime.utcnow()},
+            synchronize_session=False)
+        db.session.commit()
+        if updated:
+            self.ensure_started()
+            self._wake.set()
+        return updated == 1
+    
+    def stats(self):
+        """대기열 상태별 건수, 가장 오래 기다린 메일, 최근 발송량 (DB 기준, 전체 워커 합계)"""
+        now = datetime.utcnow()
+        counts = dict(db.session.query(OutboundEmail.status, db.func.count(OutboundEmail.id))
+                      .group_by(OutboundEmail.status).all())
+        oldest = db.session.query(db.func.min(OutboundEmail.created_at)).filter(
+            OutboundEmail.status.in_(('pending', 'sending'))).scalar()
+        sent_since = lambda seconds: OutboundEmail.query.filter(
+            OutboundEmail.status == 'sent', OutboundEmail.sent_at >= now - timedelta(seconds=seconds)).count()
+        return {
+            'queue': {status: counts.get(status, 0) for status in ('pending', 'sending', 'sent', 'merged', 'dead')},
+            'oldest_waiting_seconds': round((now - oldest).total_seconds(), 1) if oldest else 0,
+            'sent_last_minute': sent_since(60),
+            'sent_last_hour': sent_since(3600),
+            'worker': {
+                'running': self._pid == os.getpid() and self._thread is not None and self._thread.is_alive(),
+                'sent': self.sent,
+                'retried': self.retried,
+                'dead': self.dead,
+                'deduplicated': self.deduplicated,
+                'merged': self.merged
+            },
+            'smtp': smtp_pool.stats()
+        }
+
+mail_spool = MailSpool()
+
+@app.before_request
+def start_mail_spool():
+    """재시작 전에 쌓인 메일도 보내도록 워커가 요청을 받기 시작하면 발송 스레드 실행"""
+    mail_spool.ensure_started()
+
 def extract_keyword_from_data(data):
     """데이터에서 키워드 추출"""
     keywords = []
@@ -930,84 +2319,1079 @@ def post_to_blog(post_id):
 
 @app.route('/preview_quote', methods=['POST'])
 def preview_quote():
-    """견적서 미리보기 (텍스트 기반)"""
+    """견적서 미리보기 (실제 PDF 첫 페이지 이미지, 만들 수 없으면 텍스트 기반)"""
     try:
         data = request.get_json()
         
-        # 필수 데이터 검증
-        if not data:
-            return jsonify({'error': '견적 데이터가 없습니다.'}), 400
-        
-        required_fields = ['printType', 'bindingType', 'quantity', 'pages']
-        for field in required_fields:
-            if field not in data or not data[field]:
-                return jsonify({'error': f'{field} 필드가 필요합니다.'}), 400
+        # 견적 계산 (필수 데이터 검증 포함)
+        try:
+            price_info = price_quote_request(data)
+            template = quote_template_name(data.get('template'))
+        except QuoteInputError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # 견적 계산
-        price_info = calculate_price(
-            data['printType'],
-            data['bindingType'],
-            safe_int_conversion(data['quantity']),
-            safe_int_conversion(data['pages']),
-            data.get('size', 'A4'),
-            data.get('printMethod', 'single')
-        )
+        # 미리보기는 저장하지 않음 (견적 ID 없이 내용 해시로만 캐시)
+        preview_image = None
+        try:
+            _, key = render_quote_preview_png(QuoteDocument.from_priced(data, price_info), template)
+            preview_image = url_for('quote_preview_image', key=key)
+        except (PreviewUnavailableError, PdfRenderBusyError, PdfRenderTimeoutError) as e:
+            print(f"⚠️ 미리보기 이미지 생성 불가, 텍스트 미리보기 사용: {e}")
         
-        # 텍스트 기반 미리보기 제공
         return jsonify({
             'success': True,
-            'preview_image': None,
+            'preview_image': preview_image,
             'price_info': price_info,
-            'fallback': True
+            'fallback': preview_image is None
         })
         
     except Exception as e:
         print(f"미리보기 생성 오류: {e}")
         return jsonify({'error': '미리보기 생성 중 오류가 발생했습니다.'}), 500
 
+@app.route('/quote_previews/<key>.png')
+def quote_preview_image(key):
+    """미리보기 PNG (키가 내용 해시라 바뀌지 않으므로 브라우저에 오래 캐시)"""
+    path = preview_cache.get(key) if re.fullmatch(r'[0-9a-f]{64}-\d+', key) else None
+    if path is None:
+        return jsonify({'error': '미리보기를 찾을 수 없습니다. 다시 요청해주세요.'}), 404
+    
+    response = send_file(os.path.abspath(path), mimetype='image/png', etag=key, max_age=86400)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
 @app.route('/download_quote_pdf', methods=['POST'])
 def download_quote_pdf():
     """견적서 PDF 다운로드"""
     try:
         data = request.get_json()
+        template = quote_template_name((data or {}).get('template'))
+        
+        if data and data.get('quoteId'):
+            # 저장된 견적이면 다시 계산하지 않고 저장된 PDF 사용
+            document, quote_record = load_quote_document(data['quoteId'])
+            if quote_record is None:
+                return jsonify({'error': '견적을 찾을 수 없습니다.'}), 404
+        else:
+            # 견적 계산 (필수 데이터 검증 포함)
+            try:
+                price_info = price_quote_request(data)
+            except QuoteInputError as e:
+                return jsonify({'error': str(e)}), 400
+            document, quote_record = create_quote(data, price_info)
+        
+        return send_quote_pdf(document, quote_record, template)
+        
+    except QuoteInputError as e:
+        return jsonify({'error': str(e)}), 400
+    except PdfRenderBusyError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+    except PdfRenderTimeoutError as e:
+        return jsonify({'error': str(e)}), 504
+    except Exception as e:
+        print(f"PDF 생성 오류: {e}")
+        return jsonify({'error': 'PDF 생성 중 오류가 발생했습니다.'}), 500
+
+@app.route('/api/quotes/batch', methods=['POST'])
+def batch_quotes():
+    """대량 견적 계산 (학원교재/회사소개서 등 엑셀 품목 일괄 계산)"""
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, (dict, list)):
+            return jsonify({'error': '요청 형식이 올바르지 않습니다. JSON 객체 또는 배열을 보내주세요.'}), 400
+        items = data.get('items') if isinstance(data, dict) else data
+        
+        if not items or not isinstance(items, list):
+            return jsonify({'error': '견적 품목 목록이 없습니다.'}), 400
+        
+        max_items = app.config['BATCH_QUOTE_MAX_ITEMS']
+        if len(items) > max_items:
+            return jsonify({'error': f'한 번에 최대 {max_items}개 품목까지 계산할 수 있습니다.'}), 400
+        
+        tariff = get_active_tariff()
+        print_rows = []
+        binding_rows = []
+        quantities = []
+        pages_list = []
+        errors = []
+        
+        # 입력 검증 및 단가 행 매핑 (계산은 아래에서 한 번에)
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors.append({'index': index, 'error': '품목 형식이 올바르지 않습니다.'})
+                continue
+            
+            missing = [field for field in QUOTE_REQUIRED_FIELDS if field not in item or not item[field]]
+            if missing:
+                errors.append({'index': index, 'error': f'{missing[0]} 필드가 필요합니다.'})
+                continue
+            
+            invalid = invalid_quote_string_field(item)
+            if invalid:
+                errors.append({'index': index, 'error': f'{invalid} 필드는 문자열이어야 합니다.'})
+                continue
+            
+            quantity = safe_int_conversion(item['quantity'])
+            pages = safe_int_conversion(item['pages'])
+            if not 1 <= quantity <= BATCH_QUOTE_MAX_VALUE or not 1 <= pages <= BATCH_QUOTE_MAX_VALUE:
+                errors.append({'index': index, 'error': '수량과 페이지 수를 확인해주세요.'})
+                continue
+            
+            try:
+                print_row, binding_row = tariff.price_rows_for(
+                    item['printType'], item.get('printMethod', 'single'), item['bindingType'])
+            except KeyError:
+                errors.append({'index': index, 'error': '지원하지 않는 출력 방식입니다.'})
+                continue
+            
+            print_rows.append(print_row)
+            binding_rows.append(binding_row)
+            quantities.append(quantity)
+            pages_list.append(pages)
+        
+        if errors:
+            return jsonify({'error': '견적 품목에 오류가 있습니다.', 'errors': errors}), 400
+        
+        result = tariff.calculate_batch(print_rows, binding_rows, quantities, pages_list)
+        
+        # 배열 → 품목별 내역
+        columns = {key: values.tolist() for key, values in result.items()}
+        keys = list(columns)
+        quote_items = []
+        for index, values in enumerate(zip(*columns.values())):
+            item = items[index]
+            breakdown = dict(zip(keys, values))
+            breakdown['index'] = index
+            breakdown['printType'] = item['printType']
+            breakdown['bindingType'] = item['bindingType']
+            breakdown['printMethod'] = item.get('printMethod', 'single')
+            breakdown['size'] = item.get('size', 'A4')
+            breakdown['quantity'] = quantities[index]
+            breakdown['discount_rate'] = 0
+            quote_items.append(breakdown)
+        
+        grand_total = {
+            'total_price': int(result['total_price'].sum()),
+            'total_price_with_tax': int(result['total_price_with_tax'].sum()),
+            'tax_amount': int(result['tax_amount'].sum()),
+            'print_price': int(result['print_price'].sum()),
+            'binding_price': int(result['binding_price'].sum()),
+            'total_pages': int(result['total_pages'].sum()),
+            'quantity': int(sum(quantities))
+        }
         
-        # 필수 데이터 검증
-        if not data:
-            return jsonify({'error': '견적 데이터가 없습니다.'}), 400
+        return jsonify({
+            'success': True,
+            'count': len(quote_items),
+            'items': quote_items,
+            'grand_total': grand_total,
+            'tariff_version': tariff.version,
+            'tariff_digest': tariff.digest
+        })
         
-        required_fields = ['printType', 'bindingType', 'quantity', 'pages']
-        for field in required_fields:
-            if field not in data or not data[field]:
-                return jsonify({'error': f'{field} 필드가 필요합니다.'}), 400
+    except Exception as e:
+        print(f"대량 견적 계산 오류: {e}")
+        return jsonify({'error': '대량 견적 계산 중 오류가 발생했습니다.'}), 500
+
+# 다품목 견적서 API
+class PdfDiskCache:
+    """내용 주소 기반 PDF 디스크 캐시 (키 = 견적 내용 해시, 용량 초과 시 LRU 삭제)
+    
+    파일 수정 시각을 마지막 사용 시각으로 사용하므로 여러 gunicorn 워커가 같은 폴더를 공유할 수 있다.
+    미리보기 PNG처럼 PDF에서 만든 파일도 확장자(suffix)만 바꿔 같은 방식으로 저장한다.
+    """
+    
+    def __init__(self, directory, max_bytes, suffix='.pdf'):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._size = None  # 폴더 전체 크기 (처음 저장할 때 계산)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}{self.suffix}')
+    
+    def get(self, key):
+        """캐시된 PDF 경로 (없으면 None)"""
+        path = self.path(key)
+        try:
+            os.utime(path)  # 사용 시각 갱신 (LRU)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+    
+    def read(self, key):
+        """캐시된 PDF 바이트 (없으면 None)"""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None  # 다른 워커가 방금 삭제한 경우
+    
+    def lock_path(self, key):
+        """키가 속한 잠금 파일 (키 앞 세 글자, 최대 4096개로 고정하고 삭제하지 않음)
         
-        # 견적 계산
-        price_info = calculate_price(
-            data['printType'],
-            data['bindingType'],
-            safe_int_conversion(data['quantity']),
-            safe_int_conversion(data['pages']),
-            data.get('size', 'A4'),
-            data.get('printMethod', 'single')
-        )
+        잠금 파일을 지우면 이미 열어 둔 워커와 새로 만든 워커가 서로 다른 파일을 잠가
+        같은 PDF를 동시에 만들 수 있으므로, 키마다 만들지 않고 몇 개를 나눠 쓴다.
+        """
+        return os.path.join(self.directory, key[:2], f'{key[2]}.lock')
+    
+    @contextmanager
+    def render_lock(self, key):
+        """같은 PDF를 여러 워커가 동시에 만들지 않도록 파일 잠금 (fcntl이 없으면 잠금 없이 진행)"""
+        if fcntl is None:
+            yield
+            return
         
-        # PDF 생성
-        pdf_buffer = generate_quote_pdf(data, price_info)
+        lock_path = self.lock_path(key)
+        try:
+            os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+            lock_file = open(lock_path, 'a')
+        except OSError as e:
+            print(f"⚠️ PDF 캐시 잠금 파일 생성 실패: {e}")
+            yield
+            return
         
-        # 파일명 생성
-        customer_name = data.get('customerName', '고객')
-        filename = f"견적서_{customer_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+            lock_file.close()
+    
+    def put(self, key, data):
+        """PDF 저장 (임시 파일에 쓴 뒤 교체하므로 다른 워커가 반쯤 쓴 파일을 읽지 않음)"""
+        path = self.path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ PDF 캐시 저장 실패: {e}")
+            return
         
-        return send_file(
-            pdf_buffer,
-            as_attachment=True,
-            download_name=filename,
-            mimetype='application/pdf'
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+    
+    def _entries(self):
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, '*', f'*{self.suffix}')):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+    
+    def _scan_size(self):
+        return sum(size for _, size, _ in self._entries())
+    
+    def _evict(self):
+        """오래 사용하지 않은 PDF부터 삭제 (최대 용량의 90%까지)"""
+        entries = sorted(self._entries())
+        self._size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if self._size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._size -= size
+            self.evictions += 1
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'directory': self.directory,
+                'size_bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+pdf_cache = PdfDiskCache(app.config['PDF_CACHE_FOLDER'], app.config['PDF_CACHE_MAX_BYTES'])
+preview_cache = PdfDiskCache(app.config['PREVIEW_CACHE_FOLDER'], app.config['PREVIEW_CACHE_MAX_BYTES'], suffix='.png')
+
+# 동시에 들어온 같은 견적서 PDF/이메일 생성 합치기
+render_flight = SingleFlight()
+
+class PdfRenderBusyError(RuntimeError):
+    """PDF 작업 대기열이 가득 참"""
+
+class PdfRenderTimeoutError(RuntimeError):
+    """PDF 작업 시간 초과"""
+
+def _render_pdf_job(customer, lines, tariff_digest, quote_id=None, profile=None, template=None, trace_memory=False):
+    """PDF 렌더링 프로세스에서 실행 - 전달받은 견적 데이터로 견적서를 복원해 PDF 생성
+    
+    측정값은 렌더링 프로세스에 남기지 않고 (PDF 바이트, 단계별 측정값)으로 돌려준다.
+    """
+    tariff = tariff_store.find(tariff_digest) or get_active_tariff()
+    timer = PdfStageTimer(trace_memory)
+    pdf_buffer = generate_quote_document_pdf(QuoteDocument.from_lines(customer, lines, tariff, document_id=quote_id),
+                                             template=template, profile=profile, timer=timer)
+    if pdf_buffer is None:
+        raise RuntimeError('PDF 생성 실패')
+    return pdf_buffer.getvalue(), timer.values
+
+class PdfRenderPool:
+    """PDF 렌더링 전용 프로세스 풀 (ReportLab 레이아웃이 웹 워커의 GIL을 잡지 않도록)
+    
+    풀은 처음 사용할 때 현재 프로세스(PID)에서 만든다. gunicorn이 import 후 워커를 fork하면
+    워커마다 자기 풀을 새로 만든다. 동시에 맡긴 작업 수는 세마포어로 제한한다.
+    """
+    
+    def __init__(self, workers, max_pending, timeout):
+        self.workers = workers
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+    
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                self._pid = os.getpid()
+            return self._executor
+    
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+    
+    def render(self, document, profile=None, template=None):
+        """견적서 PDF 바이트 (풀을 쓸 수 없으면 현재 스레드에서 생성, profile/template: 출력 설정/양식 이름)"""
+        pdf_bytes, timings = self.run(_render_pdf_job, *document.snapshot(), profile, template,
+                                      app.config['PDF_METRICS_TRACE_MEMORY'])
+        record_pdf_timings(timings)
+        return pdf_bytes
+    
+    def run(self, job, *args):
+        """job(*args)를 렌더링 프로세스에서 실행 (job과 인자는 pickle 가능해야 함)"""
+        if self.workers <= 0:
+            return job(*args)
+        
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PdfRenderBusyError('PDF 생성 요청이 많습니다. 잠시 후 다시 시도해주세요.')
+        
+        try:
+            executor = self._get_executor()
+            future = executor.submit(job, *args)
+        except Exception as e:
+            self._slots.release()
+            print(f"⚠️ PDF 렌더링 프로세스 사용 불가, 직접 생성: {e}")
+            return job(*args)
+        
+        # 시간 초과로 먼저 응답해도 작업이 끝날 때까지는 자리를 차지함
+        future.add_done_callback(lambda _: self._slots.release())
+        
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            future.cancel()
+            raise PdfRenderTimeoutError('PDF 생성 시간이 초과되었습니다.')
+        except BrokenProcessPool as e:
+            # 렌더링 프로세스가 비정상 종료 - 풀을 다시 만들고 이번 요청은 직접 생성
+            print(f"⚠️ PDF 렌더링 프로세스 오류, 풀 재생성: {e}")
+            self._reset(executor)
+            return job(*args)
+
+pdf_render_pool = PdfRenderPool(app.config['PDF_RENDER_WORKERS'], app.config['PDF_RENDER_MAX_PENDING'],
+                                app.config['PDF_RENDER_TIMEOUT'])
+
+def quote_render_key(document, template):
+    """견적서 결과물(PDF/이메일) 키 (정규화된 품목, 단가표, 양식 버전, 견적일자가 같으면 같은 결과)"""
+    payload = {
+        'template': template,
+        'date': datetime.now().strftime('%Y-%m-%d'),  # 견적일자/직인 날짜가 들어감
+        'customer': document.customer.get('customerName') or '',
+        'items': [line['spec'] for line in document.lines],
+        'tariff': [(line['price_info'].get('tariff_version'), line['price_info'].get('tariff_digest'))
+                   for line in document.lines],
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+class PreviewUnavailableError(RuntimeError):
+    """미리보기 이미지를 만들 도구(PyMuPDF, pdftoppm)가 없음"""
+
+def rasterize_pdf_page(pdf_bytes, dpi):
+    """PDF 첫 페이지 PNG (PyMuPDF, 없으면 poppler pdftoppm) - 렌더링 프로세스에서 실행"""
+    if pymupdf is not None:
+        with pymupdf.open(stream=pdf_bytes, filetype='pdf') as pdf:
+            return pdf[0].get_pixmap(dpi=dpi).tobytes('png')
+    
+    if not shutil.which('pdftoppm'):
+        raise PreviewUnavailableError('미리보기 이미지를 만들 수 없습니다 (PyMuPDF 또는 pdftoppm 필요).')
+    
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as pdf_file:
+        pdf_file.write(pdf_bytes)
+        pdf_file.flush()
+        # 출력 파일 이름을 주지 않으면 표준 출력으로 PNG를 씀
+        result = subprocess.run(['pdftoppm', '-png', '-r', str(dpi), '-f', '1', '-l', '1', '-singlefile',
+                                 pdf_file.name], capture_output=True, timeout=30)
+    if result.returncode != 0 or not result.stdout:
+        raise RuntimeError(f"pdftoppm 실패: {result.stderr.decode('utf-8', 'replace').strip()}")
+    return result.stdout
+
+def quote_pdf_cache_key(document, profile=None, template=None):
+    """견적서 PDF 캐시 키 (양식 버전 + 출력 설정, 저장된 견적이면 공개 ID)
+    
+    저장하지 않은 견적서는 공개 ID 자리에 고정 문구를 찍으므로 내용 해시만으로 캐시를 공유한다.
+    """
+    profile = get_pdf_output_profile(profile)
+    template_class = QUOTE_TEMPLATES[quote_template_name(template)]
+    version = f'{template_class.version}/{profile.name}'
+    if template_class.shows_quote_id and document.persisted:
+        version = f'{version}/{document.id}'
+    return quote_render_key(document, version)
+
+def render_quote_document_pdf(document, template=None):
+    """견적서 PDF 바이트 (디스크 캐시 적중 시 렌더링 생략, 견적서 객체에는 캐시 키만 계산해 사용)
+    
+    같은 내용의 PDF를 여러 요청이 동시에 만들면 (PDF 다운로드 더블클릭, 공유 링크 동시 열람)
+    워커 안에서는 한 스레드만, 워커 간에는 잠금 파일로 한 워커만 렌더링한다.
+    """
+    return render_quote_pdf_bytes(document, quote_pdf_cache_key(document, template=template), template=template)
+
+def render_quote_preview_png(document, template=None):
+    """견적서 PDF 첫 페이지 미리보기 (PNG 바이트, 캐시 키)
+    
+    실제 PDF(디스크 캐시)를 렌더링 프로세스에서 이미지로 변환하고 PDF와 같은 내용 해시로 저장하므로
+    같은 견적은 다시 변환하지 않는다.
+    """
+    dpi = app.config['PREVIEW_DPI']
+    key = f'{quote_pdf_cache_key(document, template=template)}-{dpi}'
+    
+    def build():
+        png_bytes = preview_cache.read(key)
+        if png_bytes is None:
+            pdf_bytes = render_quote_document_pdf(document, template)
+            png_bytes = pdf_render_pool.run(rasterize_pdf_page, pdf_bytes, dpi)
+            preview_cache.put(key, png_bytes)
+        return png_bytes
+    
+    return render_flight.do(('preview', key), build), key
+
+def render_quote_pdf_bytes(document, key=None, profile=None, template=None):
+    """디스크 캐시/동시 요청 합치기를 거쳐 PDF 생성 (견적서 객체에는 보관하지 않음)"""
+    profile = get_pdf_output_profile(profile)
+    template = quote_template_name(template)
+    key = key or quote_pdf_cache_key(document, profile, template)
+    
+    def render_and_store():
+        pdf_bytes = pdf_cache.read(key)
+        if pdf_bytes is not None:
+            return pdf_bytes
+        
+        with pdf_cache.render_lock(key):
+            # 잠금을 기다리는 동안 다른 워커가 만들었을 수 있음
+            pdf_bytes = pdf_cache.read(key)
+            if pdf_bytes is None:
+                pdf_bytes = pdf_render_pool.render(document, profile.name, template)
+                pdf_cache.put(key, pdf_bytes)
+            return pdf_bytes
+    
+    return render_flight.do(('pdf', key), render_and_store)
+
+def is_admin_user():
+    """로그인한 관리자인지 (로그인이 필요 없는 라우트용)"""
+    return current_user.is_authenticated and current_user.is_admin
+
+def quote_document_response(document):
+    """견적서 JSON 응답 (관리자가 아니면 고객 연락처 제외)"""
+    summary = document.summary()
+    if not is_admin_user():
+        summary = dict(summary, customer={'customerName': summary['customer'].get('customerName', '')})
+    return summary
+
+def _quote_document_or_404(document_id):
+    document, quote_record = load_quote_document(document_id)
+    if document is None:
+        return None, (jsonify({'error': '견적서를 찾을 수 없습니다.'}), 404)
+    return document, None
+
+@app.route('/api/quote_documents', methods=['POST'])
+def create_quote_document():
+    """다품목 견적서 생성"""
+    try:
+        data = request.get_json() or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': '요청 형식이 올바르지 않습니다.'}), 400
+        items = data.get('items')
+        if not items or not isinstance(items, list):
+            return jsonify({'error': '견적 품목 목록이 없습니다.'}), 400
+        
+        # 단가를 직접 지정하는 품목은 관리자만 (단가표 밖의 가격으로 견적서를 만들 수 있으므로)
+        if any(isinstance(item, dict) and 'unitPrice' in item for item in items) and not is_admin_user():
+            return jsonify({'error': '단가 직접 지정 품목은 관리자만 추가할 수 있습니다.'}), 403
+        
+        document = QuoteDocument.from_items(data, items)
+        remember_session_quote(save_quote_document(document))
+        return jsonify(quote_document_response(document)), 201
+    
+    except QuoteInputError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"견적서 생성 오류: {e}")
+        return jsonify({'error': '견적서 생성 중 오류가 발생했습니다.'}), 500
+
+@app.route('/api/quote_documents/<document_id>', methods=['GET'])
+def get_quote_document(document_id):
+    """다품목 견적서 조회"""
+    document, error = _quote_document_or_404(document_id)
+    if error:
+        return error
+    return jsonify(quote_document_response(document))
+
+@app.route('/api/quote_documents/<document_id>/items', methods=['POST'])
+@app.route('/api/quote_documents/<document_id>/items/<int:index>', methods=['PATCH', 'DELETE'])
+@login_required
+def edit_quote_document_item(document_id, index=None):
+    """견적서 품목 추가/수정/삭제 (관리자 전용, 바뀐 품목만 재계산)"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': '관리자 권한이 필요합니다.'}), 403
+    
+    document, error = _quote_document_or_404(document_id)
+    if error:
+        return error
+    
+    try:
+        if request.method == 'POST':
+            document.add_line(request.get_json())
+        elif request.method == 'PATCH':
+            document.update_line(index, request.get_json())
+        else:
+            document.remove_line(index)
+        save_quote_document(document)
+        return jsonify(quote_document_response(document))
+    
+    except IndexError:
+        return jsonify({'error': '품목을 찾을 수 없습니다.'}), 404
+    except QuoteInputError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/quote_documents/<document_id>/pdf', methods=['GET'])
+def download_quote_document_pdf(document_id):
+    """다품목 견적서 PDF 다운로드"""
+    document, error = _quote_document_or_404(document_id)
+    if error:
+        return error
+    
+    try:
+        template = quote_template_name(request.args.get('template'))
+        return send_quote_pdf(document, save_quote_document(document), template)
+    except QuoteInputError as e:
+        return jsonify({'error': str(e)}), 400
+    except PdfRenderBusyError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+    except PdfRenderTimeoutError as e:
+        return jsonify({'error': str(e)}), 504
+    except Exception as e:
+        print(f"PDF 생성 오류: {e}")
+        return jsonify({'error': 'PDF 생성 중 오류가 발생했습니다.'}), 500
+
+@app.route('/api/quote_documents/<document_id>/email', methods=['POST'])
+def email_quote_document(document_id):
+    """다품목 견적서 이메일 전송 (관리자 또는 견적서를 만든 세션만, 저장된 고객 주소로 반복 발송 방지)"""
+    if not (is_admin_user() or is_session_quote(document_id)):
+        return jsonify({'success': False, 'error': '견적서를 만든 사용자 또는 관리자만 이메일을 보낼 수 있습니다.'}), 403
+    
+    document, error = _quote_document_or_404(document_id)
+    if error:
+        return error
+    
+    if not document.customer.get('email'):
+        return jsonify({'success': False, 'error': '이메일 주소가 없습니다.'}), 400
+    
+    return jsonify({'success': send_quote_document_email(document)})
+
+@app.route('/api/price_curve')
+def price_curve():
+    """옵션 조합별 가격 구간표 (브라우저에서 수량/페이지 변경 시 직접 계산용)"""
+    print_type = request.args.get('printType', '')
+    binding_type = request.args.get('bindingType', '')
+    print_method = request.args.get('printMethod', 'single')
+    quantity = safe_int_conversion(request.args.get('quantity'))
+    pages = safe_int_conversion(request.args.get('pages'))
+    
+    if not print_type or not binding_type:
+        return jsonify({'error': 'printType, bindingType 값이 필요합니다.'}), 400
+    
+    tariff = get_active_tariff()
+    try:
+        print_limits, print_prices, binding_limits, binding_prices = tariff.price_curve(
+            print_type, print_method, binding_type)
+    except KeyError:
+        return jsonify({'error': '지원하지 않는 출력 방식입니다.'}), 400
+    
+    curve = {
+        'success': True,
+        'printType': print_type,
+        'bindingType': binding_type,
+        'printMethod': print_method,
+        'tariff_version': tariff.version,
+        'tariff_digest': tariff.digest,
+        'tax_rate': tariff.tax_rate,
+        # 구간 번호 = 값 이하인 첫 상한의 위치 (없으면 마지막 단가)
+        'print': {'basis': 'total_pages', 'limits': list(print_limits), 'prices': list(print_prices)},
+        'binding': {'basis': 'quantity', 'limits': list(binding_limits), 'prices': list(binding_prices)}
+    }
+    if quantity > 0 and pages > 0:
+        curve['hints'] = next_tier_hints(print_type, binding_type, quantity, pages, print_method, tariff=tariff)
+    
+    response = jsonify(curve)
+    etag_source = f"{tariff.digest}|{print_type}|{binding_type}|{print_method}|{quantity}|{pages}"
+    response.set_etag(hashlib.sha1(etag_source.encode('utf-8')).hexdigest())
+    response.cache_control.public = True
+    response.cache_control.max_age = app.config['PRICE_CURVE_MAX_AGE']
+    return response.make_conditional(request)
+
+@app.route('/api/quote_solver', methods=['POST'])
+@login_required
+def quote_solver():
+    """최저가 조합 탐색 (관리자 전용, 전화 상담용)"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': '관리자 권한이 필요합니다.'}), 403
+    
+    try:
+        data = request.get_json() or {}
+        budget = data.get('budget')
+        
+        results = find_cheapest_configurations(
+            safe_int_conversion(data.get('pages')),
+            safe_int_conversion(data.get('quantity')),
+            print_types=data.get('printTypes'),
+            print_methods=data.get('printMethods'),
+            binding_types=data.get('bindingTypes'),
+            budget=safe_int_conversion(budget) if budget else None,
+            max_runs=min(max(safe_int_conversion(data.get('maxRuns', app.config['QUOTE_SOLVER_MAX_RUNS'])), 1),
+                         app.config['QUOTE_SOLVER_MAX_RUNS']),
+            limit=min(max(safe_int_conversion(data.get('limit', 10)), 1), 50)
         )
         
+        return jsonify({'success': True, 'count': len(results), 'results': results})
+    
+    except QuoteInputError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        print(f"최저가 조합 탐색 오류: {e}")
+        return jsonify({'success': False, 'error': '최저가 조합 탐색 중 오류가 발생했습니다.'}), 500
+
+@app.route('/api/quote_cache/stats')
+@login_required
+def quote_cache_stats():
+    """견적 캐시 적중률 통계 (관리자 전용)"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': '관리자 권한이 필요합니다.'}), 403
+    
+    return jsonify({'success': True, 'stats': quote_cache.stats(), 'pdf_cache': pdf_cache.stats(),
+                    'preview_cache': preview_cache.stats(), 'single_flight': render_flight.stats()})
+
+@app.route('/api/metrics')
+@login_required
+def metrics_stats():
+    """처리 시간/크기 측정 통계 (관리자 전용, 웹 워커 프로세스별 값)
+    
+    pdf.<단계>_ms: 견적서 PDF 생성 단계별 시간, pdf.bytes: PDF 크기, pdf.peak_kb: 최대 메모리 할당량
+    ?reset=1 이면 조회 후 통계 초기화
+    """
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': '관리자 권한이 필요합니다.'}), 403
+    
+    snapshot = metrics.snapshot()
+    if request.args.get('reset') == '1':
+        metrics.clear()
+    return jsonify({'success': True, 'pid': os.getpid(), 'metrics': snapshot})
+
+@app.route('/api/mail_spool/stats')
+@login_required
+def mail_spool_stats():
+    """이메일 발송 대기열 통계 (관리자 전용)"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': '관리자 권한이 필요합니다.'}), 403
+    
+    return jsonify({'success': True, 'stats': mail_spool.stats()})
+
+@app.route('/api/mail_spool/dead')
+@login_required
+def mail_spool_dead():
+    """발송 포기(dead) 메일 목록 (관리자 전용, 최근 100건)"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': '관리자 권한이 필요합니다.'}), 403
+    
+    messages = OutboundEmail.query.filter_by(status='dead').order_by(OutboundEmail.id.desc()).limit(100)
+    return jsonify({'success': True, 'messages': [{
+        'id': message.id,
+        'to': message.to_email,
+        'subject': message.subject,
+        'quote_id': message.quote_id,
+        'attempts': message.attempts,
+        'last_error': message.last_error,
+        'created_at': message.created_at.isoformat()
+    } for message in messages]})
+
+@app.route('/api/mail_spool/<int:message_id>/retry', methods=['POST'])
+@login_required
+def mail_spool_retry(message_id):
+    """발송 포기(dead) 메일 다시 보내기 (관리자 전용)"""
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': '관리자 권한이 필요합니다.'}), 403
+    
+    if not mail_spool.retry(message_id):
+        return jsonify({'success': False, 'error': '재발송할 메일을 찾을 수 없습니다.'}), 404
+    return jsonify({'success': True})
+
+@app.after_request
+def add_pdf_timing_header(response):
+    """PDF_DEBUG_HEADER가 켜져 있으면 이번 요청에서 생성한 PDF의 단계별 시간을 Server-Timing 헤더로 전달"""
+    timings = g.get('pdf_timings')
+    if timings and app.config['PDF_DEBUG_HEADER']:
+        entries = [f'pdf-{stage};dur={timings[f"{stage}_ms"]}'
+                   for stage in PdfStageTimer.STAGES + ('total',) if f'{stage}_ms' in timings]
+        response.headers['Server-Timing'] = ', '.join(entries)
+        response.headers['X-PDF-Size'] = str(timings.get('bytes', 0))
+        if 'peak_kb' in timings:
+            response.headers['X-PDF-Peak-KB'] = str(timings['peak_kb'])
+    return response
+
+def send_quote_pdf(document, quote_record, template=None):
+    """저장된 견적 PDF 전송 (template: 양식 이름)"""
+    pdf_bytes = quote_pdf_bytes(document, quote_record, template)
+    
+    # 파일명 생성
+    customer_name = document.customer.get('customerName') or '고객'
+    filename = f"견적서_{customer_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+    
+    # 같은 PDF를 다시 받으면 ETag로 304 응답 (GET 재다운로드)
+    response = send_file(
+        io.BytesIO(pdf_bytes),
+        as_attachment=True,
+        download_name=filename,
+        mimetype='application/pdf',
+        etag=hashlib.sha1(pdf_bytes).hexdigest()
+    )
+    response.headers['X-Quote-Id'] = quote_record.public_id
+    return response
+
+@app.route('/quotes/<public_id>/pdf')
+def quote_pdf(public_id):
+    """저장된 견적 PDF 재다운로드"""
+    try:
+        template = quote_template_name(request.args.get('template'))
+        document, quote_record = load_quote_document(public_id)
+        if quote_record is None:
+            return jsonify({'error': '견적을 찾을 수 없습니다.'}), 404
+        return send_quote_pdf(document, quote_record, template)
+    
+    except QuoteInputError as e:
+        return jsonify({'error': str(e)}), 400
+    except PdfRenderBusyError as e:
+        return jsonify({'error': str(e)}), 503, {'Retry-After': '5'}
+    except PdfRenderTimeoutError as e:
+        return jsonify({'error': str(e)}), 504
     except Exception as e:
         print(f"PDF 생성 오류: {e}")
         return jsonify({'error': 'PDF 생성 중 오류가 발생했습니다.'}), 500
 
+class PdfPageStream:
+    """ReportLab PDF 여러 개를 한 PDF로 이어 붙여 조각 단위로 내보내기
+    
+    PDF마다 객체 번호만 옮겨 바로 내보내고 객체 위치와 페이지 번호만 기억했다가
+    마지막에 페이지 목록/카탈로그/xref를 쓴다. 원본 PDF 바이트는 들고 있지 않는다.
+    ReportLab 출력 형식(일반 xref 표, 한 단계 페이지 트리)만 지원한다.
+    """
+    
+    CATALOG_ID = 1
+    PAGES_ID = 2
+    
+    REF_RE = re.compile(rb'\b(\d+) 0 R\b')
+    OBJ_RE = re.compile(rb'^\s*(\d+) 0 obj')
+    STREAM_RE = re.compile(rb'>>\s*stream\r?\n')
+    
+    def __init__(self):
+        self.position = 0
+        self.offsets = {}  # 객체 번호 → 파일 내 위치
+        self.page_ids = []
+        self.next_id = self.PAGES_ID + 1
+    
+    def _emit(self, data):
+        self.position += len(data)
+        return data
+    
+    def header(self):
+        return self._emit(b'%PDF-1.4\n%\x93\x8c\x8b\x9e\n')
+    
+    @staticmethod
+    def _objects(pdf_bytes):
+        """xref 표로 객체별 바이트 구간과 trailer 조회"""
+        xref_at = int(pdf_bytes[pdf_bytes.rindex(b'startxref') + 9:].split()[0])
+        lines = iter(pdf_bytes[xref_at:].split(b'\n')[1:])
+        offsets = {}
+        for line in lines:
+            fields = line.split()
+            if len(fields) != 2:
+                break  # trailer
+            first, count = int(fields[0]), int(fields[1])
+            for number in range(first, first + count):
+                entry = next(lines).split()
+                if entry[2] == b'n':
+                    offsets[number] = int(entry[0])
+        
+        ordered = sorted(offsets.items(), key=lambda item: item[1])
+        ends = [offset for _, offset in ordered[1:]] + [xref_at]
+        objects = {number: pdf_bytes[offset:end] for (number, offset), end in zip(ordered, ends)}
+        return objects, pdf_bytes[xref_at:]
+    
+    def add(self, pdf_bytes):
+        """PDF 한 개의 페이지(와 페이지가 쓰는 객체)를 번호를 옮겨 반환"""
+        objects, trailer = self._objects(pdf_bytes)
+        root_id = int(re.search(rb'/Root (\d+) 0 R', trailer).group(1))
+        info = re.search(rb'/Info (\d+) 0 R', trailer)
+        pages_id = int(re.search(rb'/Pages (\d+) 0 R', objects[root_id]).group(1))
+        kids = re.search(rb'/Kids\s*\[([^\]]*)\]', objects[pages_id]).group(1)
+        
+        # 문서 단위 객체(카탈로그/페이지 목록/문서 정보)는 합친 PDF에서 새로 씀
+        skipped = {root_id, pages_id, int(info.group(1)) if info else None}
+        shift = self.next_id - min(objects)
+        
+        def renumber(match):
+            return b'%d 0 R' % (int(match.group(1)) + shift)
+        
+        chunks = []
+        for number in sorted(objects):
+            if number in skipped:
+                continue
+            chunk = objects[number]
+            stream = self.STREAM_RE.search(chunk)
+            head, body = (chunk[:stream.end()], chunk[stream.end():]) if stream else (chunk, b'')
+            head = self.OBJ_RE.sub(b'%d 0 obj' % (number + shift), head.lstrip(), count=1)
+            head = self.REF_RE.sub(renumber, head)
+            head = re.sub(rb'/Parent \d+ 0 R', b'/Parent %d 0 R' % self.PAGES_ID, head)
+            
+            self.offsets[number + shift] = self.position
+            chunks.append(self._emit(head + body))
+        
+        self.page_ids.extend(int(ref) + shift for ref in self.REF_RE.findall(kids))
+        self.next_id = max(objects) + shift + 1
+        return b''.join(chunks)
+    
+    def finish(self):
+        """페이지 목록, 카탈로그, xref, trailer"""
+        kids = b' '.join(b'%d 0 R' % page_id for page_id in self.page_ids)
+        chunks = []
+        for number, body in (
+                (self.PAGES_ID, b'<< /Count %d /Kids [ %s ] /Type /Pages >>' % (len(self.page_ids), kids)),
+                (self.CATALOG_ID, b'<< /PageMode /UseNone /Pages %d 0 R /Type /Catalog >>' % self.PAGES_ID)):
+            self.offsets[number] = self.position
+            chunks.append(self._emit(b'%d 0 obj\n%s\nendobj\n' % (number, body)))
+        
+        xref_at = self.position
+        entries = [b'0000000000 65535 f \n']
+        for number in range(1, self.next_id):
+            offset = self.offsets.get(number)
+            entries.append(b'%010d 00000 n \n' % offset if offset is not None else b'0000000000 00000 f \n')
+        chunks.append(b'xref\n0 %d\n' % self.next_id + b''.join(entries))
+        chunks.append(b'trailer\n<< /Root %d 0 R /Size %d >>\nstartxref\n%d\n%%%%EOF\n'
+                      % (self.CATALOG_ID, self.next_id, xref_at))
+        return b''.join(chunks)
+
+
+class ZipStreamBuffer:
+    """ZipFile이 쓴 데이터를 모아 두었다가 조각 단위로 내보내는 쓰기 전용 버퍼 (seek 불가 → 데이터 디스크립터 사용)"""
+    
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self):
+        return self._position
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def parse_quote_export_request(entries):
+    """일괄 내보내기 목록 검증 - 견적 ID 문자열 또는 견적 사양(dict, 다품목이면 items 포함)
+    
+    사양은 여기서 한 번 계산해 오류만 확인하고 버린다 (생성할 때 견적 캐시로 다시 계산).
+    """
+    if not entries or not isinstance(entries, list):
+        raise QuoteInputError('내보낼 견적 목록이 없습니다.')
+    
+    max_documents = app.config['QUOTE_EXPORT_MAX_DOCUMENTS']
+    if len(entries) > max_documents:
+        raise QuoteInputError(f'한 번에 최대 {max_documents}건까지 내보낼 수 있습니다.')
+    
+    sources = []
+    for index, entry in enumerate(entries):
+        if isinstance(entry, str):
+            sources.append(('id', entry.strip()))
+        elif isinstance(entry, dict):
+            items = entry.get('items') or [entry]
+            if not isinstance(items, list):
+                raise QuoteInputError(f'{index + 1}번째 견적: 품목 형식이 올바르지 않습니다.')
+            try:
+                QuoteDocument.from_items(entry, items)
+            except QuoteInputError as e:
+                raise QuoteInputError(f'{index + 1}번째 견적: {e}')
+            sources.append(('spec', entry, items))
+        else:
+            raise QuoteInputError(f'{index + 1}번째 견적 형식이 올바르지 않습니다.')
+    
+    public_ids = {source[1] for source in sources if source[0] == 'id'}
+    if public_ids:
+        found = {public_id for (public_id,) in
+                 db.session.query(Quote.public_id).filter(Quote.public_id.in_(public_ids))}
+        missing = sorted(public_ids - found)
+        if missing:
+            raise QuoteInputError(f'견적을 찾을 수 없습니다: {", ".join(missing[:10])}')
+    
+    return sources
+
+def _export_pdf(document, pdf_data, template):
+    return pdf_data if pdf_data is not None else render_quote_pdf_bytes(document, template=template)
+
+def iter_quote_export_pdfs(sources, template=None):
+    """내보낼 견적서 PDF를 순서대로 (파일명, PDF, 오류)
+    
+    PDF_RENDER_WORKERS개씩 동시에 생성하고 다음 PDF는 앞의 PDF를 내보낸 뒤에 맡기므로
+    건수와 관계없이 메모리에는 그만큼의 PDF만 있다. 견적 조회(DB)는 요청 스레드에서 한다.
+    저장된 PDF는 기본 양식일 때만 사용한다.
+    """
+    template = quote_template_name(template)
+    use_saved = template == app.config['QUOTE_PDF_TEMPLATE']
+    window = max(1, app.config['PDF_RENDER_WORKERS'])
+    pending = deque()
+    
+    def take():
+        name, future = pending.popleft()
+        try:
+            return name, future.result(), None
+        except Exception as e:
+            return name, None, e
+    
+    with ThreadPoolExecutor(max_workers=window) as executor:
+        for number, source in enumerate(sources, 1):
+            if source[0] == 'id':
+                document, quote_record = load_quote_document(source[1])
+                pdf_data = quote_record.pdf_data if use_saved else None
+                db.session.expunge(quote_record)  # 세션에 Quote/PDF가 쌓이지 않도록
+            else:
+                document, pdf_data = QuoteDocument.from_items(source[1], source[2], tariff=get_active_tariff()), None
+            
+            customer_name = re.sub(r'[\\/:*?"<>|\s]+', '_', document.customer.get('customerName') or '고객')
+            name = f"{number:03d}_{document.id if source[0] == 'id' else '견적서'}_{customer_name}.pdf"
+            pending.append((name, executor.submit(_export_pdf, document, pdf_data, template)))
+            
+            if len(pending) >= window:
+                yield take()
+        
+        while pending:
+            yield take()
+
+def stream_quote_export_zip(sources, template=None):
+    """견적서별 PDF를 ZIP으로 스트리밍 (생성 실패한 견적은 오류목록.txt에 기록)"""
+    buffer = ZipStreamBuffer()
+    errors = []
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, pdf_bytes, error in iter_quote_export_pdfs(sources, template):
+            if error is not None:
+                print(f"⚠️ 견적서 내보내기 실패 ({name}): {error}")
+                errors.append(f'{name}: {error}')
+                continue
+            archive.writestr(name, pdf_bytes)
+            yield buffer.drain()
+        
+        if errors:
+            archive.writestr('오류목록.txt', '\n'.join(errors))
+    yield buffer.drain()
+
+def stream_quote_export_pdf(sources, template=None):
+    """견적서 전체를 한 PDF로 스트리밍 (생성 실패한 견적은 빼고 로그만 남김)"""
+    pages = PdfPageStream()
+    yield pages.header()
+    for name, pdf_bytes, error in iter_quote_export_pdfs(sources, template):
+        if error is not None:
+            print(f"⚠️ 견적서 내보내기 실패 ({name}): {error}")
+            continue
+        yield pages.add(pdf_bytes)
+    yield pages.finish()
+
+@app.route('/api/quotes/export', methods=['POST'])
+@login_required
+def export_quotes():
+    """견적서 일괄 내보내기 (관리자 전용, 월말 재발행 등) - ZIP 또는 합친 PDF 스트리밍
+    
+    요청: {"format": "zip" | "pdf", "template": "compact" | "sealed",
+          "quotes": ["Q3F9A1C07B", {"customerName": ..., "items": [...]}, ...]}
+    """
+    if not current_user.is_admin:
+        return jsonify({'success': False, 'error': '관리자 권한이 필요합니다.'}), 403
+    
+    try:
+        data = request.get_json() or {}
+        export_format = data.get('format', 'zip')
+        if export_format not in ('zip', 'pdf'):
+            return jsonify({'error': 'format은 zip 또는 pdf여야 합니다.'}), 400
+        
+        template = quote_template_name(data.get('template'))
+        sources = parse_quote_export_request(data.get('quotes'))
+    
+    except QuoteInputError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        print(f"견적서 내보내기 오류: {e}")
+        return jsonify({'error': '견적서 내보내기 중 오류가 발생했습니다.'}), 500
+    
+    if export_format == 'zip':
+        body, mimetype = stream_quote_export_zip(sources, template), 'application/zip'
+    else:
+        body, mimetype = stream_quote_export_pdf(sources, template), 'application/pdf'
+    
+    filename = f"quotes_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+    return Response(stream_with_context(body), mimetype=mimetype, headers={
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'X-Quote-Count': str(len(sources)),
+        'X-Accel-Buffering': 'no'  # nginx가 응답 전체를 모으지 않도록
+    })
+
 # 기존 라우트들 유지
 @app.route('/about')
 def about():
@@ -1118,41 +3502,131 @@ def go_official():
     """공식 사이트로 이동"""
     return redirect('https://print7123.com', code=302)
 
-def register_korean_fonts():
-    """한글 폰트 등록"""
-    try:
-        # Windows 시스템 폰트 경로
-        font_paths = [
-            'C:/Windows/Fonts/malgun.ttf',  # 맑은 고딕
-            'C:/Windows/Fonts/malgunbd.ttf',  # 맑은 고딕 Bold
-            'C:/Windows/Fonts/gulim.ttc',  # 굴림
-            'C:/Windows/Fonts/batang.ttc',  # 바탕
-        ]
+# 한글 폰트 후보 (앞에 있을수록 우선, static/fonts에 넣은 폰트가 최우선)
+KOREAN_FONT_PATHS = [
+    '/usr/share/fonts/truetype/nanum/NanumGothic.ttf',  # fonts-nanum (Debian/Ubuntu)
+    '/usr/share/fonts/nanum/NanumGothic.ttf',  # nanum-fonts (RHEL/Fedora)
+    '/usr/share/fonts/truetype/noto/NotoSansKR-Regular.ttf',
+    '/usr/share/fonts/google-noto/NotoSansKR-Regular.ttf',
+    '/usr/share/fonts/truetype/unfonts-core/UnDotum.ttf',
+    'C:/Windows/Fonts/malgun.ttf',  # 맑은 고딕 (개발 PC)
+    'C:/Windows/Fonts/gulim.ttc',  # 굴림
+    '/Library/Fonts/AppleGothic.ttf',
+    '/System/Library/Fonts/Supplemental/AppleGothic.ttf',
+]
+
+# 설치된 TTF가 없을 때 사용하는 ReportLab 내장 CID 폰트 (PDF 뷰어의 한글 폰트로 표시)
+KOREAN_CID_FONTS = ['HYGothic-Medium', 'HYSMyeongJo-Medium']
+
+class KoreanFontRegistry:
+    """한글 폰트 탐색/등록 (워커당 한 번, 이후에는 등록된 폰트 이름만 반환)"""
+    
+    FONT_NAME = 'KoreanFont'
+    STRICT_FONT_NAME = 'KoreanFont-Strict'
+    
+    def __init__(self, font_dir):
+        self.font_dir = font_dir
+        self.font_name = None
+        self.source = None
+        self._strict_font_name = None
+        self._lock = threading.Lock()
+    
+    def candidates(self):
+        """등록을 시도할 폰트 파일 목록 (중복 제거, 우선순위 순)"""
+        paths = sorted(glob.glob(os.path.join(self.font_dir, '*.tt[fc]')))
+        paths += [path for path in KOREAN_FONT_PATHS if os.path.exists(path)]
+        paths += self._fontconfig_paths()
+        return list(dict.fromkeys(paths))
+    
+    def _fontconfig_paths(self):
+        """fontconfig(fc-list)에 등록된 한글 지원 TTF/TTC 경로"""
+        if not shutil.which('fc-list'):
+            return []
+        try:
+            output = subprocess.run(['fc-list', ':lang=ko', 'file'], capture_output=True,
+                                    text=True, timeout=5).stdout
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"⚠️ fc-list 실행 실패: {e}")
+            return []
+        
+        paths = sorted(line.split(':')[0].strip() for line in output.splitlines())
+        # 고딕/산스 계열 우선 (명조보다 견적서 표에서 읽기 쉬움)
+        paths.sort(key=lambda path: not any(key in os.path.basename(path).lower()
+                                             for key in ('gothic', 'sans', 'dotum')))
+        return [path for path in paths if path.lower().endswith(('.ttf', '.ttc'))]
+    
+    def _register_file(self, path, name=FONT_NAME, **options):
+        # CFF 기반 OTF/TTC(예: NotoSansCJK)는 ReportLab TTFont가 지원하지 않아 예외 발생
+        if path.lower().endswith('.ttc'):
+            options.setdefault('subfontIndex', 0)
+        pdfmetrics.registerFont(TTFont(name, path, **options))
+    
+    def strict_font_name(self):
+        """사용한 글자만 서브셋에 넣는 폰트 이름
         
-        for font_path in font_paths:
-            if os.path.exists(font_path):
+        ReportLab TTF 서브셋은 기본으로 ASCII 95자를 모두 포함하므로 같은 파일을
+        asciiReadable=False로 한 번 더 등록한다. CID/기본 폰트는 PDF에 포함되지 않아 그대로 사용.
+        """
+        font_name = self.font_name or self.load()
+        if font_name != self.FONT_NAME:
+            return font_name
+        if self._strict_font_name:
+            return self._strict_font_name
+        
+        with self._lock:
+            if not self._strict_font_name:
                 try:
-                    if font_path.endswith('.ttf'):
-                        pdfmetrics.registerFont(TTFont('Malgun', font_path))
-                        pdfmetrics.registerFont(TTFont('MalgunBold', font_path))
-                    elif font_path.endswith('.ttc'):
-                        # TTC 파일의 경우 첫 번째 폰트만 등록
-                        pdfmetrics.registerFont(TTFont('Malgun', font_path, subfontIndex=0))
-                    print(f"✅ 폰트 등록 성공: {font_path}")
-                    break
+                    self._register_file(self.source, self.STRICT_FONT_NAME, asciiReadable=False)
+                    self._strict_font_name = self.STRICT_FONT_NAME
+                except Exception as e:
+                    print(f"⚠️ 서브셋 폰트 등록 실패: {self.source} - {e}")
+                    self._strict_font_name = font_name
+            return self._strict_font_name
+    
+    def load(self):
+        """폰트 탐색/등록 (최초 1회) 후 폰트 이름 반환"""
+        if self.font_name:
+            return self.font_name
+        
+        with self._lock:
+            if self.font_name:
+                return self.font_name
+            
+            for path in self.candidates():
+                try:
+                    self._register_file(path)
                 except Exception as e:
-                    print(f"⚠️ 폰트 등록 실패: {font_path} - {e}")
+                    print(f"⚠️ 폰트 등록 실패: {path} - {e}")
                     continue
-        
-        # 기본 폰트 설정
-        return 'Malgun'
-        
-    except Exception as e:
-        print(f"⚠️ 폰트 등록 중 오류: {e}")
-        return 'Helvetica'  # 기본 폰트 사용
+                print(f"✅ 폰트 등록 성공: {path}")
+                self.source = path
+                self.font_name = self.FONT_NAME
+                return self.font_name
+            
+            for cid_font in KOREAN_CID_FONTS:
+                try:
+                    pdfmetrics.registerFont(UnicodeCIDFont(cid_font))
+                except Exception as e:
+                    print(f"⚠️ 폰트 등록 실패: {cid_font} - {e}")
+                    continue
+                print(f"✅ 한글 TTF 폰트가 없어 내장 CID 폰트 사용: {cid_font}")
+                self.source = cid_font
+                self.font_name = cid_font
+                return self.font_name
+            
+            print("⚠️ 한글 폰트를 찾을 수 없습니다. 기본 폰트 사용")
+            self.source = 'builtin'
+            self.font_name = 'Helvetica'
+            return self.font_name
+
+korean_fonts = KoreanFontRegistry(app.config['FONT_FOLDER'])
+
+def register_korean_fonts():
+    """한글 폰트 이름 (등록은 워커당 한 번만 수행)"""
+    return korean_fonts.font_name or korean_fonts.load()
 
-def create_company_seal():
-    """회사 도장 생성 (개선된 버전)"""
+def create_company_seal(font_name=None):
+    """회사 도장 생성 (개선된 버전, 날인 양식에서 폰트별로 한 번만 생성)"""
     try:
         # 도장 크기 설정 (더 크게)
         seal_size = 30*mm
@@ -1171,41 +3645,61 @@ def create_company_seal():
         drawing.add(inner_circle)
         
         # 회사명 텍스트 (중앙, 더 큰 폰트)
+        font_name = font_name or register_korean_fonts()
         company_text = String(seal_size/2, seal_size/2 + 2*mm, '온누리인쇄나라', 
-                             textAnchor='middle', fontSize=10, fillColor=colors.red)
+                             textAnchor='middle', fontName=font_name, fontSize=10, fillColor=colors.red)
         drawing.add(company_text)
         
         # 대표자명 텍스트 (하단, 더 큰 폰트)
         ceo_text = String(seal_size/2, seal_size/2 - 2*mm, '류도현', 
-                         textAnchor='middle', fontSize=8, fillColor=colors.red)
+                         textAnchor='middle', fontName=font_name, fontSize=8, fillColor=colors.red)
         drawing.add(ceo_text)
         
-        print("✅ 도장 생성 완료")
         return drawing
         
     except Exception as e:
         print(f"⚠️ 도장 생성 중 오류: {e}")
         return None
 
-def generate_quote_pdf(data, price_info):
-    """견적서 PDF 생성 (이미지 양식과 동일하게)"""
-    try:
-        # PDF 버퍼 생성
-        buffer = io.BytesIO()
-        
-        # PDF 문서 생성 (여백 최소화)
-        doc = SimpleDocTemplate(buffer, pagesize=A4, 
-                              rightMargin=15*mm, leftMargin=15*mm,
-                              topMargin=15*mm, bottomMargin=15*mm)
-        
-        # 스타일 설정
+def generate_quote_pdf(data, price_info, template=None):
+    """견적서 PDF 생성 (단일 품목, template: 양식 이름)"""
+    return generate_quote_document_pdf(QuoteDocument.from_priced(data, price_info), template=template)
+
+# 공급자(회사) 정보 - 견적서 오른쪽 고정 영역
+SUPPLIER_ROWS = [
+    ['상호', '온누리인쇄나라'],
+    ['사업자번호', '491-20-00640'],
+    ['대표자', '류도현'],
+    ['주소', '서울 금천구 가산디지털1로 142 가산더스카이밸리1차 8층 816호'],
+    ['업태', '제조, 소매, 서비스업'],
+    ['종목', '경인쇄, 문구, 출력, 복사, 제본'],
+    ['사업자계좌번호', '신한 110-493-223413'],
+    ['전화번호', '02-6338-7123']
+]
+
+class QuoteLetterhead:
+    """견적서 고정 영역 (스타일, 표 스타일, 제목/공급자 표)
+    
+    제목과 공급자 표는 스레드마다 한 번 만들어 레이아웃(wrap)까지 해 두고,
+    이후 PDF에서는 다시 배치하지 않고 그리기만 한다.
+    """
+    
+    # 제목 아래 Spacer 높이 (기존 레이아웃과 동일)
+    TITLE_GAP = 15
+    COLUMN_WIDTH = 85*mm
+    SUPPLIER_COL_WIDTHS = [25*mm, 60*mm]
+    # 9pt 한 줄 + 상하 패딩 4pt (직인 위치 계산에 사용하므로 고정)
+    SUPPLIER_ROW_HEIGHTS = [20] * len(SUPPLIER_ROWS)
+    # 직인: 대표자 행, 이름(값 칸 가운데)에서 오른쪽으로
+    SEAL_ROW = [row[0] for row in SUPPLIER_ROWS].index('대표자')
+    SEAL_OFFSET = 12*mm
+    
+    def __init__(self, font_name):
+        self.font_name = font_name
         styles = getSampleStyleSheet()
         
-        # 한글 폰트 등록
-        font_name = register_korean_fonts()
-        
         # 커스텀 스타일 정의
-        title_style = ParagraphStyle(
+        self.title_style = ParagraphStyle(
             'CustomTitle',
             parent=styles['Heading1'],
             fontName=font_name,
@@ -1216,7 +3710,7 @@ def generate_quote_pdf(data, price_info):
             letterSpacing=0.2
         )
         
-        normal_style = ParagraphStyle(
+        self.normal_style = ParagraphStyle(
             'CustomNormal',
             parent=styles['Normal'],
             fontName=font_name,
@@ -1224,24 +3718,8 @@ def generate_quote_pdf(data, price_info):
             spaceAfter=4
         )
         
-        # 스토리 리스트 생성
-        story = []
-        
-        # 제목 (이미지와 동일하게)
-        story.append(Paragraph("견&nbsp;&nbsp;&nbsp;적&nbsp;&nbsp;&nbsp;서", title_style))
-        story.append(Spacer(1, 15))
-        
-        # 메인 정보 섹션 (좌우 배치) - 미리보기와 동일하게
-        # 왼쪽: 수신자 정보 (일련번호, 참조, 전화번호 삭제)
-        from datetime import datetime
-        today = datetime.now()
-        left_data = [
-            ['수신', f"{data.get('customerName', '1')}"],
-            ['견적일자', f"{today.year}년 {today.month}월 {today.day}일"]
-        ]
-        
-        left_table = Table(left_data, colWidths=[25*mm, 60*mm])
-        left_table.setStyle(TableStyle([
+        # 왼쪽: 수신자 정보
+        self.recipient_style = TableStyle([
             ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f6f6f6')),
             ('FONTNAME', (0, 0), (-1, -1), font_name),
             ('FONTSIZE', (0, 0), (-1, -1), 9),
@@ -1253,22 +3731,10 @@ def generate_quote_pdf(data, price_info):
             ('TOPPADDING', (0, 0), (-1, -1), 4),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
             ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        ])
         
         # 오른쪽: 회사 정보 (미리보기와 정확히 동일)
-        right_data = [
-            ['상호', '온누리인쇄나라'],
-            ['사업자번호', '491-20-00640'],
-            ['대표자', '류도현'],
-            ['주소', '서울 금천구 가산디지털1로 142 가산더스카이밸리1차 8층 816호'],
-            ['업태', '제조, 소매, 서비스업'],
-            ['종목', '경인쇄, 문구, 출력, 복사, 제본'],
-            ['사업자계좌번호', '신한 110-493-223413'],
-            ['전화번호', '02-6338-7123']
-        ]
-        
-        right_table = Table(right_data, colWidths=[25*mm, 60*mm])
-        right_table.setStyle(TableStyle([
+        self.supplier_style = TableStyle([
             ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#f6f6f6')),
             ('FONTNAME', (0, 0), (-1, -1), font_name),
             ('FONTSIZE', (0, 0), (-1, -1), 9),
@@ -1282,39 +3748,10 @@ def generate_quote_pdf(data, price_info):
             # 주소와 종목은 왼쪽 정렬로 변경
             ('ALIGN', (1, 3), (1, 3), 'LEFT'),  # 주소
             ('ALIGN', (1, 5), (1, 5), 'LEFT'),  # 종목
-        ]))
-        
-        # 좌우 테이블을 하나의 테이블로 결합
-        combined_data = [
-            [left_table, right_table]
-        ]
-        
-        combined_table = Table(combined_data, colWidths=[85*mm, 85*mm])
-        combined_table.setStyle(TableStyle([
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('LEFTPADDING', (0, 0), (-1, -1), 0),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-            ('TOPPADDING', (0, 0), (-1, -1), 0),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 0)
-        ]))
-        
-        story.append(combined_table)
-        story.append(Spacer(1, 10))
-        
-        # 설명 문구
-        story.append(Paragraph("아래와 같이 견적 합니다", normal_style))
-        story.append(Spacer(1, 10))
-        
-        # 합계금액 섹션 (미리보기와 동일하게 설명 문구 아래에 배치)
-        total_amount = price_info.get("total_price", 2220)  # 실제 계산된 금액 사용
-        total_amount_korean = convert_number_to_korean(int(total_amount))
-        
-        total_data = [
-            ['합계금액', f'₩ {total_amount:,}', '일금', f'({total_amount_korean}원)']
-        ]
+        ])
         
-        total_table = Table(total_data, colWidths=[25*mm, 35*mm, 25*mm, 55*mm])
-        total_table.setStyle(TableStyle([
+        # 합계금액
+        self.total_style = TableStyle([
             ('FONTNAME', (0, 0), (-1, -1), font_name),
             ('FONTSIZE', (0, 0), (-1, -1), 14),  # 폰트 크기 증가 (10 → 14)
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -1326,24 +3763,12 @@ def generate_quote_pdf(data, price_info):
             ('GRID', (0, 0), (-1, -1), 1, colors.black),
             # 금액 부분 더 강조
             ('FONTSIZE', (1, 0), (1, 0), 16),  # 금액 폰트 더 크게
-            ('FONTSIZE', (3, 0), (3, 0), 12),  # 한글 금액도 크게
-        ]))
-        
-        story.append(total_table)
-        story.append(Spacer(1, 10))
-        
-        # 상품 상세 테이블 (미리보기와 정확히 동일)
-        item_data = [
-            ['상품명', '단가적용구간', '규격', '수량', '단가', '공급가액', '세액', '비고'],
-            ['흑백 단면 링제본', f"{data.get('pages', 10)}페이지", 'A4', f"{data.get('quantity', 1)}", f'₩{price_info.get("unit_price", 2220):,}', f'₩{int(price_info.get("total_price", 2220)/1.1):,}', f'₩{int(price_info.get("total_price", 2220)*0.1/1.1):,}', '']
-        ]
+            ('FONTSIZE', (2, 0), (2, 0), 12),  # 한글 금액도 크게
+            ('SPAN', (2, 0), (3, 0)),
+        ])
         
-        # 빈 행 3개 추가
-        for _ in range(3):
-            item_data.append(['', '', '', '', '', '', '', ''])
-        
-        item_table = Table(item_data, colWidths=[35*mm, 20*mm, 15*mm, 15*mm, 20*mm, 25*mm, 20*mm, 15*mm])
-        item_table.setStyle(TableStyle([
+        # 상품 상세
+        self.item_style = TableStyle([
             ('FONTNAME', (0, 0), (-1, -1), font_name),
             ('FONTSIZE', (0, 0), (-1, -1), 9),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
@@ -1355,195 +3780,374 @@ def generate_quote_pdf(data, price_info):
             ('GRID', (0, 0), (-1, -1), 1, colors.black),
             # 상품명은 왼쪽 정렬
             ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-        ]))
-        
-        story.append(item_table)
-        
-        # 하단 여백
-        story.append(Spacer(1, 30))
-        
-        # PDF 생성
-        doc.build(story)
-        buffer.seek(0)
-        return buffer
+        ])
         
-    except Exception as e:
-        print(f"PDF 생성 오류: {e}")
-        return None
-    # 한글 폰트 등록
-    font_name = register_korean_fonts()
-    
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=20*mm, bottomMargin=20*mm)
-    
-    # 스타일 정의
-    styles = getSampleStyleSheet()
-    
-    # 제목 스타일 (한글 폰트 적용)
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        fontName=font_name,
-        alignment=TA_CENTER,
-        spaceAfter=20
-    )
+        # 플로어블은 레이아웃 상태를 갖고 있어 스레드별로 따로 보관
+        self._local = threading.local()
     
-    # 일반 텍스트 스타일 (한글 폰트 적용)
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        fontName=font_name,
-        alignment=TA_LEFT
-    )
+    def flowables(self):
+        """현재 스레드용 제목/공급자 표 (최초 1회 생성 후 재사용)"""
+        local = self._local
+        if not hasattr(local, 'supplier_table'):
+            local.title = Paragraph("견&nbsp;&nbsp;&nbsp;적&nbsp;&nbsp;&nbsp;서", self.title_style)
+            local.supplier_table = Table(SUPPLIER_ROWS, colWidths=self.SUPPLIER_COL_WIDTHS,
+                                         rowHeights=self.SUPPLIER_ROW_HEIGHTS, style=self.supplier_style)
+            local.notice = Paragraph("아래와 같이 견적 합니다", self.normal_style)
+            local.layout = None
+        return local
     
-    # 테이블 스타일 (한글 폰트 적용)
-    table_style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), font_name),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ('FONTNAME', (0, 1), (-1, -1), font_name),
-    ])
-    
-    # 도장 먼저 생성
-    company_seal = create_company_seal()
-    
-    # 문서 내용 구성
-    story = []
-    
-    # 제목
-    story.append(Paragraph("견적서", title_style))
-    story.append(Spacer(1, 10))
-    
-    # 수신자 정보 테이블 (제공된 양식에 맞게 수정)
-    recipient_data = [
-        ['일련번호', '', '수신', data.get('customerName', '고객님') + ' 귀하'],
-        ['참조', '', '전화번호', data.get('phone', '')],
-        ['견적일자', '2025년 08월 11일', '', '']
-    ]
+    def layout(self, width):
+        """고정 영역 배치 (제목 높이, 표 시작 위치, 공급자 표 크기) - 폭이 같으면 다시 배치하지 않음"""
+        fixed = self.flowables()
+        layout = fixed.layout
+        if layout is None or layout['width'] != width:
+            title_height = fixed.title.wrap(width, A4[1])[1]
+            supplier_height = fixed.supplier_table.wrap(self.COLUMN_WIDTH, A4[1])[1]
+            layout = fixed.layout = {
+                'width': width,
+                'title_height': title_height,
+                # 제목 + 제목 아래 여백(spaceAfter) + Spacer
+                'table_top': title_height + self.title_style.spaceAfter + self.TITLE_GAP,
+                # 좌우 표(85mm x 2)는 본문 폭 가운데 정렬
+                'table_left': (width - 2 * self.COLUMN_WIDTH) / 2,
+                'supplier_height': supplier_height,
+            }
+        return layout
     
-    recipient_table = Table(recipient_data, colWidths=[30*mm, 40*mm, 20*mm, 60*mm])
-    recipient_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('FONTNAME', (0, 0), (-1, -1), font_name),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    
-    story.append(recipient_table)
-    story.append(Spacer(1, 10))
-    
-    # "아래와 같이 견적합니다" 문구
-    story.append(Paragraph("아래와 같이 견적합니다.", normal_style))
-    story.append(Spacer(1, 10))
-    
-    # 공급자 정보 테이블 (제공된 양식에 맞게 수정)
-    supplier_data = [
-        ['공급자'],
-        ['상호', '온누리인쇄나라'],
-        ['사업자번호', '491-20-00640'],
-        ['대표자', '류도현'],
-        ['주소', '서울 금천구 가산디지털1로 142 가산더스카이밸리1차 8층 816호'],
-        ['업태', '제조, 소매, 서비스업'],
-        ['종목', '경인쇄, 문구, 출력, 복사, 제본'],
-        ['사업자계좌번호', '신한 110-493-223413'],
-        ['전화번호', '02-6338-7123']
-    ]
+    def seal_center(self, layout, height):
+        """직인 위치 - 공급자 표 '대표자' 칸의 이름 오른쪽 (height: 고정 영역 전체 높이)"""
+        row_heights = self.SUPPLIER_ROW_HEIGHTS
+        bottom = height - layout['table_top'] - layout['supplier_height']
+        x = (layout['table_left'] + self.COLUMN_WIDTH + self.SUPPLIER_COL_WIDTHS[0] + self.SUPPLIER_COL_WIDTHS[1] / 2
+             + self.SEAL_OFFSET)
+        y = bottom + sum(row_heights[self.SEAL_ROW + 1:]) + row_heights[self.SEAL_ROW] / 2
+        return x, y
     
-    supplier_table = Table(supplier_data, colWidths=[30*mm, 120*mm])
-    supplier_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTSIZE', (0, 0), (-1, -1), 10),
-        ('FONTNAME', (0, 0), (-1, -1), font_name),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('FONTNAME', (0, 0), (-1, 0), font_name),
-    ]))
-    
-    story.append(supplier_table)
-    story.append(Spacer(1, 20))
-    
-    # 합계금액 (제공된 양식에 맞게 수정)
-    total_amount = price_info['total_price']
-    total_amount_korean = convert_number_to_korean(int(total_amount))
-    
-    total_data = [
-        ['합계금액', f'일금 {total_amount_korean}원정', f'(W {total_amount:,.0f})']
-    ]
+    def draw(self, canv, width, height):
+        """제목/공급자 표 그리기 (height: 고정 영역 전체 높이)"""
+        fixed = self.flowables()
+        layout = self.layout(width)
+        fixed.title.drawOn(canv, 0, height - layout['title_height'])
+        fixed.supplier_table.drawOn(canv, layout['table_left'] + self.COLUMN_WIDTH,
+                                    height - layout['table_top'] - layout['supplier_height'])
+
+class QuoteHeader(Flowable):
+    """견적서 상단 (고정 제목/공급자 표 + 고객별 수신자 표)"""
     
-    total_table = Table(total_data, colWidths=[30*mm, 80*mm, 40*mm])
-    total_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-        ('ALIGN', (1, 0), (-1, 0), 'CENTER'),
-        ('FONTSIZE', (0, 0), (-1, 0), 12),
-        ('FONTNAME', (0, 0), (-1, 0), font_name),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
+    def __init__(self, letterhead, recipient_table, seal=None):
+        Flowable.__init__(self)
+        self.letterhead = letterhead
+        self.recipient_table = recipient_table
+        self.seal = seal  # (ImageReader, 너비, 높이) 또는 None
     
-    story.append(total_table)
-    story.append(Spacer(1, 20))
+    def wrap(self, availWidth, availHeight):
+        layout = self.letterhead.layout(availWidth)
+        self._layout = layout
+        self._recipient_height = self.recipient_table.wrap(self.letterhead.COLUMN_WIDTH, availHeight)[1]
+        self.width = availWidth
+        self.height = layout['table_top'] + max(layout['supplier_height'], self._recipient_height)
+        return self.width, self.height
     
-    # 상품명 및 상세 정보
-    print_type_map = {
-        'black_white': '흑백',
-        'laser_color': '레이저칼라',
-        'ink_color': '잉크칼라'
-    }
+    def draw(self):
+        self.letterhead.draw(self.canv, self.width, self.height)
+        
+        # 긴 고객명이 오른쪽 회사 정보 위로 넘치지 않도록 왼쪽 칸으로 제한 (테두리 두께만큼 여유)
+        left = self._layout['table_left']
+        self.canv.saveState()
+        clip = self.canv.beginPath()
+        clip.rect(left - 1, 0, self.letterhead.COLUMN_WIDTH + 1.5, self.height)
+        self.canv.clipPath(clip, stroke=0, fill=0)
+        self.recipient_table.drawOn(self.canv, left, self.height - self._layout['table_top'] - self._recipient_height)
+        self.canv.restoreState()
+        
+        # 직인은 공급자 표 위에 겹쳐 찍음
+        if self.seal is not None:
+            image, seal_width, seal_height = self.seal
+            x, y = self.letterhead.seal_center(self._layout, self.height)
+            self.canv.drawImage(image, x - seal_width / 2, y - seal_height / 2, seal_width, seal_height, mask='auto')
+
+class PdfOutputProfile:
+    """견적서 PDF 출력 설정 (스트림 인코딩, 폰트 서브셋, 직인 해상도)"""
     
-    binding_type_map = {
-        'ring': '링제본',
-        'perfect': '무선제본',
-        'saddle': '중철제본',
-        'folding': '접지제본'
-    }
+    def __init__(self, name, ascii85=True, strict_subset=False, image_dpi=300, page_compression=1):
+        self.name = name
+        self.ascii85 = ascii85  # 압축 스트림을 ASCII85로 한 번 더 인코딩 (크기 약 25% 증가)
+        self.strict_subset = strict_subset  # TTF 서브셋에 사용한 글자만 포함
+        self.image_dpi = image_dpi  # 직인 이미지 해상도 (원본보다 키우지는 않음)
+        self.page_compression = page_compression
+
+PDF_OUTPUT_PROFILES = {
+    # ReportLab 기본값과 동일 (인쇄용)
+    'standard': PdfOutputProfile('standard'),
+    # 이메일 첨부/모바일 다운로드용
+    'mobile': PdfOutputProfile('mobile', ascii85=False, strict_subset=True, image_dpi=150),
+}
+
+def get_pdf_output_profile(profile=None):
+    """출력 설정 (이름 또는 PdfOutputProfile, 없으면 PDF_OUTPUT_PROFILE 설정값)"""
+    if isinstance(profile, PdfOutputProfile):
+        return profile
+    return PDF_OUTPUT_PROFILES.get(profile or app.config['PDF_OUTPUT_PROFILE'], PDF_OUTPUT_PROFILES['standard'])
+
+class RlConfigGate:
+    """rl_config.useA85 (프로세스 전역, ReportLab에 문서별 설정 없음) 사용 조정
     
-    print_method_map = {
-        'single': '단면',
-        'double': '양면'
-    }
+    같은 값으로 만드는 PDF는 동시에 생성하고, 다른 값이 필요한 생성만 앞선 생성이 끝날 때까지 기다린다.
+    다른 값을 기다리는 생성이 있으면 새로 들어온 생성도 뒤에 줄을 세워 한쪽이 계속 밀리지 않게 한다.
+    """
     
-    product_name = f"A4 {print_type_map.get(data.get('printType', ''), '')} {print_method_map.get(data.get('printMethod', ''), '')} {binding_type_map.get(data.get('bindingType', ''), '')}"
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._active = 0
+        self._waiting = {0: 0, 1: 0}
+        self._default = rl_config.useA85  # 생성 중이 아닐 때 되돌려 둘 값
     
-    # 상품 상세 테이블 (제공된 양식에 맞게 수정)
-    item_data = [
-        ['상품명', '단가적용구간', '규격', '수량', '단가', '공급가액', '세액', '비고'],
-        [product_name, '', '', str(data.get('quantity', '')), 
-         f"{price_info['unit_price']:,.0f}", 
-         f"{price_info['total_price']:,.0f}", 
-         f"{price_info['total_price'] * 0.1:,.0f}", '']
-    ]
+    @contextmanager
+    def use(self, ascii85):
+        value = int(bool(ascii85))
+        with self._cond:
+            self._waiting[value] += 1
+            try:
+                while (self._active and rl_config.useA85 != value) or (
+                        rl_config.useA85 == value and self._waiting[1 - value]):
+                    self._cond.wait()
+            finally:
+                self._waiting[value] -= 1
+            rl_config.useA85 = value
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                if not self._active:
+                    rl_config.useA85 = self._default
+                    self._cond.notify_all()
+
+rl_config_gate = RlConfigGate()
+
+def pdf_output_settings(profile):
+    """출력 설정의 스트림 인코딩(rl_config.useA85)을 적용한 상태로 PDF 생성"""
+    return rl_config_gate.use(profile.ascii85)
+
+class QuoteSealImage:
+    """견적서 직인 이미지 - 해상도별로 한 번만 축소해 PNG로 보관 (요청마다 원본을 다시 읽지 않음)"""
+    
+    # PDF에 찍히는 직인 크기 (긴 변 기준)
+    SIZE = 15*mm
+    
+    def __init__(self, paths):
+        self.paths = paths
+        self._images = {}
+        self._lock = threading.Lock()
+    
+    def get(self, dpi):
+        """(ImageReader, 너비, 높이) - 읽을 수 있는 이미지가 없으면 None"""
+        if dpi not in self._images:
+            with self._lock:
+                if dpi not in self._images:
+                    self._images[dpi] = self._load(dpi)
+        return self._images[dpi]
     
-    item_table = Table(item_data, colWidths=[40*mm, 25*mm, 20*mm, 15*mm, 20*mm, 25*mm, 20*mm, 25*mm])
-    item_table.setStyle(table_style)
+    def _load(self, dpi):
+        if PILImage is None:
+            print("⚠️ Pillow가 없어 견적서에 직인을 넣지 않습니다.")
+            return None
+        
+        target = max(1, round(self.SIZE / inch * dpi))
+        for path in self.paths:
+            try:
+                with PILImage.open(path) as image:
+                    image.load()
+                    width, height = image.size
+                    if max(width, height) > target:
+                        image.thumbnail((target, target), PILImage.LANCZOS)
+                    buffer = io.BytesIO()
+                    image.save(buffer, 'PNG', optimize=True)
+            except Exception as e:
+                print(f"⚠️ 직인 이미지 읽기 실패: {path} - {e}")
+                continue
+            
+            scale = self.SIZE / max(width, height)
+            buffer.seek(0)
+            return ImageReader(buffer), width * scale, height * scale
+        return None
+
+quote_seal = QuoteSealImage(app.config['QUOTE_SEAL_IMAGES'])
+
+class QuoteTemplate:
+    """견적서 양식 - 스타일/고정 영역은 폰트별로 한 번 만들고, 요청마다 견적 내용만 채움
+    
+    양식을 추가하려면 상속해서 name/version/story()를 정의하고 QUOTE_TEMPLATES에 등록한다.
+    """
     
-    story.append(item_table)
+    name = None
+    version = None  # 양식을 바꾸면 올려서 PDF 캐시 무효화
+    margins = {}  # SimpleDocTemplate 여백 (없으면 ReportLab 기본값)
+    shows_quote_id = False  # 견적 ID가 PDF에 들어가면 저장된 견적은 캐시 키에 포함
     
-    # 서명 및 도장 영역 추가 (도장을 먼저 그리고 그 위에 서명 정보 올리기)
-    story.append(Spacer(1, 30))
+    def __init__(self, font_name):
+        self.font_name = font_name
     
-    # 도장과 서명을 함께 배치하는 테이블 생성
-    if company_seal:
-        # 도장과 서명 정보를 한 테이블에 배치
-        signature_seal_data = [
-            ['', '', '', company_seal],
-            ['', '', '', ''],
-            ['', '온누리인쇄나라', '', ''],
-            ['', '대표: 류도현', '', ''],
-            ['', '2025년 08월 11일', '', '']
+    def story(self, document, profile):
+        """견적서 플로어블 목록"""
+        raise NotImplementedError
+
+class CompactQuoteTemplate(QuoteTemplate):
+    """기본 양식 - 수신자/공급자 좌우 배치, 공급자 표에 직인 이미지 (미리보기와 동일)"""
+    
+    name = 'compact'
+    version = 'compact-2'
+    margins = {'rightMargin': 15*mm, 'leftMargin': 15*mm, 'topMargin': 15*mm, 'bottomMargin': 15*mm}
+    
+    def __init__(self, font_name):
+        super().__init__(font_name)
+        self.letterhead = QuoteLetterhead(font_name)
+    
+    def story(self, document, profile):
+        # 고정 영역 (스타일/공급자 표는 미리 만들어 둔 것 사용)
+        letterhead = self.letterhead
+        fixed = letterhead.flowables()
+        
+        # 스토리 리스트 생성
+        story = []
+        
+        # 제목 + 메인 정보 섹션 (좌우 배치) - 미리보기와 동일하게
+        # 왼쪽: 수신자 정보 (일련번호, 참조, 전화번호 삭제), 오른쪽: 회사 정보 (고정)
+        today = datetime.now()
+        left_data = [
+            ['수신', f"{document.customer.get('customerName') or '1'}"],
+            ['견적일자', f"{today.year}년 {today.month}월 {today.day}일"]
+        ]
+        left_table = Table(left_data, colWidths=[25*mm, 60*mm], style=letterhead.recipient_style)
+        
+        story.append(QuoteHeader(letterhead, left_table, seal=quote_seal.get(profile.image_dpi)))
+        story.append(Spacer(1, 10))
+        
+        # 설명 문구
+        story.append(fixed.notice)
+        story.append(Spacer(1, 10))
+        
+        # 합계금액 섹션 (미리보기와 동일하게 설명 문구 아래에 배치)
+        total_amount = document.totals['total_price']  # 실제 계산된 금액 사용 (품목 합계)
+        total_data = [
+            ['합계금액', f'₩ {total_amount:,}', format_korean_amount(total_amount), '']
+        ]
+        total_table = Table(total_data, colWidths=[25*mm, 35*mm, 25*mm, 55*mm], style=letterhead.total_style)
+        
+        story.append(total_table)
+        story.append(Spacer(1, 10))
+        
+        # 상품 상세 테이블 (미리보기와 정확히 동일)
+        item_data = [
+            ['상품명', '단가적용구간', '규격', '수량', '단가', '공급가액', '세액', '비고']
         ]
+        for line in document.lines:
+            spec, line_price = line['spec'], line['price_info']
+            item_data.append([
+                quote_product_name(spec),
+                f"{spec['pages']}페이지" if spec.get('pages') else '',
+                spec.get('size', ''),
+                f"{spec['quantity']}",
+                f'₩{line_price["unit_price"]:,}',
+                f'₩{int(line_price["total_price"]/1.1):,}',
+                f'₩{int(line_price["total_price"]*0.1/1.1):,}',
+                spec.get('note', '')
+            ])
+        
+        # 최소 4행이 되도록 빈 행 추가
+        while len(item_data) < 5:
+            item_data.append(['', '', '', '', '', '', '', ''])
+        
+        item_table = Table(item_data, colWidths=[35*mm, 20*mm, 15*mm, 15*mm, 20*mm, 25*mm, 20*mm, 15*mm],
+                           style=letterhead.item_style)
+        
+        story.append(item_table)
+        
+        # 적용 단가표 버전 (재발행 시 동일 금액 재현용)
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(f"※ 단가 기준: {document.tariff_version}", letterhead.normal_style))
+        
+        # 하단 여백
+        story.append(Spacer(1, 30))
+        return story
+
+class SealedQuoteTemplate(QuoteTemplate):
+    """날인 양식 - 공급자 표를 본문 폭으로, 하단에 회사 도장과 서명란"""
+    
+    name = 'sealed'
+    version = 'sealed-1'
+    shows_quote_id = True  # 일련번호
+    margins = {'rightMargin': 12*mm, 'leftMargin': 12*mm, 'topMargin': 20*mm, 'bottomMargin': 20*mm}
+    
+    def __init__(self, font_name):
+        super().__init__(font_name)
+        styles = getSampleStyleSheet()
+        
+        # 제목 스타일 (한글 폰트 적용)
+        self.title_style = ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            fontName=font_name,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        )
+        
+        # 일반 텍스트 스타일 (한글 폰트 적용)
+        self.normal_style = ParagraphStyle(
+            'CustomNormal',
+            parent=styles['Normal'],
+            fontSize=10,
+            fontName=font_name,
+            alignment=TA_LEFT
+        )
+        
+        # 상품 상세 테이블 스타일
+        self.item_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), font_name),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('FONTNAME', (0, 1), (-1, -1), font_name),
+        ])
+        
+        # 수신자 정보 (제공된 양식에 맞게)
+        self.recipient_style = TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+        
+        # 공급자 정보 (첫 행은 '공급자' 제목)
+        self.supplier_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
+        
+        # 합계금액
+        self.total_style = TableStyle([
+            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+            ('ALIGN', (1, 0), (-1, 0), 'CENTER'),
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('FONTNAME', (0, 0), (-1, 0), font_name),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
         
-        signature_seal_table = Table(signature_seal_data, colWidths=[40*mm, 50*mm, 20*mm, 40*mm])
-        signature_seal_table.setStyle(TableStyle([
+        # 서명란 (도장 오른쪽, 회사명/대표명 아래 선)
+        self.signature_seal_style = TableStyle([
             ('ALIGN', (0, 0), (2, -1), 'CENTER'),
             ('ALIGN', (3, 0), (3, 0), 'RIGHT'),  # 도장 오른쪽 정렬
             ('FONTSIZE', (0, 0), (-1, -1), 10),
@@ -1555,41 +4159,263 @@ def generate_quote_pdf(data, price_info):
             ('RIGHTPADDING', (0, 0), (-1, -1), 0),
             ('TOPPADDING', (0, 0), (-1, -1), 0),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 0)
-        ]))
-        
-        story.append(signature_seal_table)
-    else:
-        # 도장이 없는 경우 기본 서명 테이블
-        signature_data = [
-            ['', '', ''],
-            ['', '', ''],
-            ['', '온누리인쇄나라', ''],
-            ['', '대표: 류도현', ''],
-            ['', datetime.now().strftime('%Y년 %m월 %d일'), '']
-        ]
-        
-        signature_table = Table(signature_data, colWidths=[60*mm, 60*mm, 30*mm])
-        signature_table.setStyle(TableStyle([
+        ])
+        self.signature_style = TableStyle([
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTSIZE', (0, 0), (-1, -1), 10),
             ('FONTNAME', (0, 0), (-1, -1), font_name),
             ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
             ('LINEBELOW', (1, 2), (1, 2), 1, colors.black),  # 회사명 아래 선
             ('LINEBELOW', (1, 3), (1, 3), 1, colors.black),  # 대표명 아래 선
-        ]))
+        ])
+        
+        # 도장은 한 번만 그려 두고 모든 견적서에서 재사용 (생성 실패 시 도장 없는 서명란)
+        self.company_seal = create_company_seal(font_name)
+        
+        # 플로어블은 레이아웃 상태를 갖고 있어 스레드별로 따로 보관
+        self._local = threading.local()
+    
+    def flowables(self):
+        """현재 스레드용 제목/안내 문구/공급자 표 (최초 1회 생성 후 재사용)"""
+        local = self._local
+        if not hasattr(local, 'supplier_table'):
+            local.title = Paragraph("견적서", self.title_style)
+            local.notice = Paragraph("아래와 같이 견적합니다.", self.normal_style)
+            local.supplier_table = Table([['공급자']] + SUPPLIER_ROWS, colWidths=[30*mm, 120*mm],
+                                         style=self.supplier_style)
+        return local
+    
+    def story(self, document, profile):
+        fixed = self.flowables()
+        quote_date = datetime.now().strftime('%Y년 %m월 %d일')
+        customer = document.customer
+        story = []
+        
+        # 제목
+        story.append(fixed.title)
+        story.append(Spacer(1, 10))
+        
+        # 수신자 정보
+        recipient_data = [
+            ['일련번호', document.id if document.persisted else '-', '수신', (customer.get('customerName') or '고객님') + ' 귀하'],
+            ['참조', '', '전화번호', customer.get('phone') or ''],
+            ['견적일자', quote_date, '', '']
+        ]
+        story.append(Table(recipient_data, colWidths=[30*mm, 40*mm, 20*mm, 60*mm], style=self.recipient_style))
+        story.append(Spacer(1, 10))
+        
+        # "아래와 같이 견적합니다" 문구
+        story.append(fixed.notice)
+        story.append(Spacer(1, 10))
+        
+        # 공급자 정보 (고정)
+        story.append(fixed.supplier_table)
+        story.append(Spacer(1, 20))
+        
+        # 합계금액
+        total_amount = document.totals['total_price']
+        total_data = [
+            ['합계금액', format_korean_amount(total_amount), f'(₩ {total_amount:,})']
+        ]
+        story.append(Table(total_data, colWidths=[30*mm, 80*mm, 40*mm], style=self.total_style))
+        story.append(Spacer(1, 20))
+        
+        # 상품 상세 테이블
+        item_data = [
+            ['상품명', '단가적용구간', '규격', '수량', '단가', '공급가액', '세액', '비고']
+        ]
+        for line in document.lines:
+            spec, line_price = line['spec'], line['price_info']
+            item_data.append([
+                quote_product_name(spec),
+                f"{spec['pages']}페이지" if spec.get('pages') else '',
+                spec.get('size', ''),
+                f"{spec['quantity']}",
+                f'{line_price["unit_price"]:,}',
+                f'{int(line_price["total_price"]/1.1):,}',
+                f'{int(line_price["total_price"]*0.1/1.1):,}',
+                spec.get('note', '')
+            ])
+        story.append(Table(item_data, colWidths=[44*mm, 24*mm, 14*mm, 12*mm, 20*mm, 24*mm, 20*mm, 22*mm],
+                           style=self.item_style))
+        
+        # 적용 단가표 버전 (재발행 시 동일 금액 재현용)
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(f"※ 단가 기준: {document.tariff_version}", self.normal_style))
+        
+        # 서명 및 도장 영역 (도장을 먼저 그리고 그 위에 서명 정보 올리기)
+        story.append(Spacer(1, 30))
+        if self.company_seal:
+            signature_seal_data = [
+                ['', '', '', self.company_seal],
+                ['', '', '', ''],
+                ['', '온누리인쇄나라', '', ''],
+                ['', '대표: 류도현', '', ''],
+                ['', quote_date, '', '']
+            ]
+            story.append(Table(signature_seal_data, colWidths=[40*mm, 50*mm, 20*mm, 40*mm],
+                               style=self.signature_seal_style))
+        else:
+            signature_data = [
+                ['', '', ''],
+                ['', '', ''],
+                ['', '온누리인쇄나라', ''],
+                ['', '대표: 류도현', ''],
+                ['', quote_date, '']
+            ]
+            story.append(Table(signature_data, colWidths=[60*mm, 60*mm, 30*mm], style=self.signature_style))
         
-        story.append(signature_table)
+        return story
+
+# 견적서 양식 (이름 → 양식 클래스)
+QUOTE_TEMPLATES = {template.name: template for template in (CompactQuoteTemplate, SealedQuoteTemplate)}
+
+_quote_templates = {}
+
+def quote_template_name(name=None):
+    """견적서 양식 이름 확인 (없으면 기본 양식)"""
+    name = name or app.config['QUOTE_PDF_TEMPLATE']
+    if name not in QUOTE_TEMPLATES:
+        raise QuoteInputError(f"지원하지 않는 견적서 양식입니다: {name} (사용 가능: {', '.join(QUOTE_TEMPLATES)})")
+    return name
+
+def quote_font_name(profile=None):
+    """출력 설정에 맞는 한글 폰트 이름 (서브셋 설정이면 서브셋용으로 따로 등록한 폰트)"""
+    profile = get_pdf_output_profile(profile)
+    return korean_fonts.strict_font_name() if profile.strict_subset else register_korean_fonts()
+
+def get_quote_template(name=None, profile=None, font_name=None):
+    """양식 이름과 출력 설정(서브셋용 폰트 여부)에 맞는 견적서 양식 (폰트별로 한 번만 생성)"""
+    name = quote_template_name(name)
+    font_name = font_name or quote_font_name(profile)
+    key = (name, font_name)
+    template = _quote_templates.get(key)
+    if template is None:
+        template = _quote_templates.setdefault(key, QUOTE_TEMPLATES[name](font_name))
+    return template
+
+def compile_quote_templates():
+    """모든 양식을 출력 설정별로 미리 생성 (import 시 1회, 요청 처리 중에는 생성 비용 없음)"""
+    for profile in PDF_OUTPUT_PROFILES.values():
+        for name in QUOTE_TEMPLATES:
+            get_quote_template(name, profile)
+
+class PdfStageTimer:
+    """견적서 PDF 생성 단계별 소요 시간(ms), PDF 크기, 최대 메모리 할당량(trace_memory) 측정
+    
+    단계: font(폰트 확인), styles(양식/스타일 준비), tables(표/문단 구성), build(doc.build), finalize(버퍼 마무리)
+    trace_memory는 프로세스 전체 할당을 재므로 다른 스레드가 함께 렌더링 중이면 값이 커질 수 있다.
+    """
+    
+    STAGES = ('font', 'styles', 'tables', 'build', 'finalize')
+    
+    def __init__(self, trace_memory=False):
+        self.values = {}
+        self.trace_memory = trace_memory
+        self._started_tracing = False
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+    
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.values[f'{name}_ms'] = round((time.perf_counter() - start) * 1000, 3)
+    
+    def finish(self, size):
+        """전체 시간/크기/메모리 기록 후 측정값 반환"""
+        self.values['total_ms'] = round((time.perf_counter() - self._start) * 1000, 3)
+        self.values['bytes'] = size
+        if self.trace_memory:
+            self.values['peak_kb'] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        return self.values
+    
+    def close(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+def record_pdf_timings(timings):
+    """PDF 생성 측정값을 통계에 반영 (요청 처리 중이면 디버그 헤더용으로도 보관)"""
+    if not timings:
+        return
+    for name, value in timings.items():
+        metrics.observe(f'pdf.{name}', value)
+    if has_request_context():
+        g.pdf_timings = timings
+
+def generate_quote_document_pdf(document, template=None, profile=None, timer=None):
+    """견적서 PDF 생성 (품목 여러 개 지원, template: 양식 이름 또는 QuoteTemplate, profile: 출력 설정)
     
-    # PDF 생성
-    doc.build(story)
-    buffer.seek(0)
-    return buffer
+    timer(PdfStageTimer)를 넘기면 측정값은 호출한 쪽에서 처리하고, 없으면 바로 통계에 반영한다.
+    """
+    record = timer is None
+    if timer is None:
+        timer = PdfStageTimer(app.config['PDF_METRICS_TRACE_MEMORY'])
+    try:
+        with timer.stage('font'):
+            profile = get_pdf_output_profile(profile)
+            font_name = None if isinstance(template, QuoteTemplate) else quote_font_name(profile)
+        
+        with timer.stage('styles'):
+            if not isinstance(template, QuoteTemplate):
+                template = get_quote_template(template, profile, font_name)
+            
+            # PDF 버퍼 생성
+            buffer = io.BytesIO()
+            doc = SimpleDocTemplate(buffer, pagesize=A4, pageCompression=profile.page_compression,
+                                    **template.margins)
+        
+        with timer.stage('tables'):
+            story = template.story(document, profile)
+        
+        # PDF 생성
+        with timer.stage('build'):
+            with pdf_output_settings(profile):
+                doc.build(story)
+        
+        with timer.stage('finalize'):
+            size = buffer.seek(0, io.SEEK_END)
+            buffer.seek(0)
+        
+        timings = timer.finish(size)
+        if record:
+            record_pdf_timings(timings)
+        return buffer
+        
+    except Exception as e:
+        print(f"PDF 생성 오류: {e}")
+        return None
+    finally:
+        timer.close()
+
+# 기존 DB에 추가해야 하는 컬럼 (테이블, 컬럼, 타입)
+DB_ADDED_COLUMNS = [
+    ('outbound_email', 'raw_message', 'BLOB'),
+    ('outbound_email', 'dedup_key', 'VARCHAR(64)'),
+    ('outbound_email', 'digest', 'BOOLEAN DEFAULT 0'),
+]
 
 def ensure_db():
     """gunicorn 환경에서도 최초 로드시 DB 테이블을 보장 생성"""
     try:
         with app.app_context():
             db.create_all()
+            
+            # create_all은 기존 테이블에 컬럼을 추가하지 않으므로 직접 추가
+            inspector = db.inspect(db.engine)
+            for table, column, column_type in DB_ADDED_COLUMNS:
+                existing = {c['name'] for c in inspector.get_columns(table)}
+                if column not in existing:
+                    with db.engine.begin() as connection:
+                        connection.exec_driver_sql(f'ALTER TABLE "{table}" ADD COLUMN {column} {column_type}')
+                    print(f"✅ 컬럼 추가: {table}.{column}")
             print("✅ DB 초기화 완료")
     except Exception as e:
         print(f"DB 초기화 오류: {e}")
@@ -1619,45 +4445,47 @@ def safe_int_conversion(value):
         print(f"정수 변환 오류: {value}")
         return 0
 
+def _build_korean_groups():
+    """0~9999 한글 읽기표 (십/백/천 앞의 '일'은 생략: 1100 → 천백)"""
+    units = ['', '일', '이', '삼', '사', '오', '육', '칠', '팔', '구']
+    tens = ['', '십', '백', '천']
+    groups = []
+    for number in range(10000):
+        parts = []
+        for position in range(3, -1, -1):
+            digit = number // 10 ** position % 10
+            if digit:
+                parts.append(('' if digit == 1 and position else units[digit]) + tens[position])
+        groups.append(''.join(parts))
+    return tuple(groups)
+
+KOREAN_GROUPS = _build_korean_groups()
+KOREAN_BIG_UNITS = ('', '만', '억', '조')
+KOREAN_AMOUNT_LIMIT = 10 ** (4 * len(KOREAN_BIG_UNITS))  # 1경 미만 (9999조까지)
+
+@lru_cache(maxsize=4096)
 def convert_number_to_korean(number):
-    """숫자를 한글로 변환 (개선된 버전)"""
+    """숫자를 한글로 변환 (4자리 단위, 예: 1234500 → 백이십삼만사천오백)"""
+    if number < 0 or number >= KOREAN_AMOUNT_LIMIT:
+        raise ValueError(f'한글 금액 변환 범위를 벗어났습니다: {number}')
     if number == 0:
         return '영'
     
-    # 한글 숫자 매핑
-    units = ['', '일', '이', '삼', '사', '오', '육', '칠', '팔', '구']
-    tens = ['', '십', '백', '천']
-    big_units = ['', '만', '억', '조']
-    
-    # 숫자를 문자열로 변환하고 뒤집기
-    num_str = str(number)[::-1]
     result = []
+    for big_unit in KOREAN_BIG_UNITS:
+        number, group = divmod(number, 10000)
+        if group:
+            result.append(KOREAN_GROUPS[group] + big_unit)
+        if not number:
+            break
     
-    for i, digit in enumerate(num_str):
-        if digit == '0':
-            continue
-            
-        # 큰 단위 (만, 억, 조)
-        if i % 4 == 0 and i > 0:
-            big_unit_idx = i // 4
-            if big_unit_idx < len(big_units):
-                result.append(big_units[big_unit_idx])
-        
-        # 작은 단위 (십, 백, 천)
-        small_unit_idx = i % 4
-        if small_unit_idx > 0 and digit != '1':
-            result.append(tens[small_unit_idx])
-        elif small_unit_idx > 0 and digit == '1':
-            result.append(tens[small_unit_idx])
-        
-        # 숫자
-        if digit != '1' or small_unit_idx == 0:
-            result.append(units[int(digit)])
-    
-    # 결과 뒤집기
     result.reverse()
     return ''.join(result)
 
+def format_korean_amount(amount):
+    """견적서/이메일/청구서 공통 한글 금액 표기 (예: 일금 십팔만원정)"""
+    return f"일금 {convert_number_to_korean(int(amount))}원정"
+
 # 폴더 관리 관련 라우트들
 @app.route('/api/folders', methods=['GET'])
 def get_folders():
@@ -1933,10 +4761,11 @@ def uploaded_file(filename):
     """업로드된 파일 서빙"""
     return send_file(os.path.join(app.config['UPLOAD_FOLDER'], filename))
 
+ensure_db()
+register_korean_fonts()
+compile_quote_templates()
+
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-    
     print("🚀 온누리인쇄나라 강화된 웹사이트를 시작합니다...")
     print("📱 브라우저에서 http://localhost:5000 으로 접속하세요.")
     
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+견적 계산 마이크로벤치마크
+기존 if/elif 기반 계산과 컴파일된 단가표(bisect) 기반 calculate_price 비교
+
+사용법: python benchmarks/bench_calculate_price.py [--number 200000]
+"""
+
+import os
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_enhanced import calculate_price  # noqa: E402
+
+PRINT_TYPES = ['black_white', 'laser_color', 'ink_color']
+BINDING_TYPES = ['ring', 'perfect', 'saddle', 'folding']
+PRINT_METHODS = ['single', 'double']
+
+
+def legacy_calculate_price(print_type, binding_type, quantity, pages, size, print_method='single'):
+    """기존 if/elif 기반 견적 계산 (비교 기준용, 2025.01.02 단가표)"""
+    
+    # 페이지 수에 따른 출력 가격 계산
+    def get_print_price(print_type, pages, print_method):
+        # 페이지 수 구간별 가격표 - 2025.01.02 공식 가격표 고정
+        if pages <= 500:
+            price_ranges = {
+                'black_white': {'single': 40, 'double': 40},  # 고정: 레이져흑백 500P이하
+                'laser_color': {'single': 150, 'double': 150},  # 고정: 레이져칼라 500P이하
+                'ink_color': {'single': 70, 'double': 70}  # 고정: 잉크칼라 500P이하
+            }
+        elif pages <= 5000:
+            price_ranges = {
+                'black_white': {'single': 38, 'double': 33},  # 고정: 레이져흑백 501-5,000P
+                'laser_color': {'single': 115, 'double': 110},  # 고정: 레이져칼라 501-5,000P
+                'ink_color': {'single': 66, 'double': 60}  # 고정: 잉크칼라 501-5,000P
+            }
+        elif pages <= 10000:
+            price_ranges = {
+                'black_white': {'single': 30, 'double': 25},  # 고정: 레이져흑백 5,001-10,000P
+                'laser_color': {'single': 93, 'double': 88},  # 고정: 레이져칼라 5,001-10,000P
+                'ink_color': {'single': 55, 'double': 50}  # 고정: 잉크칼라 5,001-10,000P
+            }
+        elif pages <= 15000:
+            price_ranges = {
+                'black_white': {'single': 27, 'double': 22},  # 고정: 레이져흑백 10,001-15,000P
+                'laser_color': {'single': 82, 'double': 77},  # 고정: 레이져칼라 10,001-15,000P
+                'ink_color': {'single': 50, 'double': 45}  # 고정: 잉크칼라 10,001-15,000P
+            }
+        else:  # 15001페이지 이상
+            price_ranges = {
+                'black_white': {'single': 25, 'double': 20},  # 고정: 레이져흑백 15,001P이상
+                'laser_color': {'single': 72, 'double': 66},  # 고정: 레이져칼라 15,001P이상
+                'ink_color': {'single': 45, 'double': 40}  # 고정: 잉크칼라 15,001P이상
+            }
+        
+        return price_ranges.get(print_type, {'single': 40, 'double': 40})[print_method]
+    
+    # 수량에 따른 제본 가격 계산 - 2025.01.02 공식 가격표 고정
+    def get_binding_price(binding_type, quantity):
+        if binding_type == 'ring':
+            if quantity <= 30:
+                return 2200  # 고정: 링제본 1-30부
+            elif quantity <= 49:
+                return 1650  # 고정: 링제본 31-49부
+            elif quantity <= 99:
+                return 1430  # 고정: 링제본 50-99부
+            else:  # 100부 이상
+                return 1100  # 고정: 링제본 100부이상
+        elif binding_type == 'perfect':
+            if quantity <= 30:
+                return 2200  # 고정: 무선제본 1-30부
+            elif quantity <= 49:
+                return 1100  # 고정: 무선제본 31-49부
+            elif quantity <= 99:
+                return 770   # 고정: 무선제본 50-99부
+            else:  # 100부 이상
+                return 770   # 고정: 무선제본 100부이상
+        elif binding_type == 'saddle':
+            return 330  # 고정: 중철제본 부당 330원
+        elif binding_type == 'folding':
+            return 500  # 고정: 접지제본 기본 가격
+        else:
+            return 0
+    
+    # 총 페이지 수 계산 (페이지 × 수량)
+    total_pages = pages * quantity
+    
+    # 출력 가격 계산 (총 페이지 수 기준)
+    unit_print_price = get_print_price(print_type, total_pages, print_method)
+    total_print_price = unit_print_price * total_pages
+    
+    # 제본 가격 계산 (부당 가격)
+    unit_binding_price = get_binding_price(binding_type, quantity)
+    total_binding_price = unit_binding_price * quantity
+    
+    # 총 가격 (출력비 + 제본비) - 부가세 포함
+    total_price_with_tax = total_print_price + total_binding_price
+    
+    # 세액 계산 (부가세 10%)
+    tax_amount = round(total_price_with_tax * 0.1)
+    
+    # 총 가격 (부가세 제외) - 합계금액에서 세액 제외
+    total_price_without_tax = total_price_with_tax - tax_amount
+    
+    # 단위 가격 (페이지당 출력 비용 + 제본 비용) - 상수 기반 계산
+    unit_price = (unit_print_price * pages) + unit_binding_price
+    
+    return {
+        'unit_price': unit_price,
+        'total_price': total_price_without_tax,  # 부가세 제외된 금액
+        'total_price_with_tax': total_price_with_tax,  # 부가세 포함된 금액
+        'tax_amount': tax_amount,
+        'discount_rate': 0,  # 할인은 제본 가격에 이미 반영됨
+        'print_price': total_print_price,
+        'binding_price': total_binding_price,
+        'unit_print_price': unit_print_price,
+        'unit_binding_price': unit_binding_price,
+        'pages': pages,
+        'total_pages': total_pages
+    }
+
+
+def make_inputs(count, seed=20250102):
+    """견적 폼에서 들어오는 형태와 비슷한 입력 조합 생성"""
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(count):
+        inputs.append((
+            rng.choice(PRINT_TYPES),
+            rng.choice(BINDING_TYPES),
+            rng.choice([1, 5, 10, 20, 30, 31, 45, 50, 80, 100, 120, 300]),
+            rng.choice([1, 10, 24, 48, 100, 150, 200, 350]),
+            'A4',
+            rng.choice(PRINT_METHODS),
+        ))
+    return inputs
+
+
+def check_equivalence(inputs):
+    """두 구현의 결과가 완전히 같은지 확인"""
+    for args in inputs:
+        expected = legacy_calculate_price(*args)
+        actual = calculate_price(*args)
+        for key, value in expected.items():
+            if actual[key] != value:
+                raise AssertionError(f'결과 불일치 {args}: {key} {actual[key]} != {value}')
+
+
+def bench(func, inputs, number):
+    """입력 목록을 순환하며 func를 number번 호출하고 호출당 시간(ns) 반환"""
+    count = len(inputs)
+    loops = max(1, number // count)
+
+    def run():
+        for args in inputs:
+            func(*args)
+
+    best = min(timeit.repeat(run, number=loops, repeat=5))
+    return best / (loops * count) * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description='calculate_price 마이크로벤치마크')
+    parser.add_argument('--number', type=int, default=200000, help='측정 호출 횟수')
+    args = parser.parse_args()
+
+    inputs = make_inputs(1000)
+    check_equivalence(inputs)
+
+    legacy_ns = bench(legacy_calculate_price, inputs, args.number)
+    compiled_ns = bench(calculate_price, inputs, args.number)
+
+    print(f'legacy (if/elif)   : {legacy_ns:8.1f} ns/call')
+    print(f'compiled (bisect)  : {compiled_ns:8.1f} ns/call')
+    print(f'speedup            : {legacy_ns / compiled_ns:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
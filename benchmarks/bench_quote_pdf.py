@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+견적서 PDF 생성 벤치마크
+양식(QUOTE_TEMPLATES)별로 매 요청마다 양식(스타일/표 스타일/제목/공급자 표/도장)을 새로 만들어
+그리는 방식과 import 시 미리 만들어 둔 양식(기본 양식은 배치까지 끝낸 제목/공급자 표를 그리기만)을 쓰는 방식 비교
+
+사용법: python benchmarks/bench_quote_pdf.py [--number 300] [--items 1]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app_enhanced import (  # noqa: E402
+    QUOTE_TEMPLATES,
+    QuoteDocument,
+    generate_quote_document_pdf,
+    get_quote_template,
+)
+
+SAMPLE_ITEMS = [
+    {'printType': 'black_white', 'bindingType': 'ring', 'quantity': 30, 'pages': 100, 'size': 'A4'},
+    {'printType': 'laser_color', 'bindingType': 'perfect', 'quantity': 120, 'pages': 48, 'size': 'A5'},
+    {'printType': 'ink_color', 'bindingType': 'saddle', 'quantity': 300, 'pages': 24, 'size': 'B5'},
+    {'name': '스티커', 'unitPrice': 500, 'quantity': 10},
+]
+
+
+def bench(funcs, number, rounds=20):
+    """함수별 호출당 CPU 시간(ms) - 번갈아 측정한 라운드 중 최소값 (공용 서버 편차 감소)"""
+    per_round = max(1, number // rounds)
+    best = [float('inf')] * len(funcs)
+    for _ in range(rounds):
+        for index, func in enumerate(funcs):
+            start = time.process_time()
+            for _ in range(per_round):
+                func()
+            best[index] = min(best[index], (time.process_time() - start) / per_round * 1000)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='견적서 PDF 생성 벤치마크')
+    parser.add_argument('--number', type=int, default=300, help='측정 호출 횟수')
+    parser.add_argument('--items', type=int, default=1, choices=range(1, len(SAMPLE_ITEMS) + 1),
+                        help='견적 품목 수')
+    args = parser.parse_args()
+
+    document = QuoteDocument.from_items({'customerName': '홍길동'}, SAMPLE_ITEMS[:args.items])
+
+    for name, template_class in QUOTE_TEMPLATES.items():
+        font_name = get_quote_template(name).font_name  # 기본 출력 설정의 폰트
+
+        def rebuild_each_time():
+            # 이전 방식: 매번 스타일/표/도장을 만들고 표 레이아웃(wrap)부터 다시 수행
+            generate_quote_document_pdf(document, template=template_class(font_name))
+
+        def precompiled(name=name):
+            generate_quote_document_pdf(document, template=name)
+
+        precompiled()
+        rebuild_ms, precompiled_ms = bench([rebuild_each_time, precompiled], args.number)
+
+        print(f'[{name}] font {font_name}')
+        print(f'  rebuild per PDF : {rebuild_ms:8.3f} ms/pdf')
+        print(f'  precompiled     : {precompiled_ms:8.3f} ms/pdf')
+        print(f'  speedup         : {rebuild_ms / precompiled_ms:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
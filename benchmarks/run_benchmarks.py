@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+견적/서식 함수 마이크로벤치마크 모음 (회귀 예산 검사)
+실제 견적 폼 입력 분포로 각 함수를 측정하고 결과를 JSON으로 저장
+호출당 시간이 budgets.json 예산을 넘으면 종료 코드 1로 실패
+
+사용법:
+    python benchmarks/run_benchmarks.py [--output benchmarks/results.json]
+                                        [--only calculate_price ...]
+                                        [--update-budgets]
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import platform
+import timeit
+from datetime import datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from app_enhanced import (  # noqa: E402
+    app,
+    calculate_price,
+    safe_int_conversion,
+    convert_number_to_korean,
+    extract_keyword_from_data,
+)
+
+PRINT_TYPES = ['black_white', 'laser_color', 'ink_color']
+BINDING_TYPES = ['ring', 'perfect', 'saddle', 'folding']
+PRINT_METHODS = ['single', 'double']
+SIZES = ['A4', 'A5', 'B5', 'A3']
+
+DEFAULT_BUDGETS = os.path.join(BENCH_DIR, 'budgets.json')
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, 'results.json')
+
+# --update-budgets 시 측정값에 곱하는 여유 배수 (공용 서버 측정 편차 감안)
+BUDGET_HEADROOM = 3.0
+
+# 캐시 적중만 재는 항목은 캐시 없는 측정값으로 예산을 정함 (캐시가 빠져도 예산 안이어야 함)
+BUDGET_SOURCES = {
+    'convert_number_to_korean': 'convert_number_to_korean_uncached',
+}
+
+
+def quote_inputs(rng, count, huge=False):
+    """견적 폼 입력 조합 (huge=True면 총 페이지 15,001P 이상 구간만)"""
+    inputs = []
+    for _ in range(count):
+        if huge:
+            # 학원교재/매뉴얼 대량 주문: 총 페이지 15,001 ~ 수백만
+            pages = rng.choice([150, 300, 500, 1000, 3000, 20000])
+            quantity = rng.choice([101, 200, 500, 1000, 3000])
+        else:
+            pages = rng.choice([1, 10, 24, 48, 100, 150, 200, 350, 500])
+            quantity = rng.choice([1, 5, 10, 20, 30, 31, 45, 50, 80, 100, 120, 300])
+        inputs.append((
+            rng.choice(PRINT_TYPES),
+            rng.choice(BINDING_TYPES),
+            quantity,
+            pages,
+            rng.choice(SIZES),
+            rng.choice(PRINT_METHODS),
+        ))
+    return inputs
+
+
+def int_inputs(rng, count):
+    """폼/JSON에서 들어오는 수량·페이지 값 (문자열, 소수, 공백, 빈 값 포함)"""
+    makers = [
+        lambda: str(rng.randint(1, 500)),
+        lambda: f" {rng.randint(1, 500)} ",
+        lambda: f"{rng.randint(1, 500)}.{rng.randint(0, 9)}",
+        lambda: rng.randint(1, 500),
+        lambda: float(rng.randint(1, 500)),
+        lambda: '',
+        lambda: None,
+    ]
+    weights = [40, 5, 5, 35, 5, 5, 5]
+    return [(rng.choices(makers, weights)[0](),) for _ in range(count)]
+
+
+def amount_inputs(rng, count):
+    """견적서 합계 금액 (대부분 수만~수백만 원, 일부 억 단위)"""
+    amounts = []
+    for _ in range(count):
+        scale = rng.choices([10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7, 10 ** 8], [10, 35, 35, 15, 5])[0]
+        amounts.append((rng.randint(scale // 10, scale * 10),))
+    # 0원/정확히 떨어지는 금액도 포함
+    amounts.extend([(0,), (100000,), (1000000,), (100000000,)])
+    return amounts
+
+
+def keyword_inputs(rng, count):
+    """마케팅 리드 생성 시 전달되는 견적 폼 데이터"""
+    inputs = []
+    for _ in range(count):
+        data = {
+            'customerName': '홍길동',
+            'phone': '010-1234-5678',
+            'quantity': str(rng.randint(1, 300)),
+            'pages': str(rng.randint(1, 500)),
+        }
+        if rng.random() < 0.95:
+            data['printType'] = rng.choice(PRINT_TYPES + ['risograph'])
+        if rng.random() < 0.9:
+            data['bindingType'] = rng.choice(BINDING_TYPES)
+        inputs.append((data,))
+    return inputs
+
+
+def json_inputs(rng, count):
+    """/quote 응답으로 직렬화되는 견적 결과"""
+    return [(calculate_price(*args),) for args in quote_inputs(rng, count)]
+
+
+def serialize_quote_response(price_info):
+    """jsonify와 같은 JSON 직렬화 (Flask JSON provider 사용)"""
+    return app.json.dumps(price_info)
+
+
+# 이름: (함수, 입력 생성기)
+BENCHMARKS = {
+    'calculate_price': (calculate_price, lambda rng: quote_inputs(rng, 1000)),
+    'calculate_price_15001_plus': (calculate_price, lambda rng: quote_inputs(rng, 1000, huge=True)),
+    'safe_int_conversion': (safe_int_conversion, lambda rng: int_inputs(rng, 1000)),
+    'convert_number_to_korean': (convert_number_to_korean, lambda rng: amount_inputs(rng, 1000)),
+    # lru_cache를 거치지 않은 실제 변환 비용 (워밍업 후 캐시 적중만 재는 위 항목과 비교용)
+    'convert_number_to_korean_uncached': (convert_number_to_korean.__wrapped__,
+                                          lambda rng: amount_inputs(rng, 1000)),
+    'extract_keyword_from_data': (extract_keyword_from_data, lambda rng: keyword_inputs(rng, 1000)),
+    'quote_response_json': (serialize_quote_response, lambda rng: json_inputs(rng, 500)),
+}
+
+
+def measure(func, inputs, number, repeat):
+    """입력 목록을 순환하며 호출당 시간(ns) 측정 (best/median)"""
+    count = len(inputs)
+    loops = max(1, number // count)
+
+    def run():
+        for args in inputs:
+            func(*args)
+
+    run()  # 캐시/지연 초기화 워밍업
+    timings = sorted(t / (loops * count) * 1e9 for t in timeit.repeat(run, number=loops, repeat=repeat))
+    return {
+        'best_ns': round(timings[0], 1),
+        'median_ns': round(timings[len(timings) // 2], 1),
+        'calls': loops * count * repeat,
+    }
+
+
+def load_budgets(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('budgets_ns', {})
+
+
+def save_budgets(path, results):
+    # --only로 일부만 측정한 경우 나머지 예산은 유지
+    budgets = load_budgets(path)
+    for name in results:
+        source = results.get(BUDGET_SOURCES.get(name), results[name])
+        budgets[name] = round(source['best_ns'] * BUDGET_HEADROOM)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'comment': f'호출당 최대 허용 시간(ns, best 기준). 측정값 x {BUDGET_HEADROOM} 여유',
+            'budgets_ns': budgets,
+        }, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='견적/서식 함수 마이크로벤치마크')
+    parser.add_argument('--number', type=int, default=50000, help='벤치마크당 측정 호출 횟수')
+    parser.add_argument('--repeat', type=int, default=5, help='반복 측정 횟수')
+    parser.add_argument('--seed', type=int, default=20250102, help='입력 생성 시드')
+    parser.add_argument('--only', nargs='*', choices=sorted(BENCHMARKS), help='실행할 벤치마크')
+    parser.add_argument('--budgets', default=DEFAULT_BUDGETS, help='예산 파일 경로')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help='결과 JSON 경로')
+    parser.add_argument('--update-budgets', action='store_true', help='측정값으로 예산 파일 갱신')
+    args = parser.parse_args()
+
+    budgets = load_budgets(args.budgets)
+    results = {}
+    failures = []
+
+    for name in args.only or BENCHMARKS:
+        func, make_inputs = BENCHMARKS[name]
+        inputs = make_inputs(random.Random(args.seed))
+        result = measure(func, inputs, args.number, args.repeat)
+
+        budget = budgets.get(name)
+        result['budget_ns'] = budget
+        result['passed'] = budget is None or result['best_ns'] <= budget
+        results[name] = result
+
+        status = '-' if budget is None else ('OK' if result['passed'] else 'FAIL')
+        budget_text = f'{budget:>10,}' if budget is not None else f'{"-":>10}'
+        print(f'{name:34s} {result["best_ns"]:10,.1f} ns/call  (median {result["median_ns"]:,.1f})'
+              f'  budget {budget_text}  {status}')
+        if not result['passed']:
+            failures.append(name)
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'number': args.number,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'results': results,
+        'failures': failures,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+    print(f'결과 저장: {args.output}')
+
+    if args.update_budgets:
+        save_budgets(args.budgets, results)
+        print(f'예산 갱신: {args.budgets}')
+        return 0
+
+    if failures:
+        print(f'예산 초과: {", ".join(failures)}')
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,6 +7,16 @@ document.addEventListener('DOMContentLoaded', function() {
         quoteForm.addEventListener('submit', handleQuoteCalculation);
     }
     
+    // 메인 견적 계산기: 결과가 표시된 뒤에는 옵션 변경 시 가격 구간표로 바로 재계산
+    if (quoteForm && document.getElementById('calculateBtn')) {
+        ['pages', 'quantity', 'printType', 'printMethod', 'bindingType'].forEach(id => {
+            const input = document.getElementById(id);
+            if (input) {
+                input.addEventListener('input', updateQuotePreview);
+            }
+        });
+    }
+    
     // 스크롤 애니메이션
     initScrollAnimations();
     
@@ -86,8 +96,8 @@ function handleQuoteCalculation(e) {
     });
 }
 
-// 견적 결과 표시
-function displayQuoteResult(data, formData) {
+// 견적 결과 표시 (silent: 스크롤/알림 없이 값만 갱신)
+function displayQuoteResult(data, formData, silent = false) {
     const resultDiv = document.getElementById('quoteResult');
     
     if (!resultDiv) {
@@ -140,6 +150,18 @@ function displayQuoteResult(data, formData) {
         }
     }
     
+    // 다음 단가 구간 안내
+    const tierHintEl = document.getElementById('tierHint');
+    if (tierHintEl) {
+        const hints = data.hints || [];
+        tierHintEl.textContent = hints.map(hint => hint.message).join(' / ');
+        tierHintEl.style.display = hints.length ? 'block' : 'none';
+    }
+    
+    if (silent) {
+        return;
+    }
+    
     // 결과 표시
     resultDiv.style.display = 'block';
     resultDiv.scrollIntoView({ behavior: 'smooth' });
@@ -918,7 +940,12 @@ function previewQuote() {
     .then(data => {
         console.log('미리보기 응답 데이터:', data);
         if (data.success) {
-            showTextPreview(data.price_info);
+            // 서버에서 만든 실제 PDF 이미지 (만들 수 없으면 텍스트 미리보기)
+            if (data.preview_image && !data.fallback) {
+                showImagePreview(data.preview_image);
+            } else {
+                showTextPreview(data.price_info);
+            }
         } else {
             throw new Error(data.error || '미리보기 생성 실패');
         }
@@ -1136,6 +1163,48 @@ function showTextPreview(priceInfo) {
     modal.show();
 }
 
+// 서버에서 만든 견적서 PDF 첫 페이지 이미지 미리보기
+function showImagePreview(imageUrl) {
+    const modalHtml = `
+    <div class="modal fade" id="previewModal" tabindex="-1" aria-labelledby="previewModalLabel" aria-hidden="true">
+        <div class="modal-dialog modal-lg">
+            <div class="modal-content">
+                <div class="modal-header">
+                    <h5 class="modal-title" id="previewModalLabel">
+                        <i class="fas fa-eye me-2"></i>견적서 미리보기
+                    </h5>
+                    <button type="button" class="btn-close" data-bs-dismiss="modal" aria-label="Close"></button>
+                </div>
+                <div class="modal-body" style="padding: 20px; background: #f8f9fa; text-align: center;">
+                    <img src="${imageUrl}" alt="견적서 미리보기" style="width: 100%; max-width: 794px; background: #fff; box-shadow: 0 2px 8px rgba(0,0,0,0.15);">
+                </div>
+                <div class="modal-footer">
+                    <button type="button" class="btn btn-secondary" data-bs-dismiss="modal">
+                        <i class="fas fa-times me-2"></i>닫기
+                    </button>
+                    <button type="button" class="btn btn-primary" onclick="printPreview()">
+                        <i class="fas fa-print me-2"></i>인쇄 (PDF 저장)
+                    </button>
+                </div>
+            </div>
+        </div>
+    </div>
+    `;
+    
+    // 기존 모달 제거
+    const existingModal = document.getElementById('previewModal');
+    if (existingModal) {
+        existingModal.remove();
+    }
+    
+    // 새 모달 추가
+    document.body.insertAdjacentHTML('beforeend', modalHtml);
+    
+    // 모달 표시
+    const modal = new bootstrap.Modal(document.getElementById('previewModal'));
+    modal.show();
+}
+
 // 간단한 인쇄 함수 (브라우저 기본 인쇄 기능 사용)
 // PDF 다운로드 함수 (간단하고 확실한 방법)
 function printPreview() {
@@ -1348,26 +1417,122 @@ function openNaverBlog() {
     window.open(blogUrl, '_blank');
 }
 
-// 실시간 견적 미리보기
+// 가격 구간표 (옵션 조합별로 한 번만 받아 브라우저에서 계산)
+const priceCurveCache = {};
+
+function loadPriceCurve(printType, bindingType, printMethod) {
+    const key = `${printType}|${bindingType}|${printMethod}`;
+    if (!priceCurveCache[key]) {
+        const params = new URLSearchParams({ printType, bindingType, printMethod });
+        priceCurveCache[key] = fetch(`/api/price_curve?${params}`)
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`HTTP error! status: ${response.status}`);
+                }
+                return response.json();
+            })
+            .catch(error => {
+                delete priceCurveCache[key];
+                throw error;
+            });
+    }
+    return priceCurveCache[key];
+}
+
+// 값 이하인 첫 상한의 위치 (서버의 bisect_left와 동일)
+function findPriceTier(limits, value) {
+    let tier = 0;
+    while (tier < limits.length && value > limits[tier]) {
+        tier++;
+    }
+    return tier;
+}
+
+// 서버(파이썬 round)와 같은 반올림: .5는 짝수 쪽으로
+function roundHalfEven(value) {
+    const rounded = Math.round(value);
+    return (Math.abs(value % 1) === 0.5 && rounded % 2 !== 0) ? rounded - 1 : rounded;
+}
+
+// 가격 구간표로 calculate_price와 같은 결과 계산
+function evaluatePriceCurve(curve, pages, quantity) {
+    const totalPages = pages * quantity;
+    const unitPrintPrice = curve.print.prices[findPriceTier(curve.print.limits, totalPages)];
+    const unitBindingPrice = curve.binding.prices[findPriceTier(curve.binding.limits, quantity)];
+    const printPrice = unitPrintPrice * totalPages;
+    const bindingPrice = unitBindingPrice * quantity;
+    const totalPriceWithTax = printPrice + bindingPrice;
+    const taxAmount = roundHalfEven(totalPriceWithTax * curve.tax_rate);
+    
+    return {
+        unit_price: unitPrintPrice * pages + unitBindingPrice,
+        total_price: totalPriceWithTax - taxAmount,
+        total_price_with_tax: totalPriceWithTax,
+        tax_amount: taxAmount,
+        discount_rate: 0,
+        print_price: printPrice,
+        binding_price: bindingPrice,
+        unit_print_price: unitPrintPrice,
+        unit_binding_price: unitBindingPrice,
+        pages: pages,
+        total_pages: totalPages,
+        tariff_version: curve.tariff_version,
+        hints: priceTierHints(curve, pages, quantity)
+    };
+}
+
+// "N부 추가 시 단가 인하" 안내 (단가가 실제로 내려가는 경우만)
+function priceTierHints(curve, pages, quantity) {
+    const hints = [];
+    const binding = curve.binding;
+    const bindingTier = findPriceTier(binding.limits, quantity);
+    if (bindingTier < binding.limits.length && binding.prices[bindingTier + 1] < binding.prices[bindingTier]) {
+        const extra = binding.limits[bindingTier] + 1 - quantity;
+        hints.push({
+            extra_copies: extra,
+            message: `${extra}부 추가 시 제본 단가 ${binding.prices[bindingTier].toLocaleString()}원 → ${binding.prices[bindingTier + 1].toLocaleString()}원`
+        });
+    }
+    
+    const print = curve.print;
+    const printTier = findPriceTier(print.limits, pages * quantity);
+    if (printTier < print.limits.length && print.prices[printTier + 1] < print.prices[printTier]) {
+        const extra = Math.ceil((print.limits[printTier] + 1) / pages) - quantity;
+        hints.push({
+            extra_copies: extra,
+            message: `${extra}부 추가 시 페이지당 단가 ${print.prices[printTier].toLocaleString()}원 → ${print.prices[printTier + 1].toLocaleString()}원`
+        });
+    }
+    
+    return hints.sort((a, b) => a.extra_copies - b.extra_copies);
+}
+
+// 실시간 견적 미리보기 (견적 결과가 표시된 상태에서 옵션 변경 시, 서버 요청 없이 계산)
 function updateQuotePreview() {
-    const pages = parseInt(document.getElementById('pages').value) || 0;
-    const printType = document.getElementById('printType').value;
-    const quantity = parseInt(document.getElementById('quantity').value) || 0;
-    
-    if (pages > 0 && quantity > 0) {
-        // 간단한 미리보기 계산
-        const basePrices = {
-            'black_white': 50,
-            'ink_color': 200,
-            'laser_color': 300
-        };
-        
-        const unitPrice = basePrices[printType] * pages;
-        const totalPrice = unitPrice * quantity;
-        
-        // 미리보기 표시 (선택사항)
-        console.log(`예상 가격: ${totalPrice.toLocaleString()}원`);
+    const resultDiv = document.getElementById('quoteResult');
+    if (!resultDiv || resultDiv.style.display === 'none') {
+        return;
     }
+    
+    const formData = {
+        pages: parseInt(document.getElementById('pages').value) || 0,
+        printType: document.getElementById('printType').value,
+        printMethod: document.getElementById('printMethod') ? document.getElementById('printMethod').value : 'single',
+        bindingType: document.getElementById('bindingType').value,
+        quantity: parseInt(document.getElementById('quantity').value) || 0
+    };
+    
+    if (formData.pages <= 0 || formData.quantity <= 0) {
+        return;
+    }
+    
+    loadPriceCurve(formData.printType, formData.bindingType, formData.printMethod)
+        .then(curve => {
+            displayQuoteResult(evaluatePriceCurve(curve, formData.pages, formData.quantity), formData, true);
+        })
+        .catch(error => {
+            console.error('가격 구간표 로드 오류:', error);
+        });
 }
 
 // 폼 유효성 검사
@@ -0,0 +1,24 @@
+"""테스트 공통 설정 - 운영 DB 대신 메모리 SQLite 사용
+
+app_enhanced는 import 시 DB 엔진을 만들므로 import 전에 DATABASE_URL을 지정한다.
+"""
+import os
+import sys
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app_enhanced import app, db, quote_documents  # noqa: E402
+
+
+@pytest.fixture
+def app_db():
+    """테스트마다 빈 DB (테이블 생성 → 테스트 → 삭제)"""
+    with app.app_context():
+        db.create_all()
+        yield db
+        db.session.remove()
+        db.drop_all()
+    quote_documents.clear()
@@ -0,0 +1,44 @@
+"""한글 금액 표기 테스트 (4자리 단위 읽기표, 조 단위까지)"""
+import pytest
+
+from app_enhanced import convert_number_to_korean, format_korean_amount
+
+
+@pytest.mark.parametrize('number,expected', [
+    (0, '영'),
+    (1, '일'),
+    (10, '십'),
+    (11, '십일'),
+    (20, '이십'),
+    (100, '백'),
+    (1100, '천백'),
+    (1001, '천일'),
+    (9999, '구천구백구십구'),
+    (10000, '일만'),
+    (10001, '일만일'),
+    (100000, '십만'),
+    (180000, '십팔만'),
+    (1234500, '백이십삼만사천오백'),
+    (100000000, '일억'),
+    (100010000, '일억일만'),
+    (100000001, '일억일'),
+    (1000000000000, '일조'),
+    (1000000010000, '일조일만'),
+    (1000100000000, '일조일억'),
+    (1000000000001, '일조일'),
+    (10 ** 16 - 1, '구천구백구십구조구천구백구십구억구천구백구십구만구천구백구십구'),
+])
+def test_convert_number_to_korean(number, expected):
+    assert convert_number_to_korean(number) == expected
+    assert convert_number_to_korean.__wrapped__(number) == expected  # 캐시를 거치지 않은 변환
+
+
+@pytest.mark.parametrize('number', [-1, 10 ** 16])
+def test_convert_number_to_korean_rejects_out_of_range(number):
+    with pytest.raises(ValueError):
+        convert_number_to_korean(number)
+
+
+def test_format_korean_amount():
+    assert format_korean_amount(180000) == '일금 십팔만원정'
+    assert format_korean_amount(180000.0) == '일금 십팔만원정'
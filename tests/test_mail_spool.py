@@ -0,0 +1,109 @@
+"""이메일 발송 대기열 테스트 (대기열 추가 → 발송 → 상태/재시도)
+
+aiosmtpd로 같은 프로세스에 SMTP 서버를 띄워 실제로 받은 원문을 확인한다 (DB는 conftest의 메모리 DB).
+    pip install aiosmtpd pytest
+    python -m pytest tests
+"""
+import socket
+from email import message_from_bytes, policy
+
+import pytest
+
+aiosmtpd_controller = pytest.importorskip('aiosmtpd.controller')
+
+import app_enhanced  # noqa: E402
+from app_enhanced import app, db, OutboundEmail, QuoteDocument, mail_spool, save_quote_document  # noqa: E402
+
+SPEC = {'printType': 'black_white', 'bindingType': 'ring', 'quantity': 30, 'pages': 100, 'size': 'A4'}
+
+
+class RecordingHandler:
+    """받은 메일 원문(DATA 그대로)을 보관"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append((envelope.rcpt_tos, envelope.original_content))
+        return '250 OK'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_port(app_db):
+    """테스트용 메일 설정 (빈 메모리 DB, 발송 스레드 없이 drain()으로 직접 발송)"""
+    port = free_port()
+    saved = dict(app.config)
+    app.config.update(MAIL_SERVER='127.0.0.1', MAIL_PORT=port, MAIL_USE_TLS=False, MAIL_TIMEOUT=5,
+                      MAIL_SPOOL_WORKER=False, MAIL_DEDUP_SECONDS=0, MAIL_DIGEST_MINUTES=0,
+                      MAIL_MAX_ATTEMPTS=2, MAIL_RETRY_BASE_SECONDS=0)
+    yield port
+    app.config.clear()
+    app.config.update(saved)
+
+
+@pytest.fixture
+def smtp_server(smtp_port):
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname='127.0.0.1', port=smtp_port)
+    controller.start()
+    yield handler
+    controller.stop()
+
+
+def quote_document(email):
+    document = QuoteDocument.from_items({'customerName': '홍길동', 'email': email}, [SPEC])
+    save_quote_document(document)
+    return document
+
+
+def test_quote_email_is_sent_with_crlf_line_endings(smtp_server):
+    email = 'kim@spool-test.example'
+    assert app_enhanced.send_quote_document_email(quote_document(email))
+    message = OutboundEmail.query.filter_by(to_email=email).one()
+    assert message.status == 'pending'
+
+    assert mail_spool.drain() == 1
+    db.session.refresh(message)
+    assert message.status == 'sent' and message.attempts == 1 and message.last_error is None
+
+    [(recipients, raw)] = smtp_server.messages
+    assert recipients == [email]
+    # SMTP는 CRLF만 허용 (bare LF는 서버가 거부하거나 본문을 깨뜨림)
+    assert b'\n' not in raw.replace(b'\r\n', b'')
+    parsed = message_from_bytes(raw, policy=policy.SMTP)
+    assert parsed['To'] == email
+    assert parsed.get_body(('html',)) is not None
+    assert [part.get_content_type() for part in parsed.iter_attachments()] == ['application/pdf']
+
+
+def test_failed_email_is_retried_then_dead_then_sent_after_manual_retry(smtp_port):
+    email = 'lee@spool-test.example'
+    assert app_enhanced.send_quote_document_email(quote_document(email))
+    message = OutboundEmail.query.filter_by(to_email=email).one()
+
+    # 서버가 없으면 재시도 예약, MAIL_MAX_ATTEMPTS를 넘으면 dead
+    mail_spool.drain()
+    db.session.refresh(message)
+    assert message.status == 'pending' and message.attempts == 1 and message.last_error
+    mail_spool.drain()
+    db.session.refresh(message)
+    assert message.status == 'dead' and message.attempts == 2
+
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname='127.0.0.1', port=smtp_port)
+    controller.start()
+    try:
+        assert mail_spool.retry(message.id)
+        mail_spool.drain()
+    finally:
+        controller.stop()
+
+    db.session.refresh(message)
+    assert message.status == 'sent' and message.attempts == 1
+    assert [recipients for recipients, _ in handler.messages] == [[email]]
@@ -0,0 +1,52 @@
+"""견적서 PDF 이어 붙이기(PdfPageStream) 테스트"""
+import re
+
+import pytest
+
+from app_enhanced import PdfPageStream, QuoteDocument, generate_quote_document_pdf
+
+SPEC = {'printType': 'black_white', 'bindingType': 'ring', 'quantity': 30, 'pages': 100, 'size': 'A4'}
+PAGE_RE = re.compile(rb'/Type /Page\b')
+
+
+def quote_pdf(item_count):
+    document = QuoteDocument.from_items({'customerName': '홍길동'}, [SPEC] * item_count)
+    return generate_quote_document_pdf(document).getvalue()
+
+
+def merge(pdfs):
+    pages = PdfPageStream()
+    return pages.header() + b''.join(pages.add(pdf) for pdf in pdfs) + pages.finish()
+
+
+@pytest.fixture(scope='module')
+def pdfs():
+    # 품목이 많은 견적서는 여러 쪽
+    return [quote_pdf(1), quote_pdf(60), quote_pdf(2)]
+
+
+def test_merged_pdf_has_all_pages_and_valid_xref(pdfs):
+    page_counts = [len(PAGE_RE.findall(pdf)) for pdf in pdfs]
+    assert page_counts[1] > 1
+
+    merged = merge(pdfs)
+    assert merged.startswith(b'%PDF-') and merged.rstrip().endswith(b'%%EOF')
+    assert int(re.search(rb'/Count (\d+) /Kids', merged).group(1)) == sum(page_counts)
+    assert len(PAGE_RE.findall(merged)) == sum(page_counts)
+
+    # xref 표의 위치마다 해당 번호의 객체가 있어야 함
+    xref_at = int(merged[merged.rindex(b'startxref') + 9:].split()[0])
+    lines = merged[xref_at:].split(b'\n')
+    size = int(lines[1].split()[1])
+    for number, entry in enumerate(lines[2:2 + size]):
+        offset, _, kind = entry.split()
+        if kind == b'n':
+            assert merged[int(offset):].startswith(b'%d 0 obj' % number)
+
+
+def test_merged_pdf_opens_with_expected_page_count(pdfs):
+    fitz = pytest.importorskip('fitz')
+    expected = sum(fitz.open(stream=pdf, filetype='pdf').page_count for pdf in pdfs)
+    merged = fitz.open(stream=merge(pdfs), filetype='pdf')
+    assert merged.page_count == expected
+    assert '홍길동' in merged[0].get_text()
@@ -0,0 +1,90 @@
+"""견적 계산 테스트 - 단가표 컴파일(구간 탐색)/대량 계산이 기존 if/elif 계산과 같은 값인지"""
+from itertools import product
+
+import pytest
+
+from app_enhanced import QuoteInputError, calculate_price, get_active_tariff, price_quote_request
+
+PRINT_TYPES = ('black_white', 'laser_color', 'ink_color', 'unknown')
+PRINT_METHODS = ('single', 'double')
+BINDING_TYPES = ('ring', 'perfect', 'saddle', 'folding', 'none')
+# 제본 구간 경계 (30/49/99부)
+QUANTITIES = (1, 30, 31, 49, 50, 99, 100, 250)
+# 1부 기준 출력 구간 경계 (500/5000/10000/15000쪽)
+PAGES = (1, 17, 100, 500, 501, 5000, 5001, 10000, 10001, 15000, 15001)
+
+
+def reference_price(print_type, binding_type, quantity, pages, print_method='single'):
+    """2025.01.02 단가표를 if/elif로 직접 계산 (단가표 컴파일 이전 calculate_price와 같은 방식)"""
+    total_pages = pages * quantity
+    if total_pages <= 500:
+        table = {'black_white': (40, 40), 'laser_color': (150, 150), 'ink_color': (70, 70)}
+    elif total_pages <= 5000:
+        table = {'black_white': (38, 33), 'laser_color': (115, 110), 'ink_color': (66, 60)}
+    elif total_pages <= 10000:
+        table = {'black_white': (30, 25), 'laser_color': (93, 88), 'ink_color': (55, 50)}
+    elif total_pages <= 15000:
+        table = {'black_white': (27, 22), 'laser_color': (82, 77), 'ink_color': (50, 45)}
+    else:
+        table = {'black_white': (25, 20), 'laser_color': (72, 66), 'ink_color': (45, 40)}
+    unit_print_price = table.get(print_type, (40, 40))[print_method == 'double']
+
+    if binding_type in ('ring', 'perfect'):
+        prices = {'ring': (2200, 1650, 1430, 1100), 'perfect': (2200, 1100, 770, 770)}[binding_type]
+        tier = 0 if quantity <= 30 else 1 if quantity <= 49 else 2 if quantity <= 99 else 3
+        unit_binding_price = prices[tier]
+    else:
+        unit_binding_price = {'saddle': 330, 'folding': 500}.get(binding_type, 0)
+
+    total_price_with_tax = unit_print_price * total_pages + unit_binding_price * quantity
+    tax_amount = round(total_price_with_tax * 0.1)
+    return {
+        'unit_price': unit_print_price * pages + unit_binding_price,
+        'total_price': total_price_with_tax - tax_amount,
+        'total_price_with_tax': total_price_with_tax,
+        'tax_amount': tax_amount,
+        'print_price': unit_print_price * total_pages,
+        'binding_price': unit_binding_price * quantity,
+        'unit_print_price': unit_print_price,
+        'unit_binding_price': unit_binding_price,
+        'pages': pages,
+        'total_pages': total_pages,
+    }
+
+
+CASES = list(product(PRINT_TYPES, PRINT_METHODS, BINDING_TYPES, QUANTITIES, PAGES))
+
+
+@pytest.mark.parametrize('print_type,print_method,binding_type', list(product(PRINT_TYPES, PRINT_METHODS,
+                                                                               BINDING_TYPES)))
+def test_calculate_price_matches_reference(print_type, print_method, binding_type):
+    for quantity, pages in product(QUANTITIES, PAGES):
+        expected = reference_price(print_type, binding_type, quantity, pages, print_method)
+        result = calculate_price(print_type, binding_type, quantity, pages, 'A4', print_method)
+        assert {key: result[key] for key in expected} == expected, (quantity, pages)
+
+
+def test_calculate_batch_matches_calculate_price():
+    tariff = get_active_tariff()
+    rows = [tariff.price_rows_for(print_type, print_method, binding_type)
+            for print_type, print_method, binding_type, _, _ in CASES]
+    result = tariff.calculate_batch([row[0] for row in rows], [row[1] for row in rows],
+                                    [case[3] for case in CASES], [case[4] for case in CASES])
+
+    for index, (print_type, print_method, binding_type, quantity, pages) in enumerate(CASES):
+        expected = calculate_price(print_type, binding_type, quantity, pages, 'A4', print_method)
+        assert {key: int(values[index]) for key, values in result.items()} == \
+            {key: expected[key] for key in result}, CASES[index]
+
+
+@pytest.mark.parametrize('data,message', [
+    ({}, '견적 데이터가 없습니다.'),
+    ({'printType': 'black_white', 'bindingType': 'ring', 'quantity': 10}, 'pages 필드가 필요합니다.'),
+    ({'printType': ['black_white'], 'bindingType': 'ring', 'quantity': 10, 'pages': 10},
+     'printType 필드는 문자열이어야 합니다.'),
+    ({'printType': 'black_white', 'bindingType': 'ring', 'quantity': 10, 'pages': 10, 'printMethod': 'triple'},
+     '지원하지 않는 출력 방식입니다.'),
+])
+def test_price_quote_request_rejects_invalid_input(data, message):
+    with pytest.raises(QuoteInputError, match=message):
+        price_quote_request(data)
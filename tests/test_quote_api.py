@@ -0,0 +1,61 @@
+"""견적 API 테스트 (입력 검증, 권한)"""
+import pytest
+
+from app_enhanced import OutboundEmail, app
+
+SPEC = {'printType': 'black_white', 'bindingType': 'ring', 'quantity': 30, 'pages': 100, 'size': 'A4'}
+
+
+@pytest.fixture
+def client(app_db):
+    worker = app.config['MAIL_SPOOL_WORKER']
+    app.config['MAIL_SPOOL_WORKER'] = False  # 메일은 대기열에 넣기만
+    yield app.test_client()
+    app.config['MAIL_SPOOL_WORKER'] = worker
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'data': 'items=1', 'content_type': 'application/x-www-form-urlencoded'},
+    {'data': '{broken', 'content_type': 'application/json'},
+    {'json': 'items'},
+])
+def test_batch_rejects_non_json_body(client, kwargs):
+    assert client.post('/api/quotes/batch', **kwargs).status_code == 400
+
+
+@pytest.mark.parametrize('field,value', [('printType', ['black_white']), ('bindingType', {'ring': 1}),
+                                         ('printMethod', 1)])
+def test_batch_rejects_non_string_fields(client, field, value):
+    response = client.post('/api/quotes/batch', json={'items': [SPEC, dict(SPEC, **{field: value})]})
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'index': 1, 'error': f'{field} 필드는 문자열이어야 합니다.'}]
+
+
+def test_batch_totals(client):
+    response = client.post('/api/quotes/batch', json=[SPEC, dict(SPEC, quantity=100)])
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['count'] == 2
+    assert body['grand_total']['total_price_with_tax'] == sum(
+        item['total_price_with_tax'] for item in body['items'])
+
+
+@pytest.mark.parametrize('url', ['/quote', '/download_quote_pdf'])
+def test_unknown_print_method_is_rejected(client, url):
+    response = client.post(url, json=dict(SPEC, printMethod='triple'))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == '지원하지 않는 출력 방식입니다.'
+
+
+def test_quote_email_only_from_creating_session(client):
+    created = client.post('/api/quote_documents', json={'email': 'kim@example.com', 'items': [SPEC]})
+    assert created.status_code == 201
+    document_id = created.get_json()['id']
+
+    assert client.post(f'/api/quote_documents/{document_id}/email').get_json() == {'success': True}
+    assert OutboundEmail.query.filter_by(quote_id=document_id).count() == 1
+
+    other = app.test_client()
+    response = other.post(f'/api/quote_documents/{document_id}/email')
+    assert response.status_code == 403
+    assert OutboundEmail.query.filter_by(quote_id=document_id).count() == 1
@@ -0,0 +1,58 @@
+"""다품목 견적서 테스트 - 품목 추가/수정/삭제 시 차액만 반영한 합계가 처음부터 다시 더한 합계와 같은지"""
+import pytest
+
+from app_enhanced import QuoteDocument, QuoteInputError, calculate_price, custom_line_price
+
+ITEMS = [
+    {'printType': 'black_white', 'bindingType': 'ring', 'quantity': 30, 'pages': 100, 'size': 'A4'},
+    {'printType': 'laser_color', 'bindingType': 'perfect', 'quantity': 120, 'pages': 48, 'size': 'A5',
+     'printMethod': 'double'},
+    {'name': '색인 간지', 'unitPrice': 500, 'quantity': 10},
+]
+
+
+def line_price(spec):
+    if 'unitPrice' in spec:
+        return custom_line_price(spec['unitPrice'], spec['quantity'])
+    return calculate_price(spec['printType'], spec['bindingType'], spec['quantity'], spec['pages'],
+                           spec.get('size', 'A4'), spec.get('printMethod', 'single'))
+
+
+def expected_totals(specs):
+    return {key: sum(line_price(spec)[key] for spec in specs) for key in QuoteDocument.TOTAL_KEYS}
+
+
+def test_totals_follow_line_changes():
+    document = QuoteDocument.from_items({'customerName': '홍길동'}, ITEMS)
+    assert document.totals == expected_totals(ITEMS)
+    assert document.revision == len(ITEMS)
+
+    document.update_line(0, {'quantity': 50})
+    specs = [dict(ITEMS[0], quantity=50)] + ITEMS[1:]
+    assert document.totals == expected_totals(specs)
+
+    document.add_line(ITEMS[0])
+    specs.append(ITEMS[0])
+    assert document.totals == expected_totals(specs)
+
+    document.remove_line(1)
+    del specs[1]
+    assert document.totals == expected_totals(specs)
+    assert document.revision == len(ITEMS) + 3
+
+    for index in range(len(specs)):
+        document.remove_line(0)
+    assert document.totals == dict.fromkeys(QuoteDocument.TOTAL_KEYS, 0)
+
+
+def test_invalid_change_leaves_totals_unchanged():
+    document = QuoteDocument.from_items({}, ITEMS)
+    totals, revision = dict(document.totals), document.revision
+
+    for changes in ({'quantity': 0}, {'printType': 'black_white', 'printMethod': 'triple'}, ['quantity']):
+        with pytest.raises(QuoteInputError):
+            document.update_line(0, changes)
+    with pytest.raises(QuoteInputError):
+        document.add_line({'name': '할인', 'unitPrice': -1000, 'quantity': 1})
+
+    assert document.totals == totals and document.revision == revision